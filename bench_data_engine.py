@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Measures how long the UI thread is blocked per poll cycle: inline fetches vs DataEngine.
+
+Simulates the Tk loop as a 16ms frame ticker and reports the worst frame stall.
+Usage: python bench_data_engine.py [latency_seconds]
+"""
+
+import sys
+import time
+
+from bench_fakes import FakeMailClient
+from sidebar.services.data_engine import DataEngine
+
+FRAME = 0.016
+CYCLES = 5
+
+
+def poll_job(client):
+    return {
+        "has_new": client.check_new_mail(None),
+        "unread_count": client.get_unread_count(None, None),
+        "due_status": client.get_pulse_status(None),
+        "emails": client.get_inbox_items(count=30)[0],
+    }
+
+
+def run_inline(latency):
+    client = FakeMailClient(latency=latency)
+    worst = 0.0
+    for _ in range(CYCLES):
+        t0 = time.perf_counter()
+        poll_job(client)
+        worst = max(worst, time.perf_counter() - t0)
+    return worst
+
+
+def run_engine(latency):
+    engine = DataEngine(lambda: FakeMailClient(latency=latency), uses_com=True)
+    engine.start()
+    engine.wait_ready()
+
+    delivered = []
+    worst = 0.0
+    for _ in range(CYCLES):
+        engine.submit("poll", poll_job, delivered.append)
+        target = len(delivered) + 1
+        while len(delivered) < target:
+            t0 = time.perf_counter()
+            engine.pump()
+            worst = max(worst, time.perf_counter() - t0)
+            time.sleep(FRAME)
+    engine.stop()
+    fetch_time = sum(s.elapsed for s in delivered) / len(delivered)
+    return worst, fetch_time
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.25
+    inline_worst = run_inline(latency)
+    engine_worst, fetch_time = run_engine(latency)
+    print("Per-call latency:        {:.0f} ms".format(latency * 1000))
+    print("Inline UI stall (worst): {:.1f} ms".format(inline_worst * 1000))
+    print("Engine UI stall (worst): {:.3f} ms".format(engine_worst * 1000))
+    print("Engine fetch time (avg): {:.1f} ms (off the UI thread)".format(fetch_time * 1000))
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""In-memory MailClient used by the bench_*.py scripts (runs without Outlook/Graph)."""
+
+import time
+from datetime import datetime, timedelta
+
+from sidebar.services.mail_client import MailClient
+from sidebar.services.item_record import MailItem
+
+
+def make_emails(n, start=None, account="Fake Account"):
+    """Builds n MailItems shaped like the COM backend's, newest first."""
+    start = start or datetime(2026, 1, 1, 12, 0, 0)
+    items = []
+    for i in range(n):
+        items.append(MailItem(
+            entry_id="{:064X}".format(i + 1),
+            subject="Subject {}".format(i),
+            sender="Sender {}".format(i % 50),
+            received=start - timedelta(minutes=i),
+            unread=i % 3 == 0,
+            flag_status=2 if i % 10 == 0 else 0,
+            has_attachments=i % 7 == 0,
+            importance=1,
+            store_id="STORE1",
+            account=account,
+        ))
+    return items
+
+
+class FakeMailClient(MailClient):
+    """MailClient backed by a list of dicts, with a fixed latency per call."""
+
+    def __init__(self, emails=None, latency=0.0):
+        self.emails = emails if emails is not None else make_emails(200)
+        self.latency = latency
+        self.calls = {}
+        self.last_received_time = None
+
+    def _call(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    # --- Connection ---
+    def connect(self): return True
+    def reconnect(self): return True
+    def is_connected(self): return True
+    def get_accounts(self): return ["Fake Account"]
+
+    # --- Email ---
+    def get_inbox_items(self, count=20, unread_only=False, only_flagged=False,
+                        due_filters=None, account_names=None, account_config=None):
+        self._call("get_inbox_items")
+        items = self.emails
+        if unread_only:
+            items = [e for e in items if e["unread"]]
+        if only_flagged:
+            items = [e for e in items if e["flag_status"] != 0]
+        return items[:count], sum(1 for e in self.emails if e["unread"])
+
+    def get_unread_count(self, account_names=None, account_config=None):
+        self._call("get_unread_count")
+        return sum(1 for e in self.emails if e["unread"])
+
+    def mark_as_read(self, entry_id, store_id=None): return True
+    def delete_email(self, entry_id, store_id=None): return True
+    def toggle_flag(self, entry_id, store_id=None): return True
+    def unflag_email(self, entry_id, store_id=None): return True
+    def open_item(self, entry_id, store_id=None): return True
+    def reply_to_email(self, entry_id, store_id=None): return True
+    def reply_all_to_email(self, entry_id, store_id=None): return True
+    def forward_email(self, entry_id, store_id=None): return True
+
+    # --- Calendar / Tasks ---
+    def get_calendar_items(self, start_dt, end_dt, account_names=None):
+        self._call("get_calendar_items")
+        return []
+
+    def get_tasks(self, due_filters=None, account_names=None):
+        self._call("get_tasks")
+        return []
+
+    def mark_task_complete(self, entry_id, store_id=None): return True
+
+    # --- Quick Create ---
+    def create_email(self): pass
+    def create_meeting(self): pass
+    def create_task(self): pass
+    def create_contact(self): pass
+
+    # --- Polling ---
+    def check_new_mail(self, account_names=None):
+        self._call("check_new_mail")
+        latest = self.emails[0].received if self.emails else None
+        found = bool(self.last_received_time and latest and latest > self.last_received_time)
+        self.last_received_time = latest
+        return found
+
+    def get_pulse_status(self, account_names=None):
+        self._call("get_pulse_status")
+        return {"calendar": None, "tasks": None}
+
+    # --- Utility ---
+    def get_category_map(self): return {}
+    def search_contacts(self, query, max_results=8): return []
+    def get_folder_list(self, account_name=None): return ["Inbox"]
+    def get_native_app(self): return None
+    def send_email_with_attachment(self, recipient, subject, body, attachment_path): return False
+
+
+class FakeTable:
+    """Outlook Table stand-in with a fixed cost per COM call (EndOfTable,
+    GetNextRow, GetValues, GetArray each count as one round-trip)."""
+
+    def __init__(self, rows, latency=0.0):
+        self.rows = rows
+        self.latency = latency
+        self.calls = 0
+        self._pos = 0
+
+    def _call(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def EndOfTable(self):
+        self._call()
+        return self._pos >= len(self.rows)
+
+    def GetNextRow(self):
+        self._call()
+        if self._pos >= len(self.rows):
+            return None
+        self._pos += 1
+        return _FakeRow(self, self.rows[self._pos - 1])
+
+    def GetArray(self, max_rows):
+        self._call()
+        block = tuple(self.rows[self._pos:self._pos + max_rows])
+        self._pos += len(block)
+        return block
+
+
+class _FakeRow:
+    def __init__(self, table, values):
+        self._table = table
+        self._values = values
+
+    def GetValues(self):
+        self._table._call()
+        return self._values
+
+
+def make_table_rows(n):
+    """Builds n rows shaped like a _prepare_inbox_table table."""
+    return [(e.entry_id, e.subject, e.sender, e.received, e.unread,
+             e.flag_status, "IPM.Note", e.has_attachments, e.importance, "", None)
+            for e in make_emails(n)]
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Payload size of Graph pages with and without the $select projections.
+
+Builds Graph-shaped pages of full resources (what Graph returns without
+$select: message bodies, every recipient list, ids, etags...), projects them
+to the graph_query field sets the way the server applies $select, and
+compares raw JSON bytes, gzip bytes on the wire and json.loads time.
+Usage: python bench_graph_payload.py [page_size]
+"""
+
+import gzip
+import json
+import random
+import sys
+import time
+
+from sidebar.services.graph_query import MESSAGE_FIELDS, EVENT_FIELDS, TASK_FIELDS
+
+REPEAT = 20
+_rng = random.Random(17)
+
+
+def _id(n=152):
+    return "".join(_rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+                   for _ in range(n)) + "="
+
+
+def _addr(i):
+    return {"emailAddress": {"name": "Person {}".format(i), "address": "person{}@contoso.com".format(i)}}
+
+
+def _words(n):
+    vocab = "meeting budget review quarterly update project design launch status notes".split()
+    return " ".join(_rng.choice(vocab) for _ in range(n))
+
+
+def full_message(i):
+    body = "<html><head><style>" + "p{margin:0}" * 200 + "</style></head><body>" + \
+           "".join("<p>{}</p>".format(_words(30)) for _ in range(_rng.randint(20, 120))) + "</body></html>"
+    return {
+        "@odata.etag": "W/\"{}\"".format(_id(40)), "id": _id(),
+        "createdDateTime": "2026-10-16T09:{:02d}:00Z".format(i % 60),
+        "lastModifiedDateTime": "2026-10-16T09:{:02d}:05Z".format(i % 60),
+        "changeKey": _id(40), "categories": ["Blue category"] if i % 5 == 0 else [],
+        "receivedDateTime": "2026-10-16T09:{:02d}:00Z".format(i % 60),
+        "sentDateTime": "2026-10-16T08:{:02d}:59Z".format(i % 60),
+        "hasAttachments": i % 7 == 0, "internetMessageId": "<{}@contoso.com>".format(_id(60)),
+        "subject": _words(8), "bodyPreview": _words(40)[:255], "importance": "normal",
+        "parentFolderId": _id(), "conversationId": _id(), "conversationIndex": _id(60),
+        "isDeliveryReceiptRequested": False, "isReadReceiptRequested": False,
+        "isRead": i % 3 != 0, "isDraft": False,
+        "webLink": "https://outlook.office365.com/owa/?ItemID={}&exvsurl=1&viewmodel=ReadMessageItem".format(_id()),
+        "inferenceClassification": "focused",
+        "body": {"contentType": "html", "content": body},
+        "sender": _addr(i), "from": _addr(i),
+        "toRecipients": [_addr(i + k) for k in range(_rng.randint(1, 8))],
+        "ccRecipients": [_addr(i + k) for k in range(_rng.randint(0, 12))],
+        "bccRecipients": [], "replyTo": [],
+        "flag": {"flagStatus": "flagged" if i % 4 == 0 else "notFlagged"},
+    }
+
+
+def full_event(i):
+    return {
+        "@odata.etag": "W/\"{}\"".format(_id(40)), "id": _id(), "subject": _words(6),
+        "bodyPreview": _words(40)[:255], "body": {"contentType": "html", "content": "<p>{}</p>".format(_words(400))},
+        "start": {"dateTime": "2026-10-17T{:02d}:00:00.0000000".format(8 + i % 9), "timeZone": "UTC"},
+        "end": {"dateTime": "2026-10-17T{:02d}:30:00.0000000".format(8 + i % 9), "timeZone": "UTC"},
+        "location": {"displayName": "Room {}".format(i), "locationType": "default",
+                     "uniqueId": _id(40), "uniqueIdType": "private"},
+        "locations": [], "responseStatus": {"response": "accepted", "time": "2026-10-10T10:00:00Z"},
+        "organizer": _addr(i), "attendees": [dict(_addr(i + k), type="required",
+                                                  status={"response": "none", "time": "0001-01-01T00:00:00Z"})
+                                             for k in range(_rng.randint(2, 25))],
+        "seriesMasterId": None, "webLink": "https://outlook.office365.com/owa/?itemid={}".format(_id()),
+        "isCancelled": False, "iCalUId": _id(), "onlineMeeting": {"joinUrl": "https://teams.microsoft.com/l/" + _id()},
+    }
+
+
+def full_task(i):
+    return {
+        "@odata.etag": "W/\"{}\"".format(_id(40)), "id": _id(), "title": _words(6),
+        "importance": "normal", "isReminderOn": i % 2 == 0, "status": "notStarted",
+        "createdDateTime": "2026-10-01T10:00:00Z", "lastModifiedDateTime": "2026-10-02T10:00:00Z",
+        "body": {"content": _words(80), "contentType": "text"}, "categories": [],
+        "dueDateTime": {"dateTime": "2026-10-{:02d}T00:00:00.0000000".format(10 + i % 15), "timeZone": "UTC"},
+        "linkedResources": [], "checklistItems": [{"displayName": _words(4), "isChecked": False,
+                                                   "id": _id(36)} for _ in range(_rng.randint(0, 5))],
+    }
+
+
+def project(item, fields):
+    return {k: item[k] for k in fields if k in item}
+
+
+def measure(page):
+    raw = json.dumps({"value": page}).encode("utf-8")
+    wire = gzip.compress(raw)
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        json.loads(raw)
+    return len(raw), len(wire), (time.perf_counter() - t0) * 1000 / REPEAT
+
+
+def report(label, items, fields):
+    full = measure(items)
+    slim = measure([project(x, fields) for x in items])
+    print("{:<10} full {:9,d} B raw {:8,d} B gzip {:6.2f} ms parse | $select {:7,d} B raw {:6,d} B gzip "
+          "{:5.2f} ms parse | {:4.1f}x smaller on the wire".format(
+              label, full[0], full[1], full[2], slim[0], slim[1], slim[2], full[1] / slim[1]))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print("Page size: {}".format(n))
+    report("messages", [full_message(i) for i in range(n)], MESSAGE_FIELDS)
+    report("events", [full_event(i) for i in range(n)], EVENT_FIELDS)
+    report("tasks", [full_task(i) for i in range(n)], TASK_FIELDS)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Compares per-call requests.request() with the pooled GraphSession.
+
+Starts a local stub server that answers Graph-shaped JSON (HTTPS with a
+throwaway self-signed certificate when openssl is available, else HTTP) and
+times N sequential calls each way, reporting connections opened.
+Usage: python bench_graph_session.py [calls] [--http]
+"""
+
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from sidebar.services.graph_http import GraphSession
+
+BODY = json.dumps({"value": [{"id": str(i), "subject": "Subject {}".format(i),
+                              "receivedDateTime": "2026-01-01T12:00:00Z"} for i in range(20)]}).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _make_cert(tmp):
+    if not shutil.which("openssl"):
+        return None
+    cert, key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+                    "-keyout", key, "-out", cert],
+                   check=True, capture_output=True)
+    return cert, key
+
+
+def start_server(use_tls):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    cert = None
+    tmp = tempfile.mkdtemp()
+    if use_tls:
+        pair = _make_cert(tmp)
+        if pair:
+            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ctx.load_cert_chain(*pair)
+            server.socket = ctx.wrap_socket(server.socket, server_side=True)
+            cert = pair[0]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scheme = "https" if cert else "http"
+    return server, "{}://127.0.0.1:{}/v1.0/me/messages".format(scheme, server.server_port), cert
+
+
+def run(label, call, url, n, verify):
+    _StubHandler.connections = 0
+    t0 = time.perf_counter()
+    for _ in range(n):
+        resp = call("GET", url, verify=verify, timeout=(10, 30))
+        resp.json()
+    elapsed = time.perf_counter() - t0
+    print("{:<22} {:8.1f} ms total {:7.2f} ms/call {:5d} connections".format(
+        label, elapsed * 1000, elapsed * 1000 / n, _StubHandler.connections))
+    return elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 200
+    use_tls = "--http" not in sys.argv
+    server, url, cert = start_server(use_tls)
+    verify = cert if cert else True
+    print("Stub server: {} ({} calls)".format(url.split("/v1.0")[0], n))
+
+    t_plain = run("requests.request", requests.request, url, n, verify)
+    session = GraphSession()
+    t_pool = run("GraphSession", session.request, url, n, verify)
+    print("Speedup: {:.1f}x  session stats: {}".format(t_plain / t_pool, session.connection_stats()))
+    server.shutdown()
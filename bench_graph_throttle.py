@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Drives GraphAPIClient polls against a local stub that throttles with 429s.
+
+The stub answers normally, then returns 429 + Retry-After for a throttling
+window, then recovers. The same poll loop runs with the GraphScheduler and
+with a pass-through scheduler (the old behaviour), reporting how many calls
+reached the server, how many were throttled and how many polls came back
+empty.
+Usage: python bench_graph_throttle.py [seconds] [poll_interval]
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sidebar.services.graph_client import GraphAPIClient
+from sidebar.services.graph_throttle import GraphScheduler
+
+BODY = json.dumps({"value": [{"id": str(i), "subject": "Subject {}".format(i),
+                              "receivedDateTime": "2026-01-01T12:00:00Z"} for i in range(20)]}).encode()
+
+THROTTLE_FROM, THROTTLE_UNTIL = 0.5, 2.5  # Seconds after the run starts
+RETRY_AFTER = 1
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    started = 0
+    hits = 0
+    throttled = 0
+
+    def do_GET(self):
+        cls = type(self)
+        cls.hits += 1
+        elapsed = time.time() - cls.started
+        if THROTTLE_FROM <= elapsed < THROTTLE_UNTIL:
+            cls.throttled += 1
+            body = b'{"error": {"code": "TooManyRequests"}}'
+            self.send_response(429)
+            self.send_header("Retry-After", str(RETRY_AFTER))
+        else:
+            body = BODY
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeAuth:
+    def get_token(self, interactive=False, account=None):
+        return "token"
+
+    def get_current_user_email(self):
+        return "bench@example.com"
+
+
+class _PassThroughScheduler(GraphScheduler):
+    """No budgets, no blocking, no stale results."""
+
+    def admit(self, url, wait_allowed=True, scope=""):
+        self.stats["admitted"] += 1
+        return True
+
+    def record(self, url, status, retry_after=None, scope=""):
+        if status in (429, 503):
+            self.stats["throttled"] += 1
+
+    def stale(self, url, scope=""):
+        return None
+
+
+def run(label, scheduler, base_url, seconds, interval):
+    client = GraphAPIClient()
+    client.auth = _FakeAuth()
+    client.base_url = base_url
+    client.batch_requests = False
+    client.scheduler = scheduler
+    endpoint = "/me/mailFolders/inbox/messages?$top=20&$orderby=receivedDateTime desc"
+
+    _StubHandler.hits = _StubHandler.throttled = 0
+    _StubHandler.started = time.time()
+    polls = empty = 0
+    while time.time() - _StubHandler.started < seconds:
+        data = client._request("GET", endpoint)
+        polls += 1
+        if not data or not data.get("value"):
+            empty += 1
+        time.sleep(interval)
+    print("{:<14} {:4d} polls {:4d} server hits {:4d} got 429 {:4d} empty  counters={}".format(
+        label, polls, _StubHandler.hits, _StubHandler.throttled, empty, scheduler.counters()))
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 4.0
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = "http://127.0.0.1:{}/v1.0".format(server.server_port)
+    print("Stub: {} (429 between {}s and {}s, Retry-After {}s)".format(
+        base_url, THROTTLE_FROM, THROTTLE_UNTIL, RETRY_AFTER))
+
+    run("pass-through", _PassThroughScheduler(), base_url, seconds, interval)
+    run("GraphScheduler", GraphScheduler(), base_url, seconds, interval)
+    server.shutdown()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Memory and render-path cost of item dicts vs MailItem records.
+
+Builds N mail items both ways (the old COM-shaped dicts and the unified
+MailItem), then measures:
+  memory   bytes per item (tracemalloc) for the whole list
+  freeze   DataEngine.freeze() of the list (dicts were copied into proxies)
+  merge    merge_top_n of two backend streams (old key tried both backends' keys)
+  render   the per-card field reads of refresh_emails (old: .get() fallbacks)
+Usage: python bench_item_record.py [n]
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+from sidebar.services.data_engine import freeze
+from sidebar.services.item_record import MailItem
+from sidebar.services.stream_merge import merge_top_n, _naive
+
+REPEAT = 5
+
+
+def dict_item(i, start):
+    return {
+        "entry_id": "{:064X}".format(i + 1), "subject": "Subject {}".format(i),
+        "sender": "Sender {}".format(i % 50), "received_dt": start - timedelta(minutes=i),
+        "unread": i % 3 == 0, "flag_status": 2 if i % 10 == 0 else 0,
+        "has_attachments": i % 7 == 0, "importance": 1, "flag_request": "", "due_date": None,
+        "preview": "", "modified": None, "is_meeting_request": False,
+        "store_id": "STORE1", "account": "Account",
+    }
+
+
+def record_item(i, start):
+    return MailItem(
+        entry_id="{:064X}".format(i + 1), subject="Subject {}".format(i),
+        sender="Sender {}".format(i % 50), received=start - timedelta(minutes=i),
+        unread=i % 3 == 0, flag_status=2 if i % 10 == 0 else 0,
+        has_attachments=i % 7 == 0, importance=1, store_id="STORE1", account="Account",
+    )
+
+
+def build(factory, n):
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    items = [factory(i, start) for i in range(n)]
+    elapsed = time.perf_counter() - t0
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return items, size / n, elapsed * 1000
+
+
+def old_received_key(item):
+    return _naive(item.get("received_dt") or item.get("received")) or datetime.min
+
+
+def old_freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: old_freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(old_freeze(v) for v in value)
+    return value
+
+
+def render_dicts(items):
+    out = 0
+    for email in items:
+        recv = email.get('received_dt') or email.get('received')
+        attach = email.get('has_attachments', False) or email.get('has_attachment', False)
+        preview = (email.get('preview', '') or email.get('body_preview', '') or '').strip()
+        imp = email.get('importance', 1)
+        out += bool(recv) + bool(attach) + len(preview) + (imp != 1) + len(email['subject']) + \
+            bool(email.get('unread')) + (email.get('flag_status') or 0)
+    return out
+
+
+def render_records(items):
+    out = 0
+    for email in items:
+        out += bool(email.received) + bool(email.has_attachments) + len(email.preview.strip()) + \
+            (email.importance != 1) + len(email.subject) + bool(email.unread) + email.flag_status
+    return out
+
+
+def timed(fn, *args):
+    best = None
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn(*args)
+        elapsed = (time.perf_counter() - t0) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    dicts, dict_bytes, dict_build = build(dict_item, n)
+    records, rec_bytes, rec_build = build(record_item, n)
+    half = n // 2
+
+    rows = [
+        ("memory/item", "{:.0f} B".format(dict_bytes), "{:.0f} B".format(rec_bytes), dict_bytes / rec_bytes),
+        ("build", "{:.1f} ms".format(dict_build), "{:.1f} ms".format(rec_build), dict_build / rec_build),
+    ]
+    for label, old, new in (
+            ("freeze", (old_freeze, dicts), (freeze, records)),
+            ("merge top 50", (lambda d: merge_top_n([d[:half], d[half:]], 50, key=old_received_key), dicts),
+             (lambda r: merge_top_n([r[:half], r[half:]], 50), records)),
+            ("merge all", (lambda d: merge_top_n([d[:half], d[half:]], key=old_received_key), dicts),
+             (lambda r: merge_top_n([r[:half], r[half:]]), records)),
+            ("render reads", (render_dicts, dicts), (render_records, records))):
+        t_old, t_new = timed(*old), timed(*new)
+        rows.append((label, "{:.2f} ms".format(t_old), "{:.2f} ms".format(t_new), t_old / t_new))
+
+    print("Items: {}".format(n))
+    print("{:<14} {:>12} {:>12} {:>8}".format("", "dict", "MailItem", "ratio"))
+    for label, old, new, ratio in rows:
+        print("{:<14} {:>12} {:>12} {:>7.1f}x".format(label, old, new, ratio))
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Compares the old regex-chain HTML preview cleanup with the streaming extractor.
+
+Uses a generated corpus (short notes up to multi-MB newsletters) or every
+*.html / *.htm file in a directory given on the command line.
+Usage: python bench_preview_text.py [corpus_dir]
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+
+from sidebar.services.preview_text import html_to_preview
+
+REPEAT = 3
+
+
+def legacy_extract(html):
+    """The regex chain previously inlined in the sidebar's preview code."""
+    text = re.sub(r'<a[^>]*>(.*?)</a>', r'\1', html, flags=re.DOTALL|re.IGNORECASE)
+    text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
+    text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.DOTALL)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = re.sub(r'&nbsp;', ' ', text)
+    text = re.sub(r'&amp;', '&', text)
+    text = re.sub(r'&lt;', '<', text)
+    text = re.sub(r'&gt;', '>', text)
+    text = re.sub(r'&#\d+;', '', text)
+    text = re.sub(r'https?://\S+', '', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n\s*\n', '\n', text)
+    text = text.strip()
+    return "\n".join(line for line in text.splitlines() if line.strip())
+
+
+def _newsletter(sections):
+    style = "<style>" + "".join(".c%d{color:#%06x;padding:%dpx}\n" % (i, i * 997, i % 20)
+                                for i in range(2000)) + "</style>"
+    body = []
+    for i in range(sections):
+        body.append(
+            '<table class="c{0}"><tr><td><a href="https://track.example.com/{0}?u=abc">'
+            '<img src="https://cdn.example.com/{0}.png"></a></td>'
+            '<td><h2>Story {0}</h2><p>Lorem ipsum dolor sit amet, &amp; consectetur '
+            'adipiscing elit&nbsp;{0}. Read more at https://news.example.com/{0}</p>'
+            '</td></tr></table>\n'.format(i))
+    return "<html><head>{}</head><body>{}</body></html>".format(style, "".join(body))
+
+
+def generated_corpus():
+    note = ("<html><body><div>Hi team,</div><div><br></div><div>The report is attached. "
+            "Let me know if anything is missing.</div><div>Thanks</div></body></html>")
+    return [
+        ("short note", note),
+        ("reply chain", "<html><body>" + "<blockquote><p>Earlier message text here.</p>" * 200
+         + "</blockquote>" * 200 + "</body></html>"),
+        ("newsletter 200KB", _newsletter(600)),
+        ("newsletter 2MB", _newsletter(7000)),
+    ]
+
+
+def load_corpus(path):
+    docs = []
+    for name in sorted(glob.glob(os.path.join(path, "*.htm*"))):
+        with open(name, "r", encoding="utf-8", errors="replace") as f:
+            docs.append((os.path.basename(name), f.read()))
+    return docs
+
+
+def timed(fn, html):
+    best = None
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        out = fn(html)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+if __name__ == "__main__":
+    corpus = load_corpus(sys.argv[1]) if len(sys.argv) > 1 else generated_corpus()
+    total_old = total_new = 0.0
+    print("{:<20} {:>10} {:>12} {:>12} {:>8}".format("document", "size KB", "regex ms", "stream ms", "speedup"))
+    for name, html in corpus:
+        t_old, _ = timed(legacy_extract, html)
+        t_new, preview = timed(html_to_preview, html)
+        total_old += t_old
+        total_new += t_new
+        print("{:<20} {:>10.0f} {:>12.2f} {:>12.2f} {:>7.1f}x".format(
+            name[:20], len(html) / 1024.0, t_old * 1000, t_new * 1000, t_old / t_new if t_new else 0))
+    print("{:<20} {:>10} {:>12.2f} {:>12.2f} {:>7.1f}x".format(
+        "total", "", total_old * 1000, total_new * 1000, total_old / total_new if total_new else 0))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Compares per-row Table reads (GetNextRow + GetValues) with block reads (GetArray).
+
+Runs against a fake 10k-row table where each COM call costs a fixed latency.
+Usage: python bench_table_reader.py [latency_seconds] [rows]
+"""
+
+import sys
+import time
+
+from bench_fakes import FakeTable, make_table_rows
+from sidebar.services.table_reader import iter_table_rows
+
+STORE_INFO = ("STORE1", "Fake Account")
+
+
+def decode(vals):
+    # Same shape of work as OutlookClient._row_to_item
+    return {"entry_id": vals[0], "subject": vals[1], "sender": vals[2],
+            "received_dt": vals[3], "unread": vals[4], "flag_status": vals[5],
+            "store_id": STORE_INFO[0], "account": STORE_INFO[1]}
+
+
+def read_per_row(table, limit=None):
+    items = []
+    while not table.EndOfTable and (limit is None or len(items) < limit):
+        row = table.GetNextRow()
+        if not row: break
+        items.append(decode(row.GetValues()))
+    return items
+
+
+def read_blocks(table, limit=None):
+    return list(iter_table_rows(table, limit=limit, decode=decode))
+
+
+def run(reader, rows, latency, limit=None):
+    table = FakeTable(rows, latency)
+    t0 = time.perf_counter()
+    items = reader(table, limit)
+    return time.perf_counter() - t0, table.calls, len(items)
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.00005
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    rows = make_table_rows(n)
+
+    print("Rows: {}  per-call latency: {:.0f} us".format(n, latency * 1e6))
+    for label, limit in (("full scan", None), ("top 30", 30)):
+        t_row, c_row, got_row = run(read_per_row, rows, latency, limit)
+        t_blk, c_blk, got_blk = run(read_blocks, rows, latency, limit)
+        assert got_row == got_blk
+        print("{:<10} per-row: {:8.1f} ms {:6d} calls | GetArray: {:7.1f} ms {:5d} calls | {:.1f}x".format(
+            label, t_row * 1000, c_row, t_blk * 1000, c_blk, t_row / t_blk if t_blk else 0))
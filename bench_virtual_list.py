@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Email list cost with every card built vs the VirtualList.
+
+  layout   RowLayout work per scroll step over N rows (offsets + visible range);
+           runs anywhere
+  widgets  (needs a display) N card-like rows packed into a ScrollableFrame vs
+           VirtualList.set_items, then one scroll pass through the whole list:
+           build time, widgets created, and per-step scroll time
+Usage: python bench_virtual_list.py [n]
+"""
+
+import random
+import sys
+import time
+
+from bench_fakes import make_emails
+from sidebar.core.compat import tk
+from sidebar.ui.widgets.base import RowLayout, ScrollableFrame, VirtualList
+
+VIEW_HEIGHT = 600
+STEP = 60   # Pixels per scroll step (three mouse wheel units)
+
+
+def bench_layout(n):
+    layout = RowLayout(80)
+    layout.reset([None] * n)
+    rng = random.Random(1)
+    total = 0
+    steps = 0
+    t0 = time.perf_counter()
+    y = 0
+    while y < layout.total() - VIEW_HEIGHT:
+        first, stop = layout.visible(y, y + VIEW_HEIGHT, 3)
+        for i in range(first, stop):
+            if layout.measured(i) is None:
+                layout.measure(i, rng.choice((62, 74, 110)))
+        total += stop - first
+        steps += 1
+        y += STEP
+    elapsed = (time.perf_counter() - t0) * 1000
+    print("layout: {} steps, {:.3f} ms/step, {:.1f} rows in view on average".format(
+        steps, elapsed / steps, total / steps))
+
+
+def create_card(parent):
+    card = tk.Frame(parent, highlightthickness=1, padx=5, pady=5)
+    header = tk.Frame(card)
+    header.pack(fill="x")
+    card._sender = tk.Label(header, anchor="w")
+    card._sender.pack(side="left", fill="x", expand=True)
+    card._time = tk.Label(header, anchor="e")
+    card._time.pack(side="right")
+    card._subject = tk.Label(card, anchor="w", justify="left")
+    card._subject.pack(fill="x")
+    buttons = tk.Frame(card)
+    buttons.pack(fill="x")
+    for text in ("Read", "Open", "Delete", "Flag"):
+        tk.Label(buttons, text=text).pack(side="left", expand=True, fill="both")
+    return card
+
+
+def bind_card(card, email):
+    card._sender.config(text=email.sender)
+    card._time.config(text=email.received.strftime("%d/%m/%y %H:%M"))
+    card._subject.config(text=email.subject)
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def scroll_through(root, frame):
+    canvas = frame.canvas
+    times = []
+    canvas.yview_moveto(0)
+    root.update()
+    view = canvas.yview()
+    while view[1] < 1.0:
+        t0 = time.perf_counter()
+        canvas.yview_scroll(3, "units")
+        root.update()
+        times.append((time.perf_counter() - t0) * 1000)
+        if canvas.yview() == view:
+            break  # Stuck (e.g. the inner frame hit the window size limit)
+        view = canvas.yview()
+    return times
+
+
+def bench_widgets(n):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print("widgets: skipped (no display: {})".format(e))
+        return
+    root.geometry("360x{}".format(VIEW_HEIGHT))
+    emails = make_emails(n)
+
+    rows = []
+    for label, cls in (("all cards", ScrollableFrame), ("VirtualList", VirtualList)):
+        frame = cls(root)
+        frame.pack(expand=True, fill="both")
+        root.update()
+        t0 = time.perf_counter()
+        if cls is VirtualList:
+            frame.set_items(emails, create_card, bind_card, key=lambda e: e.entry_id)
+        else:
+            for email in emails:
+                card = create_card(frame.scrollable_frame)
+                bind_card(card, email)
+                card.pack(fill="x", padx=2, pady=2)
+        root.update()
+        build = (time.perf_counter() - t0) * 1000
+        times = scroll_through(root, frame)
+        rows.append((label, build, count_widgets(frame), sum(times) / max(len(times), 1),
+                     max(times or [0])))
+        frame.destroy()
+    root.destroy()
+
+    print("{:<12} {:>12} {:>9} {:>14} {:>12}".format("", "build", "widgets", "scroll avg", "scroll max"))
+    for label, build, widgets, avg, worst in rows:
+        print("{:<12} {:>9.0f} ms {:>9} {:>11.2f} ms {:>9.2f} ms".format(label, build, widgets, avg, worst))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print("Items: {}".format(n))
+    bench_layout(n)
+    bench_widgets(n)
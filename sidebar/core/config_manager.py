@@ -56,6 +56,7 @@ class ConfigManager:
         self.font_size = DEFAULT_FONT_SIZE
         self.window_mode = "dual"  # "single" or "dual"
         self.backend = "auto"      # "auto" | "com" | "graph"
+        self.parallel_store_fetch = False  # COM: fetch each store on its own thread
         
         # Behavior
         self.poll_interval = 30
@@ -77,6 +78,8 @@ class ConfigManager:
         self.email_show_subject = True
         self.email_show_body = False
         self.email_body_lines = 2
+        self.email_count = 30  # Emails fetched per refresh (the list only builds the visible cards)
+        self.preview_disk_cache = False  # Keep fetched preview text between sessions
         
         # Account Settings
         self.enabled_accounts = {} # {\"Name\": {\"email\": True, \"calendar\": True, ...}}
@@ -181,9 +184,12 @@ class ConfigManager:
             self.email_show_subject = data.get("email_show_subject", self.email_show_subject)
             self.email_show_body = data.get("email_show_body", self.email_show_body)
             self.email_body_lines = data.get("email_body_lines", self.email_body_lines)
+            self.email_count = data.get("email_count", self.email_count)
+            self.preview_disk_cache = data.get("preview_disk_cache", self.preview_disk_cache)
             
             # Application Backend
             self.backend = data.get("backend", self.backend)
+            self.parallel_store_fetch = data.get("parallel_store_fetch", self.parallel_store_fetch)
             
             self.buttons_on_hover = data.get("buttons_on_hover", self.buttons_on_hover)
             self.email_double_click = data.get("email_double_click", self.email_double_click)
@@ -229,6 +235,7 @@ class ConfigManager:
         """Saves current state to disk."""
         data = {
             "backend": getattr(self, "backend", "auto"),
+            "parallel_store_fetch": self.parallel_store_fetch,
             "width": self.width,
             "pinned": self.pinned,
             "dock_side": self.dock_side,
@@ -238,6 +245,8 @@ class ConfigManager:
             "show_hover_content": self.show_hover_content,
             "poll_interval": self.poll_interval,
             "window_mode": self.window_mode,
+            "preview_disk_cache": self.preview_disk_cache,
+            "email_count": self.email_count,
             
             "show_read": self.show_read,
             "show_has_attachment": self.show_has_attachment,
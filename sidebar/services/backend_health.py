@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Circuit breakers for the mail backends.
+
+With Outlook closed or the network down, every poll used to pay for the
+COM liveness probe and reconnect attempt, or for Graph's connect timeout,
+once per call (check_new_mail, get_unread_count, get_pulse_status...).
+
+Each backend ("com", "graph") has one shared CircuitBreaker:
+
+    closed     calls go through; failures are counted
+    open       after FAILURE_THRESHOLD failures in a row calls fail fast,
+               until a backoff delay (doubling, with jitter) has passed
+    half_open  one probe call is let through; success closes the breaker,
+               failure opens it again with the next, longer delay
+
+The UI reads the same state to show or hide the offline bar.
+"""
+
+import random
+import threading
+import time
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# name -> (failures before opening, first delay, max delay) in seconds
+BREAKER_SETTINGS = {
+    "com": (1, 15, 300),
+    "graph": (2, 5, 300),
+}
+DEFAULT_SETTINGS = (2, 5, 300)
+
+# Delays are spread by +/- this fraction so probes don't line up
+JITTER = 0.2
+
+# A half-open probe that hasn't reported back after this long is given up on
+PROBE_TIMEOUT = 60
+
+
+class CircuitBreaker:
+    """Closed/open/half-open health state of one backend, thread-safe."""
+
+    def __init__(self, name, failure_threshold=2, base_delay=5, max_delay=300,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0     # Consecutive failures
+        self._opens = 0        # Consecutive openings (drives the backoff)
+        self._retry_at = 0     # When an open breaker allows its next probe
+        self._probe_at = 0     # When the current half-open probe started
+        self._lock = threading.Lock()
+        self.stats = {"failures": 0, "opened": 0, "fast_fails": 0, "probes": 0}
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def healthy(self):
+        """Closed with no failure since the last success."""
+        return self._state == CLOSED and self._failures == 0
+
+    def retry_in(self):
+        """Seconds until an open breaker lets a probe through (0 if it would now)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0
+            return max(0.0, self._retry_at - self._clock())
+
+    def ready(self):
+        """True if allow() would let a call through; doesn't change the state."""
+        with self._lock:
+            return self._ready(self._clock())
+
+    def _ready(self, now):
+        if self._state == CLOSED:
+            return True
+        if self._state == OPEN:
+            return now >= self._retry_at
+        return now - self._probe_at >= PROBE_TIMEOUT
+
+    def allow(self):
+        """Whether to attempt a call now. An open breaker past its delay lets one probe through."""
+        with self._lock:
+            now = self._clock()
+            if not self._ready(now):
+                self.stats["fast_fails"] += 1
+                return False
+            if self._state != CLOSED:
+                self._state = HALF_OPEN
+                self._probe_at = now
+                self.stats["probes"] += 1
+            return True
+
+    def success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                print("[Health] {} recovered".format(self.name))
+            self._state = CLOSED
+            self._failures = 0
+            self._opens = 0
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            self.stats["failures"] += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                delay = min(self.max_delay, self.base_delay * (2 ** self._opens))
+                delay *= random.uniform(1 - JITTER, 1 + JITTER)
+                self._opens += 1
+                self._state = OPEN
+                self._retry_at = self._clock() + delay
+                self.stats["opened"] += 1
+                print("[Health] {} unavailable; next attempt in {:.0f}s".format(self.name, delay))
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """The process-wide breaker for a backend ("com" or "graph")."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            threshold, base, cap = BREAKER_SETTINGS.get(name, DEFAULT_SETTINGS)
+            breaker = _breakers[name] = CircuitBreaker(name, threshold, base, cap)
+        return breaker
+
+
+def breakers():
+    """Every breaker created so far (i.e. for the backends in use)."""
+    with _breakers_lock:
+        return dict(_breakers)
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Background data engine: runs MailClient fetches off the Tk thread.
+
+The UI submits named jobs (e.g. "emails", "reminders", "poll"). Jobs run on a
+dedicated worker thread that owns its own COM apartment and its own MailClient
+instance (COM objects can't be shared across apartments). Graph-only backends
+don't need an apartment, so their jobs run on a small thread pool instead.
+
+Results come back as immutable Snapshots through a queue which the Tk loop
+drains with pump(), so the UI thread only ever renders.
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+from sidebar.services.item_record import ItemRecord
+
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None  # Non-Windows (e.g. benchmarks against a fake client)
+
+
+Snapshot = namedtuple("Snapshot", ["kind", "seq", "data", "error", "elapsed"])
+
+
+def freeze(value):
+    """Returns a read-only copy of a fetch result (lists -> tuples, dicts -> proxies).
+
+    Item records aren't copied: they are marked read-only in place.
+    """
+    if isinstance(value, ItemRecord):
+        return value.freeze()
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class DataEngine:
+    """Runs fetch jobs against a MailClient on background threads.
+
+    client_factory is called on the worker thread (after CoInitialize) so the
+    client's COM objects live in the worker's apartment. Set uses_com=False
+    for pure-HTTP backends to run jobs on a thread pool instead.
+
+    The engine's client only reads. Item actions (mark read, flag, move,
+    complete task...) run on the UI thread's own client, so any state an
+    action must update for the next read is process-wide rather than per
+    client: the hybrid routing table (get_routing_table), the Graph mail
+    syncs (get_mail_sync) and task indexes (get_task_sync), the folder
+    cache invalidation epochs, and the breakers, scheduler and $batch
+    coalescer. New state of that kind goes in such a registry too.
+    """
+
+    def __init__(self, client_factory, uses_com=True, graph_workers=4):
+        self._client_factory = client_factory
+        self._uses_com = uses_com
+        self._graph_workers = graph_workers
+        self.client = None
+
+        self._jobs = queue.Queue()      # (seq, kind) for the COM worker
+        self._results = queue.Queue()   # (Snapshot, callback) for the Tk loop
+        self._latest = {}               # kind -> (seq, job, callback)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._ready = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._pool = None
+
+        self.stats = {"submitted": 0, "completed": 0, "superseded": 0, "errors": 0}
+
+    # --- Lifecycle ---
+    def start(self):
+        """Starts the worker (COM) or pool (Graph) and creates the client."""
+        if self._uses_com:
+            self._thread = threading.Thread(target=self._com_worker, name="DataEngine-COM", daemon=True)
+            self._thread.start()
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=self._graph_workers,
+                                            thread_name_prefix="DataEngine-Graph")
+            try:
+                self.client = self._client_factory()
+            except Exception as e:
+                print("[DataEngine] Client init failed: {}".format(e))
+            self._ready.set()
+
+    def stop(self):
+        """Stops accepting work. Pending jobs are dropped."""
+        self._stopping = True
+        self._jobs.put((None, None))
+        if self._pool:
+            self._pool.shutdown(wait=False)
+
+    def wait_ready(self, timeout=None):
+        """Blocks until the client has been created (or failed to)."""
+        return self._ready.wait(timeout)
+
+    # --- Submitting work ---
+    def submit(self, kind, job, callback=None):
+        """Queues job(client) under the given kind and returns its sequence number.
+
+        Only the newest job of each kind is run: submitting "emails" twice
+        before the first one starts runs it once. callback(snapshot) is
+        invoked on the Tk thread from pump().
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._latest[kind] = (seq, job, callback)
+            self.stats["submitted"] += 1
+
+        if self._uses_com:
+            self._jobs.put((seq, kind))
+        elif self._pool and not self._stopping:
+            self._pool.submit(self._run, seq, kind)
+        return seq
+
+    def post(self, kind, data=None, callback=None):
+        """Queues a snapshot for the Tk thread without running a job (e.g. from event sinks)."""
+        self._results.put((Snapshot(kind, 0, data, None, 0.0), callback))
+
+    def pump(self, max_items=20):
+        """Delivers finished snapshots to their callbacks. Call from the Tk thread."""
+        delivered = 0
+        while delivered < max_items:
+            try:
+                snap, callback = self._results.get_nowait()
+            except queue.Empty:
+                break
+            delivered += 1
+            if callback is None:
+                continue
+            try:
+                callback(snap)
+            except Exception as e:
+                print("[DataEngine] Callback error for '{}': {}".format(snap.kind, e))
+                import traceback
+                traceback.print_exc()
+        return delivered
+
+    def is_busy(self, kind):
+        """True if a job of this kind is queued or running."""
+        with self._lock:
+            return kind in self._latest
+
+    # --- Workers ---
+    def _com_worker(self):
+        if pythoncom:
+            try:
+                pythoncom.CoInitialize()
+            except Exception:
+                pass
+        try:
+            self.client = self._client_factory()
+        except Exception as e:
+            print("[DataEngine] Client init failed: {}".format(e))
+            self.client = None
+        self._ready.set()
+
+        try:
+            while not self._stopping:
+                try:
+                    seq, kind = self._jobs.get(timeout=0.2)
+                except queue.Empty:
+                    self._pump_messages()
+                    continue
+                if seq is None:
+                    break
+                self._run(seq, kind)
+                self._pump_messages()
+        finally:
+            if pythoncom:
+                try:
+                    pythoncom.CoUninitialize()
+                except Exception:
+                    pass
+
+    def _pump_messages(self):
+        # COM events (e.g. Outlook NewMailEx) are delivered to this apartment
+        # only while it pumps its message queue
+        if pythoncom:
+            try:
+                pythoncom.PumpWaitingMessages()
+            except Exception:
+                pass
+
+    def _run(self, seq, kind):
+        with self._lock:
+            entry = self._latest.get(kind)
+            if not entry or entry[0] != seq:
+                self.stats["superseded"] += 1
+                return
+            _, job, callback = entry
+
+        start = time.perf_counter()
+        data, error = None, None
+        try:
+            if self.client is None:
+                raise RuntimeError("Mail client unavailable")
+            data = freeze(job(self.client))
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            # A newer job of this kind may have been submitted while we ran;
+            # keep its entry so it still runs, otherwise mark the kind idle.
+            if self._latest.get(kind, (None,))[0] == seq:
+                del self._latest[kind]
+            self.stats["completed"] += 1
+            if error is not None:
+                self.stats["errors"] += 1
+
+        self._results.put((Snapshot(kind, seq, data, error, elapsed), callback))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Cache of resolved Outlook folder and store handles.
+
+Resolving 'Inbox/Subfolder' means walking GetRootFolder().Folders[...] one
+COM call per level, and finding a store by StoreID means enumerating
+namespace.Stores. Both run for every configured folder on every poll, so the
+resolved objects are kept here keyed by (StoreID, path) / StoreID.
+
+Entries expire after CACHE_TTL seconds and are dropped on folder
+add/rename/move/delete events and on reconnect. Those invalidations are
+process-wide: the events are only subscribed on the data engine's client,
+but the UI thread's client (used by move_email) must see them too. Each
+client keeps its own objects (they belong to its COM apartment); an
+invalidation bumps an epoch that every cache checks before returning an
+entry. Paths that didn't resolve aren't cached, so a folder created later
+is found on the next lookup.
+"""
+
+import threading
+import time
+
+MISSING = object()  # Sentinel: key not cached
+
+# Seconds a resolved folder/store handle is reused
+CACHE_TTL = 300
+
+# Process-wide invalidation epochs: all entries, and the folders of one store
+_epochs = {"all": 0, "stores": {}}
+_epochs_lock = threading.Lock()
+
+
+def _current_epoch(store_id=None):
+    with _epochs_lock:
+        return _epochs["all"], _epochs["stores"].get(store_id, 0)
+
+
+class FolderCache:
+    """Thread-safe (StoreID, path) -> folder and StoreID -> store cache."""
+
+    def __init__(self, ttl=CACHE_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._folders = {}      # key -> (folder, expires, epoch)
+        self._stores = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get_folder(self, store_id, path):
+        """Returns the cached folder or MISSING."""
+        return self._get(self._folders, (store_id, path), store_id)
+
+    def put_folder(self, store_id, path, folder):
+        if folder is not None:
+            self._put(self._folders, (store_id, path), folder, store_id)
+
+    def get_store(self, store_id):
+        """Returns the cached store or MISSING."""
+        return self._get(self._stores, store_id)
+
+    def put_store(self, store_id, store):
+        if store is not None:
+            self._put(self._stores, store_id, store)
+
+    def invalidate(self, store_id=None):
+        """Drops every entry, or only the folders of one store, in every client's cache."""
+        with _epochs_lock:
+            if store_id is None:
+                _epochs["all"] += 1
+            else:
+                _epochs["stores"][store_id] = _epochs["stores"].get(store_id, 0) + 1
+        with self._lock:
+            if store_id is None:
+                self._folders.clear()
+                self._stores.clear()
+            else:
+                for key in [k for k in self._folders if k[0] == store_id]:
+                    del self._folders[key]
+            self.stats["invalidations"] += 1
+
+    def _put(self, table, key, value, store_id=None):
+        epoch = _current_epoch(store_id)
+        with self._lock:
+            table[key] = (value, self._clock() + self.ttl, epoch)
+
+    def _get(self, table, key, store_id=None):
+        epoch = _current_epoch(store_id)
+        with self._lock:
+            entry = table.get(key)
+            if entry is not None and (entry[2] != epoch or self._clock() >= entry[1]):
+                del table[key]  # Expired or invalidated elsewhere; released on this thread
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return MISSING
+            self.stats["hits"] += 1
+            return entry[0]
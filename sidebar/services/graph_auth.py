@@ -1,5 +1,7 @@
 import os
 import threading
+import time
+import atexit
 import logging
 
 try:
@@ -19,6 +21,15 @@ SCOPES = [
     "User.Read"
 ]
 
+# A cached access token is only handed out while it has this many seconds left
+TOKEN_EXPIRY_MARGIN = 60
+
+# Background refresh starts this many seconds before the token expires
+TOKEN_REFRESH_LEAD = 300
+
+# Token cache writes are delayed and merged over this many seconds
+CACHE_SAVE_DELAY = 2.0
+
 class GraphAuth:
     """Manages Microsoft Graph API authentication via MSAL."""
     
@@ -36,6 +47,16 @@ class GraphAuth:
         self.app = None  # Set early so attribute always exists
         self.cache = None
         self._cache_path = None
+
+        # In-memory tokens and identities, so most get_token() calls skip MSAL
+        self._tokens = {}           # username (lowercase) -> (access token, expiry time)
+        self._accounts = None       # MSAL account dicts, enumerated once
+        self.accounts_version = 0   # Bumped on sign-in/sign-out (for account caches elsewhere)
+        self._token_lock = threading.RLock()
+        self._refresh_timers = {}   # username (lowercase) -> threading.Timer
+        self._last_login = None
+        self._save_timer = None
+        self._save_lock = threading.Lock()
         
         if msal is None:
             logger.warning("[GraphAuth] msal package not installed — Graph features disabled")
@@ -82,76 +103,193 @@ class GraphAuth:
             logger.error(f"[GraphAuth] Failed to initialize MSAL: {e}")
             self.app = None
 
-    def get_token(self, interactive=False):
+    def get_token(self, interactive=False, account=None):
         """
         Attempts to get a valid access token.
+        account is the username of a signed-in account (default: the first one).
         If interactive=True and silent auth fails, it will pop up a browser window.
         """
         if not self.app:
             return None
-        
-        accounts = self.app.get_accounts()
-        
-        if accounts:
-            # Try silent token acquisition (refreshing if needed)
-            # We just use the first account for now (simplest approach)
-            try:
-                result = self.app.acquire_token_silent(SCOPES, account=accounts[0])
-                if result and "access_token" in result:
-                    self._save_cache()
-                    return result["access_token"]
-            except Exception as e:
-                # Network errors (DNS, connection timeout) during token refresh
-                # Return None so the caller treats it as "not authenticated" rather than crashing
-                print(f"[GraphAuth] Token refresh failed (likely offline): {e}")
+
+        # Fast path: the token from the last acquire is still good
+        key = (account or self.get_current_user_email() or "").lower()
+        cached = self._tokens.get(key)
+        if cached and time.time() < cached[1] - TOKEN_EXPIRY_MARGIN:
+            return cached[0]
+
+        with self._token_lock:
+            cached = self._tokens.get(key)
+            if cached and time.time() < cached[1] - TOKEN_EXPIRY_MARGIN:
+                return cached[0]  # Another thread refreshed it meanwhile
+
+            msal_account = self._find_account(key)
+            if msal_account:
+                # Try silent token acquisition (refreshing if needed)
+                try:
+                    result = self.app.acquire_token_silent(SCOPES, account=msal_account)
+                    if result and "access_token" in result:
+                        return self._remember(key, result)
+                except Exception as e:
+                    # Network errors (DNS, connection timeout) during token refresh
+                    # Return None so the caller treats it as "not authenticated" rather than crashing
+                    print(f"[GraphAuth] Token refresh failed (likely offline): {e}")
+                    return None
+
+            # If silent fails and interactive is not requested, return None
+            if not interactive:
                 return None
-        
-        # If silent fails and interactive is not requested, return None
-        if not interactive:
+            return self._login_interactive(login_hint=account)
+
+    def add_account(self):
+        """Signs in one more account (browser prompt); returns its username."""
+        if not self.app:
             return None
-            
+        with self._token_lock:
+            self._login_interactive()
+            return self._last_login
+
+    def _login_interactive(self, login_hint=None):
         # Interactive login required (opens browser)
         print("[GraphAuth] Starting interactive login...")
+        kwargs = {"login_hint": login_hint} if login_hint else {}
         result = self.app.acquire_token_interactive(
             SCOPES,
             port=8400,
             prompt="select_account",
+            **kwargs
         )
-        
+
         if "access_token" in result:
-            self._save_cache()
-            return result["access_token"]
-            
+            self._accounts = None  # May have added an account
+            self.accounts_version += 1
+            username = (result.get("id_token_claims") or {}).get("preferred_username") \
+                or self.get_current_user_email() or ""
+            self._last_login = username
+            return self._remember(username.lower(), result)
+
         error_msg = result.get("error_description", result.get("error", "Unknown login error"))
         raise Exception(f"MSAL Login failed: {error_msg}")
 
+    def _msal_accounts(self):
+        """MSAL accounts, enumerating the cache only when not known yet."""
+        if self._accounts is None and self.app:
+            self._accounts = self.app.get_accounts()
+        return self._accounts or []
+
+    def _find_account(self, key):
+        for account in self._msal_accounts():
+            if (account.get("username") or "").lower() == key:
+                return account
+        return None
+
+    def _remember(self, key, result):
+        """Keeps the token from an MSAL result in memory and schedules its refresh."""
+        expires = time.time() + int(result.get("expires_in") or TOKEN_REFRESH_LEAD)
+        self._tokens[key] = (result["access_token"], expires)
+        self._schedule_refresh(key, max(expires - time.time() - TOKEN_REFRESH_LEAD, 30))
+        self._save_cache()
+        return result["access_token"]
+
+    def _schedule_refresh(self, key, delay):
+        timer = self._refresh_timers.get(key)
+        if timer:
+            timer.cancel()
+        timer = self._refresh_timers[key] = threading.Timer(delay, self._refresh_in_background, (key,))
+        timer.daemon = True
+        timer.start()
+
+    def _refresh_in_background(self, key):
+        """Renews a token before it expires so no request waits on the refresh."""
+        with self._token_lock:
+            account = self._find_account(key)
+            if not account:
+                return
+            try:
+                result = self.app.acquire_token_silent(SCOPES, account=account, force_refresh=True)
+            except Exception as e:
+                print(f"[GraphAuth] Background refresh failed: {e}")
+                result = None
+            if result and "access_token" in result:
+                self._remember(key, result)
+            elif time.time() < self._tokens.get(key, (None, 0))[1] - TOKEN_EXPIRY_MARGIN:
+                # Keep using the current token; try again a little later
+                self._schedule_refresh(key, 60)
+
+    def _forget_tokens(self, key=None):
+        with self._token_lock:
+            for k in [key] if key else list(self._refresh_timers):
+                timer = self._refresh_timers.pop(k, None)
+                if timer:
+                    timer.cancel()
+            if key:
+                self._tokens.pop(key, None)
+            else:
+                self._tokens = {}
+            self._accounts = None
+            self.accounts_version += 1
+
     def get_accounts(self):
         """Returns the cached MSAL accounts (who is logged in)."""
         if not self.app:
             return []
-        return self.app.get_accounts()
+        return list(self._msal_accounts())
+
+    def get_account_names(self):
+        """Usernames of every signed-in account, first (default) account first."""
+        return [a.get("username") for a in self.get_accounts() if a.get("username")]
 
-    def logout(self):
-        """Signs the user out by clearing the token cache."""
+    def logout(self, account=None):
+        """Signs out one account (by username), or every account by clearing the token cache."""
         if not self.app:
             return
-        for account in self.app.get_accounts():
-            self.app.remove_account(account)
-        self._save_cache()
-        
+        for msal_account in self.app.get_accounts():
+            if account is None or (msal_account.get("username") or "").lower() == account.lower():
+                self.app.remove_account(msal_account)
+        self._forget_tokens(account.lower() if account else None)
+        self.flush_cache()
+
     def get_current_user_email(self):
         """Returns the email address of the first logged in account, or None."""
         if not self.app:
             return None
-        accounts = self.app.get_accounts()
+        accounts = self._msal_accounts()
         if accounts:
             return accounts[0].get("username")
         return None
 
     def _save_cache(self):
-        """Saves the token cache to disk if it was modified."""
+        """Schedules a write of the token cache if it was modified (write-behind)."""
         if not self.cache or not self._cache_path:
             return
-        if self.cache.has_state_changed:
-            with open(self._cache_path, "w") as f:
-                f.write(self.cache.serialize())
+        if not self.cache.has_state_changed:
+            return
+        with self._save_lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(CACHE_SAVE_DELAY, self.flush_cache)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush_cache(self):
+        """Writes the token cache to disk now if it was modified."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self.cache or not self._cache_path or not self.cache.has_state_changed:
+                return
+            try:
+                tmp = self._cache_path + ".tmp"
+                with open(tmp, "w") as f:
+                    f.write(self.cache.serialize())
+                os.replace(tmp, self._cache_path)
+                self.cache.has_state_changed = False
+            except Exception as e:
+                print(f"[GraphAuth] Token cache save failed: {e}")
+
+
+@atexit.register
+def _flush_on_exit():
+    # A pending write-behind save must not be lost when the app quits
+    if GraphAuth._instance is not None:
+        GraphAuth._instance.flush_cache()
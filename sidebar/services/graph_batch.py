@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""Coalesces concurrent Graph GET calls into JSON $batch requests.
+
+A sidebar refresh runs its emails, reminders and poll jobs side by side on
+the DataEngine Graph workers, and each used to make its own round-trip
+(inbox, calendarView, todo lists/tasks, masterCategories...). GraphBatcher
+collects the GETs issued within a short window from any thread and sends
+them as one POST /$batch of up to MAX_BATCH_SIZE requests, then hands each
+caller its own status, body and headers.
+
+Items answered with 429 or 5xx are retried in a later batch after their
+Retry-After (or a short backoff). If the $batch call itself is rejected the
+callers are told to make their request directly instead.
+
+The caller that sends (the leader) only does so until its own request is
+answered; whatever is still queued (other callers' retries, late arrivals)
+is handed to one of their callers, so no caller waits on unrelated
+requests. A GET made while nothing else is queued or in flight, and the
+follow-up pages of a pager or delta round (absolute nextLink/deltaLink
+URLs), are sent on their own right away instead of waiting for a batch.
+"""
+
+import threading
+import time
+
+import requests
+
+# Graph accepts at most 20 requests per $batch
+MAX_BATCH_SIZE = 20
+
+# Seconds the first caller waits for others to join its batch
+BATCH_WINDOW = 0.03
+
+# Per-item retry policy for throttled/failed items
+MAX_ITEM_RETRIES = 3
+MAX_RETRY_DELAY = 10
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Returned instead of (status, body, headers) when the caller should send the request itself
+FALLBACK = object()
+
+
+class _Item:
+    __slots__ = ("method", "url", "headers", "token", "attempts", "not_before", "result", "error",
+                 "finished")
+
+    def __init__(self, method, url, headers, token=None):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.token = token
+        self.attempts = 0
+        self.not_before = 0
+        self.result = None
+        self.error = None
+        self.finished = False
+
+
+class GraphBatcher:
+    """Shared queue of pending GETs; the first caller in a window sends the batch."""
+
+    def __init__(self, session, token_provider, base_url, window=BATCH_WINDOW,
+                 max_batch=MAX_BATCH_SIZE, max_retries=MAX_ITEM_RETRIES):
+        self.session = session
+        self.token_provider = token_provider
+        self.base_url = base_url
+        self.window = window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self._queue = []
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)  # Signalled when items finish or the leader leaves
+        self._sending = False
+        self._alone = 0     # Requests being sent on their own right now
+        self.stats = {"batches": 0, "items": 0, "retries": 0, "fallbacks": 0, "alone": 0,
+                      "handoffs": 0}
+
+    def relative_url(self, url):
+        """$batch items take URLs relative to the version root."""
+        if url.startswith(self.base_url):
+            return url[len(self.base_url):]
+        return url
+
+    def request(self, method, url, headers=None, token=None):
+        """Queues a request and waits for its batch.
+
+        token is the caller's access token; only requests with the same token
+        (i.e. the same mailbox) share a batch.
+
+        Returns (status, body, headers) or FALLBACK; re-raises network errors
+        from the $batch call so callers can still detect being offline.
+        """
+        follow_up = url.startswith("http")  # nextLink/deltaLink of a pager or delta round
+        item = _Item(method, self.relative_url(url), headers or {}, token)
+        with self._cond:
+            alone = follow_up or not (self._queue or self._sending or self._alone)
+            if alone:
+                self._alone += 1
+                self.stats["alone"] += 1
+            else:
+                self._queue.append(item)
+        if alone:
+            try:
+                return self._send_alone(item)
+            finally:
+                with self._cond:
+                    self._alone -= 1
+
+        joined = False  # Another caller was leading when we queued
+        while True:
+            with self._cond:
+                while not item.finished and self._sending:
+                    joined = True
+                    self._cond.wait()
+                if item.finished:
+                    break
+                self._sending = True  # Lead: send until our own item is answered
+                if joined:
+                    self.stats["handoffs"] += 1
+            if not joined:
+                time.sleep(self.window)  # Let concurrent callers join the batch
+            joined = True
+            try:
+                self._drain(item)
+            finally:
+                with self._cond:
+                    self._sending = False
+                    self._cond.notify_all()
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    # --- Sending ---
+    def _send_alone(self, item):
+        """One GET sent as is (no batch); same result shape as a batch item."""
+        token = item.token or self.token_provider()
+        if not token:
+            return FALLBACK
+        headers = dict(item.headers)
+        headers["Authorization"] = f"Bearer {token}"
+        url = item.url if item.url.startswith("http") else f"{self.base_url}{item.url}"
+        resp = self.session.request(item.method, url, headers=headers)
+        body = None
+        if "application/json" in resp.headers.get("Content-Type", ""):
+            try:
+                body = resp.json()
+            except ValueError:
+                pass
+        return resp.status_code, body, resp.headers
+
+    def _drain(self, own):
+        """Sends batches until own is answered."""
+        while True:
+            with self._cond:
+                if own.finished:
+                    return
+                now = time.time()
+                ready = [i for i in self._queue if i.not_before <= now]
+                if ready:
+                    ready = [i for i in ready if i.token == ready[0].token][:self.max_batch]
+                if not ready:
+                    wait = min(i.not_before for i in self._queue) - now
+                else:
+                    wait = 0
+                    for i in ready:
+                        self._queue.remove(i)
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            try:
+                self._send(ready)
+            except Exception as e:
+                print(f"[GraphBatch] Batch send failed: {e}")
+                with self._cond:
+                    stranded = [i for i in ready if not i.finished and i not in self._queue]
+                self._finish(stranded, FALLBACK)
+
+    def _send(self, items):
+        token = items[0].token or self.token_provider()
+        if not token:
+            self._finish(items, FALLBACK)
+            return
+
+        payload = {"requests": [
+            {"id": str(n), "method": i.method, "url": i.url, "headers": i.headers}
+            for n, i in enumerate(items)
+        ]}
+        try:
+            resp = self.session.request("POST", f"{self.base_url}/$batch", json=payload, headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            })
+        except requests.exceptions.RequestException as e:
+            for i in items:
+                i.error = e
+            self._finish(items, None)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["items"] += len(items)
+        if resp.status_code != 200:
+            print(f"[GraphBatch] $batch rejected ({resp.status_code}); sending {len(items)} requests directly")
+            self._finish(items, FALLBACK)
+            return
+
+        try:
+            responses = {r.get("id"): r for r in resp.json().get("responses", [])}
+        except ValueError:
+            self._finish(items, FALLBACK)
+            return
+
+        for n, item in enumerate(items):
+            r = responses.get(str(n))
+            if r is None:
+                self._finish([item], FALLBACK)
+                continue
+            status = r.get("status", 0)
+            if status in RETRY_STATUSES and item.attempts < self.max_retries:
+                item.attempts += 1
+                item.not_before = time.time() + self._retry_delay(r, item.attempts)
+                self.stats["retries"] += 1
+                with self._cond:
+                    self._queue.append(item)
+                continue
+            self._finish([item], (status, r.get("body"), r.get("headers") or {}))
+
+    def _retry_delay(self, response, attempt):
+        headers = {k.lower(): v for k, v in (response.get("headers") or {}).items()}
+        try:
+            delay = float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            delay = 2 ** (attempt - 1)
+        return min(delay, MAX_RETRY_DELAY)
+
+    def _finish(self, items, result):
+        with self._cond:
+            for i in items:
+                if result is FALLBACK:
+                    self.stats["fallbacks"] += 1
+                i.result = result
+                i.finished = True
+            self._cond.notify_all()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_graph_batcher(session, token_provider, base_url):
+    """Returns the process-wide GraphBatcher (created on first use)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = GraphBatcher(session, token_provider, base_url)
+        return _shared
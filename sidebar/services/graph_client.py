@@ -5,53 +5,114 @@ import urllib.parse
 from urllib.parse import quote
 from sidebar.services.mail_client import MailClient
 from sidebar.services.graph_auth import GraphAuth
+from sidebar.services.graph_http import get_graph_session
+from sidebar.services.graph_delta import get_mail_sync, mail_syncs
+from sidebar.services.graph_batch import get_graph_batcher, FALLBACK
+from sidebar.services.graph_throttle import get_graph_scheduler, THROTTLE_STATUSES
+from sidebar.services.graph_pager import iter_items, take
+from sidebar.services.graph_folders import GraphFolderIndex
+from sidebar.services.graph_tasks import get_task_sync
+from sidebar.services.backend_health import get_breaker
+from sidebar.services.item_record import MailItem, EventItem, TaskItem, importance_level
+from sidebar.services.graph_query import (MESSAGE_FIELDS, EVENT_FIELDS, TASK_FIELDS,
+                                          build_query, inbox_filter, task_due_filter, and_filters)
+from sidebar.services.stream_merge import merge_top_n, start_key
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import traceback
 
+# Accounts fetched at the same time
+GRAPH_ACCOUNT_WORKERS = 4
+
 class GraphAPIClient(MailClient):
     """
     Microsoft Graph API (HTTP) implementation of the MailClient interface.
     Used for New Outlook, Office 365, and web-only users.
+
+    GraphAPIClient() serves every signed-in Microsoft account: reads fan out
+    to one GraphAPIClient(account=...) context per account, in parallel, and
+    item actions go to the account that owns the item (store_id).
     """
-    def __init__(self):
+    def __init__(self, account=None):
+        self.account = account  # None: all signed-in accounts
         self.auth = GraphAuth()
+        self.http = get_graph_session()  # Shared keep-alive connection pool
         self.base_url = "https://graph.microsoft.com/v1.0"
+        self.batch_requests = True  # Coalesce concurrent GETs into $batch calls
+        self.batcher = get_graph_batcher(self.http, lambda: self.auth.get_token(interactive=False),
+                                         self.base_url)
+        self.scheduler = get_graph_scheduler()  # Budgets, Retry-After and stale results
+        self.health = get_breaker("graph")      # Fails fast while Graph is unreachable
+        self._call = threading.local()          # Per-thread outcome of the last _request
+        self._rejected_filters = set()          # Views whose server-side filter Graph refused
         self._cache = {}
         self.last_received_time = None
         self._connected = False
+        self.delta_sync = True   # Serve inbox reads from a delta-synced local cache
+        self._folder_indexes = {}  # account email -> GraphFolderIndex
+        self._contexts = {}        # account email -> GraphAPIClient(account) (top level only)
+        self._contexts_lock = threading.Lock()
+        self.account_stats = {}    # account email -> {"seconds", "errors"} of the last fan-out
 
     # --- Core HTTP Helper ---
-    def _request(self, method, endpoint, **kwargs):
-        """Helper to append token and execute a Graph API request."""
+    def _request(self, method, endpoint, stale_ok=True, **kwargs):
+        """Helper to append token and execute a Graph API request.
+
+        A throttled GET returns the last good result for the endpoint; pass
+        stale_ok=False when the result decides a write (it returns None instead).
+        """
         # Try to get a valid token without prompting
-        token = self.auth.get_token(interactive=False)
+        token = self.auth.get_token(interactive=False, account=self.account)
         if not token:
             # Silently return if not authenticated to prevent log spam in hybrid mode
             return None
 
+        self._call.throttled = False
+        self._call.status = None
+        if method == "GET" and not self.scheduler.admit(endpoint, scope=self._scope):
+            # Over budget or inside a Retry-After window: serve the last good result
+            self._call.throttled = True
+            return self.scheduler.stale(endpoint, scope=self._scope) if stale_ok else None
+
+        if not self.health.allow():
+            raise requests.exceptions.ConnectionError(
+                f"Graph unreachable; next attempt in {self.health.retry_in():.0f}s")
+
         headers = kwargs.pop('headers', {})
+        if method == "GET" and self.batch_requests and not kwargs and "/photo" not in endpoint:
+            result = self._batched_get(endpoint, headers, token, stale_ok)
+            if result is not FALLBACK:
+                return result
+
         headers['Authorization'] = f"Bearer {token}"
         headers['Content-Type'] = 'application/json'
         
         url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
         
-        # Enforce a connection timeout so the app doesn't hang when offline.
-        # (connect_timeout=10s, read_timeout=30s)
-        if 'timeout' not in kwargs:
-            kwargs['timeout'] = (10, 30)
-        
+        # The session applies a per-endpoint (connect, read) timeout unless
+        # one is passed, so the app doesn't hang when offline
         try:
-            resp = requests.request(method, url, headers=headers, **kwargs)
+            resp = self.http.request(method, url, headers=headers, **kwargs)
+            self._call.status = resp.status_code
+            self._record(endpoint, resp.status_code, resp.headers)
+            if method == "GET" and resp.status_code in THROTTLE_STATUSES:
+                return self.scheduler.stale(endpoint, scope=self._scope) if stale_ok else None
             if resp.status_code == 204: # No Content (Success)
                 return True
             resp.raise_for_status()
             
             # Not all APIs return JSON (e.g., photo downloads)
             if "application/json" in resp.headers.get("Content-Type", ""):
-                 return resp.json()
+                 body = resp.json()
+                 if method == "GET":
+                     self._remember(endpoint, body)
+                 return body
             return resp.content
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
             # Network/connectivity errors — re-raise so callers can detect offline state
             print(f"[Graph] Network error {method} {endpoint}: {e}")
+            self.health.failure()
             raise
         except requests.exceptions.RequestException as e:
             # HTTP errors (4xx/5xx) — return None, these are API-level issues
@@ -60,9 +121,163 @@ class GraphAPIClient(MailClient):
                 print(f"[Graph] detail: {e.response.text}")
             return None
 
+    def _batched_get(self, endpoint, headers, token, stale_ok=True):
+        """Sends a GET through the shared $batch coalescer; same results as _request."""
+        try:
+            result = self.batcher.request("GET", endpoint, headers=dict(headers), token=token)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            print(f"[Graph] Network error GET {endpoint}: {e}")
+            self.health.failure()
+            raise
+        except requests.exceptions.RequestException:
+            return FALLBACK
+        if result is FALLBACK:
+            return FALLBACK
+
+        status, body, resp_headers = result
+        self._call.status = status
+        self._record(endpoint, status, resp_headers)
+        if status in THROTTLE_STATUSES:
+            return self.scheduler.stale(endpoint, scope=self._scope) if stale_ok else None
+        if status == 204:
+            return True
+        if 200 <= status < 300:
+            self._remember(endpoint, body)
+            return body
+        print(f"[Graph] API Error GET {endpoint}: {status}")
+        if body:
+            print(f"[Graph] detail: {body}")
+        return None
+
+    def _record(self, endpoint, status, headers):
+        """Reports a response status to the throttling scheduler (and Graph as reachable)."""
+        self.health.success()
+        retry_after = None
+        for key, value in (headers or {}).items():
+            if key.lower() == "retry-after":
+                retry_after = value
+        self.scheduler.record(endpoint, status, retry_after, scope=self._scope)
+        if status in THROTTLE_STATUSES:
+            self._call.throttled = True
+
+    def _remember(self, endpoint, body):
+        # Delta links are single-use, so there is nothing to serve stale for them
+        if isinstance(body, dict) and "/delta" not in endpoint:
+            self.scheduler.remember(endpoint, body, scope=self._scope)
+
+    def _collection(self, view, endpoint, fallback, headers=None):
+        """Iterates a collection with a server-side filter, if Graph accepts it for this view.
+
+        fallback is the same query without the filter; it's used for the rest
+        of the session once Graph answers the filtered one with 400 (e.g.
+        "InefficientFilter"). Callers always re-apply the filter locally.
+        """
+        if endpoint != fallback and view not in self._rejected_filters:
+            first = self._request("GET", endpoint, headers=dict(headers or {}))
+            if first is not None or getattr(self._call, "status", None) != 400:
+                return iter_items(self._request, endpoint, headers, first_page=first or {})
+            print(f"[Graph] Server-side filter rejected for {view}; filtering locally")
+            self._rejected_filters.add(view)
+        return iter_items(self._request, fallback, headers)
+
+    def last_call_throttled(self):
+        """True if this thread's last _request was deferred or answered 429/503."""
+        return getattr(self._call, "throttled", False)
+
+    def last_call_failed(self):
+        """True if this thread's last _request got no usable answer."""
+        status = getattr(self._call, "status", None)
+        return self.last_call_throttled() or status is None or status >= 400
+
+    @property
+    def _scope(self):
+        return self.account or ""
+
+    # --- Accounts ---
+    def _email(self):
+        """The account this client acts for (the default account at top level)."""
+        return self.account or self.auth.get_current_user_email()
+
+    def _context(self, account):
+        """Returns the client bound to one account (created once, shares the HTTP plumbing)."""
+        if self.account is not None:
+            return self
+        with self._contexts_lock:
+            ctx = self._contexts.get(account)
+            if ctx is None:
+                ctx = self._contexts[account] = GraphAPIClient(account=account)
+                ctx.auth, ctx.base_url, ctx.scheduler = self.auth, self.base_url, self.scheduler
+                ctx.delta_sync = self.delta_sync
+                ctx.batch_requests = self.batch_requests
+            return ctx
+
+    def _accounts_for(self, account_names):
+        """Signed-in accounts matching account_names (all when None/empty).
+
+        Names that aren't Graph accounts (e.g. COM stores passed through the
+        hybrid client) select the default account, as before multi-account support.
+        """
+        accounts = self.get_accounts()
+        if not account_names:
+            return accounts
+        lowered = {a.lower() for a in account_names}
+        chosen = [a for a in accounts if a.lower() in lowered]
+        return chosen or accounts[:1]
+
+    def _for_each_account(self, account_names, work):
+        """Runs work(context) for each selected account in parallel.
+
+        Returns the results of the accounts that succeeded; one failing
+        account doesn't affect the others. If every account failed and one of
+        them was a network error, that error is raised (offline detection).
+        """
+        accounts = self._accounts_for(account_names)
+        if not accounts:
+            return []
+
+        def run(account):
+            start = time.perf_counter()
+            try:
+                return work(self._context(account)), None
+            except Exception as e:
+                print(f"[Graph] {account} failed: {e}")
+                return None, e
+            finally:
+                self.account_stats[account] = {"seconds": round(time.perf_counter() - start, 3)}
+
+        if len(accounts) == 1:
+            outcomes = [run(accounts[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(accounts), GRAPH_ACCOUNT_WORKERS)) as pool:
+                outcomes = list(pool.map(run, accounts))
+
+        results = [r for r, e in outcomes if e is None]
+        errors = [e for r, e in outcomes if e is not None]
+        for account, (_, e) in zip(accounts, outcomes):
+            self.account_stats[account]["errors"] = 0 if e is None else 1
+        if not results and errors:
+            network = [e for e in errors if isinstance(e, (requests.exceptions.ConnectionError,
+                                                           requests.exceptions.Timeout))]
+            raise network[0] if network else errors[0]
+        return results
+
+    def _item_context(self, entry_id, store_id):
+        """Context owning an item: store_id is the account for mail, the list id for tasks."""
+        if self.account is not None:
+            return self
+        accounts = self.get_accounts()
+        for account in accounts:
+            if store_id and store_id.lower() == account.lower():
+                return self._context(account)
+        for account in accounts:
+            sync = self._context(account)._task_sync()
+            if sync and ((store_id and sync.has_list(store_id)) or sync.list_of(entry_id)):
+                return self._context(account)
+        return self._context(accounts[0]) if accounts else self
+
     # --- Connection & Auth ---
     def _get_domain(self):
-        email = self.auth.get_current_user_email()
+        email = self._email()
         if not email: return "office.com"
         consumer_domains = ["@outlook.com", "@hotmail.com", "@live.com", "@msn.com"]
         if any(email.lower().endswith(d) for d in consumer_domains):
@@ -89,13 +304,14 @@ class GraphAPIClient(MailClient):
         return self._connected
 
     def get_accounts(self) -> list:
-        # Return the currently logged in account
-        email = self.auth.get_current_user_email()
-        return [email] if email else []
+        # Every signed-in account (or just this context's)
+        if self.account is not None:
+            return [self.account]
+        return self.auth.get_account_names()
 
     # --- Data Mappers ---
     def _map_message(self, msg):
-        """Converts Graph API Message JSON to InboxBar schema."""
+        """Converts Graph API Message JSON to a MailItem."""
         if not msg: return None
         
         try:
@@ -123,27 +339,29 @@ class GraphAPIClient(MailClient):
 
         from_email = msg.get("from", {}).get("emailAddress", {})
         
-        return {
-            "entry_id": msg.get("id"),
-            "store_id": None, # Graph doesn't use store IDs
-            "subject": msg.get("subject", ""),
-            "sender": from_email.get("name", "Unknown"),
-            "sender_email": from_email.get("address", ""),
-            "received": recv_dt,
-            "unread": not msg.get("isRead", True),
-            "has_attachment": msg.get("hasAttachments", False),
-            "importance": msg.get("importance", "normal"),
-            "flag_status": flag_status,
-            "flag_request": fReq, # API doesn't return 'Follow up' string natively?
-            "flag_due": fDue,
-            "categories": msg.get("categories", []),
-            "body_preview": msg.get("bodyPreview", ""),
-            "conversation_id": msg.get("conversationId", ""),
-            "web_link": msg.get("webLink", ""),  # Specific to Graph
-        }
+        return MailItem(
+            entry_id=msg.get("id"),
+            store_id=self.account,  # Owning account, for routing item actions
+            account=self.account or "",
+            subject=msg.get("subject", ""),
+            sender=from_email.get("name", "Unknown"),
+            sender_email=from_email.get("address", ""),
+            received=recv_dt,
+            unread=not msg.get("isRead", True),
+            has_attachments=msg.get("hasAttachments", False),
+            importance=importance_level(msg.get("importance")),
+            flag_status=flag_status,
+            flag_request=fReq, # API doesn't return 'Follow up' string natively?
+            due_date=fDue,
+            categories=msg.get("categories", []),
+            preview=msg.get("bodyPreview", ""),
+            modified=msg.get("lastModifiedDateTime"),
+            conversation_id=msg.get("conversationId", ""),
+            web_link=msg.get("webLink", ""),  # Specific to Graph
+        )
 
     def _map_event(self, evt):
-         """Converts Graph API Event JSON to InboxBar schema."""
+         """Converts Graph API Event JSON to an EventItem."""
          if not evt: return None
          
          # Time handling (usually in UTC for Graph API /me/calendarView if timezone header not set)
@@ -169,24 +387,26 @@ class GraphAPIClient(MailClient):
          rsp = rsp_map.get(r_str, 0)
          
          link = evt.get("webLink", "")
-         email = self.auth.get_current_user_email()
+         email = self._email()
          if email and link:
              link += f"&login_hint={urllib.parse.quote(email)}" if "?" in link else f"?login_hint={urllib.parse.quote(email)}"
              
-         return {
-            "entry_id": evt.get("id"),
-            "subject": evt.get("subject", "No Title"),
-            "start": start_dt,
-            "end": end_dt,
-            "location": evt.get("location", {}).get("displayName", ""),
-            "response_status": rsp,
-            "organizer": evt.get("organizer", {}).get("emailAddress", {}).get("name", ""),
-            "is_recurring": evt.get("seriesMasterId") is not None,
-            "web_link": link,
-         }
+         return EventItem(
+            entry_id=evt.get("id"),
+            store_id=self.account,
+            account=self.account or "",
+            subject=evt.get("subject", "No Title"),
+            start=start_dt,
+            end=end_dt,
+            location=evt.get("location", {}).get("displayName", ""),
+            response_status=rsp,
+            organizer=evt.get("organizer", {}).get("emailAddress", {}).get("name", ""),
+            is_recurring=evt.get("seriesMasterId") is not None,
+            web_link=link,
+         )
 
     def _map_task(self, task):
-        """Converts Graph API To Do Task JSON to InboxBar schema."""
+        """Converts Graph API To Do Task JSON to a TaskItem."""
         if not task: return None
         
         due_dt = None
@@ -196,53 +416,105 @@ class GraphAPIClient(MailClient):
                  due_dt = datetime.fromisoformat(due_obj["dateTime"].split(".")[0])
             except: pass
             
-        email = self.auth.get_current_user_email()
+        email = self._email()
         login_hint = f"?login_hint={urllib.parse.quote(email)}" if email else ""
-        return {
-            "entry_id": task.get("id"),
-            "subject": task.get("title", ""),
-            "due": due_dt,
-            "importance": task.get("importance", "normal").title(),
-            "status": "Completed" if task.get("status") == "completed" else "NotStarted",
-            "categories": task.get("categories", []), # Often empty for ToDo unless mapped
-            "is_recurring": False, # Basic task structure
-            "has_reminder": task.get("isReminderOn", False),
-            "complete": task.get("status") == "completed",
-            "web_link": f"https://to-do.{self._get_domain()}/tasks/id/{task.get('id')}{login_hint}",
-        }
+        return TaskItem(
+            entry_id=task.get("id"),
+            store_id=task.get("_list_id"),  # To Do list holding the task
+            account=self.account or "",
+            subject=task.get("title", ""),
+            due=due_dt,
+            importance=task.get("importance", "normal").title(),
+            status="Completed" if task.get("status") == "completed" else "NotStarted",
+            categories=task.get("categories", []), # Often empty for ToDo unless mapped
+            is_recurring=False, # Basic task structure
+            has_reminder=task.get("isReminderOn", False),
+            complete=task.get("status") == "completed",
+            web_link=f"https://to-do.{self._get_domain()}/tasks/id/{task.get('id')}{login_hint}",
+        )
 
     # --- Email Operations ---
+    def _inbox_sync(self):
+        """Returns the synced inbox cache for the signed-in account, or None to use plain queries."""
+        if not self.delta_sync:
+            return None
+        account = self._email()
+        if not account:
+            return None
+        sync = get_mail_sync(self, account)  # Shared with the other clients in the process
+        if sync.sync() is None:
+            return None
+        return sync
+
+    def _changed(self, resp, entry_id=None, fields=None):
+        """Applies a successful edit to the shared mail cache (fields=None: the
+        message is gone) and expires it so the next refresh runs a delta round."""
+        if resp is None:
+            return False
+        for sync in mail_syncs(self._email()):
+            if entry_id is not None:
+                sync.apply_local(entry_id, fields)
+            else:
+                sync.expire()
+        return True
+
+    def _track_latest(self, latest):
+        """Advances last_received_time; returns True if latest is newer."""
+        if not self.last_received_time:
+            self.last_received_time = latest
+            return False
+        if latest > self.last_received_time:
+            self.last_received_time = latest
+            return True
+        return False
+
     def get_inbox_items(self, count=20, unread_only=False, only_flagged=False, 
                         due_filters=None, account_names=None, account_config=None) -> tuple:
-        """Fetch emails via /me/mailFolders/inbox/messages"""
-        
-        filters = []
-        if unread_only:
-            filters.append("isRead eq false")
-        # Removing `flag/flagStatus eq 'flagged'` because Microsoft Graph blocks this as an "InefficientFilter" on Inbox
-            
-        params = [
-            f"$top={count}",
-            "$orderby=receivedDateTime desc"
-        ]
-        if filters:
-             params.append(f"$filter=" + " and ".join(filters))
-             
-        query = "&".join(params)
-        endpoint = f"/me/mailFolders/inbox/messages?{query}"
-        
-        data = self._request("GET", endpoint)
-        if not data:
-            return [], 0
-            
-        messages = [self._map_message(m) for m in data.get("value", [])]
-        
-        # Apply flag filter locally since Graph API rejects it conditionally
-        if only_flagged:
-             messages = [m for m in messages if m["flag_status"] != 0]
+        """Fetch emails from the delta-synced cache, else via /me/mailFolders/inbox/messages"""
+        if self.account is None:
+            results = self._for_each_account(account_names, lambda ctx: ctx.get_inbox_items(
+                count, unread_only, only_flagged, due_filters, None, account_config))
+            messages = merge_top_n([r[0] for r in results], count)
+            return messages, sum(r[1] for r in results)
+
+        unread_count = None
+        sync = self._inbox_sync()
+        if sync is not None:
+            raw = sync.newest_first()
+            cached_unread = sum(1 for m in raw if not m.get("isRead", True))
+            if unread_only:
+                raw = [m for m in raw if not m.get("isRead", True)]
+            messages = [m for m in (self._map_message(m) for m in raw) if m]
+            if only_flagged:
+                messages = [m for m in messages if m["flag_status"] != 0]
+            messages = messages[:count]
+            unread_count = self.get_unread_count()
+            # The cache only holds DELTA_WINDOW_DAYS: a short list may be missing
+            # older mail, unless every unread message is cached (unread view)
+            complete = len(messages) >= count or (
+                unread_only and not only_flagged and cached_unread >= unread_count)
+            if complete:
+                if messages:
+                    self._track_latest(messages[0]["received"])
+                return messages, unread_count
+
+        path = "/me/mailFolders/inbox/messages"
+        orderby = "receivedDateTime desc"
+        endpoint = build_query(path, select=MESSAGE_FIELDS, top=count, orderby=orderby,
+                               filter=inbox_filter(unread_only, only_flagged))
+        fallback = build_query(path, select=MESSAGE_FIELDS, top=count, orderby=orderby,
+                               filter=inbox_filter(unread_only))
+        view = "inbox_flagged" if only_flagged else "inbox"
+
+        # Pages are only fetched until `count` messages pass the local flag filter
+        # (kept in case Graph drops or rejects the server-side one)
+        raw = (self._map_message(m) for m in self._collection(view, endpoint, fallback))
+        keep = (lambda m: m and m["flag_status"] != 0) if only_flagged else (lambda m: m)
+        messages = take(raw, count, keep)
 
         # We also need total unread count (Graph doesn't return total DB count on a filtered query)
-        unread_count = self.get_unread_count()
+        if unread_count is None:
+            unread_count = self.get_unread_count()
         
         # Track latest time
         if messages:
@@ -253,40 +525,58 @@ class GraphAPIClient(MailClient):
         return messages, unread_count
 
     def get_unread_count(self, account_names=None, account_config=None) -> int:
+        if self.account is None:
+            return sum(self._for_each_account(account_names, lambda ctx: ctx.get_unread_count()))
+        # The folder's count, not the delta cache's (which only holds DELTA_WINDOW_DAYS)
         data = self._request("GET", "/me/mailFolders/inbox?$select=unreadItemCount")
         if data:
             return data.get("unreadItemCount", 0)
         return 0
 
     def mark_as_read(self, entry_id, store_id=None) -> bool:
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.mark_as_read(entry_id, store_id)
         resp = self._request("PATCH", f"/me/messages/{entry_id}", json={"isRead": True})
-        return resp is not None
+        return self._changed(resp, entry_id, {"isRead": True})
 
     def delete_email(self, entry_id, store_id=None) -> bool:
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.delete_email(entry_id, store_id)
         resp = self._request("DELETE", f"/me/messages/{entry_id}")
-        return resp is not None
+        return self._changed(resp, entry_id)
 
     def toggle_flag(self, entry_id, store_id=None) -> bool:
-        # 1. Fetch current
-        msg = self._request("GET", f"/me/messages/{entry_id}?$select=flag")
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.toggle_flag(entry_id, store_id)
+        # 1. Fetch current (never a cached copy: it decides what we write)
+        msg = self._request("GET", f"/me/messages/{entry_id}?$select=flag", stale_ok=False)
         if not msg: return False
         
         status = msg.get("flag", {}).get("flagStatus", "unflagged")
         new_status = "notFlagged" if status == "flagged" else "flagged"
         
         resp = self._request("PATCH", f"/me/messages/{entry_id}", json={"flag": {"flagStatus": new_status}})
-        return resp is not None
+        return self._changed(resp, entry_id, {"flag": {"flagStatus": new_status}})
 
     def unflag_email(self, entry_id, store_id=None) -> bool:
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.unflag_email(entry_id, store_id)
         resp = self._request("PATCH", f"/me/messages/{entry_id}", json={"flag": {"flagStatus": "notFlagged"}})
-        return resp is not None
+        return self._changed(resp, entry_id, {"flag": {"flagStatus": "notFlagged"}})
 
     def open_item(self, entry_id, store_id=None):
         """Open web link in default browser."""
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.open_item(entry_id, store_id)
         msg = self._request("GET", f"/me/messages/{entry_id}?$select=webLink")
         if msg and "webLink" in msg:
             link = msg["webLink"]
-            email = self.auth.get_current_user_email()
+            email = self._email()
             if email and link:
                 link += f"&login_hint={urllib.parse.quote(email)}" if "?" in link else f"?login_hint={urllib.parse.quote(email)}"
             webbrowser.open(link)
@@ -295,6 +585,9 @@ class GraphAPIClient(MailClient):
 
     def reply_to_email(self, entry_id, store_id=None) -> bool:
         """Opens a compose window directly from Graph API via deeplink or creates a draft."""
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.reply_to_email(entry_id, store_id)
         # The most reliable way cross-platform without creating headless drafts: Let the browser do it if possible,
         # otherwise create a reply draft and open it.
         # Create draft:
@@ -304,7 +597,7 @@ class GraphAPIClient(MailClient):
             msg = self._request("GET", f"/me/messages/{resp['id']}?$select=webLink")
             if msg and "webLink" in msg:
                 link = msg["webLink"]
-                email = self.auth.get_current_user_email()
+                email = self._email()
                 if email and link:
                     link += f"&login_hint={urllib.parse.quote(email)}" if "?" in link else f"?login_hint={urllib.parse.quote(email)}"
                 webbrowser.open(link)
@@ -313,12 +606,15 @@ class GraphAPIClient(MailClient):
 
     def reply_all_to_email(self, entry_id, store_id=None) -> bool:
         """Creates a Reply All draft and opens it in the browser."""
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.reply_all_to_email(entry_id, store_id)
         resp = self._request("POST", f"/me/messages/{entry_id}/createReplyAll")
         if resp and "id" in resp:
             msg = self._request("GET", f"/me/messages/{resp['id']}?$select=webLink")
             if msg and "webLink" in msg:
                 link = msg["webLink"]
-                email = self.auth.get_current_user_email()
+                email = self._email()
                 if email and link:
                     link += f"&login_hint={urllib.parse.quote(email)}" if "?" in link else f"?login_hint={urllib.parse.quote(email)}"
                 webbrowser.open(link)
@@ -327,12 +623,15 @@ class GraphAPIClient(MailClient):
 
     def forward_email(self, entry_id, store_id=None) -> bool:
         """Creates a Forward draft and opens it in the browser."""
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.forward_email(entry_id, store_id)
         resp = self._request("POST", f"/me/messages/{entry_id}/createForward")
         if resp and "id" in resp:
             msg = self._request("GET", f"/me/messages/{resp['id']}?$select=webLink")
             if msg and "webLink" in msg:
                 link = msg["webLink"]
-                email = self.auth.get_current_user_email()
+                email = self._email()
                 if email and link:
                     link += f"&login_hint={urllib.parse.quote(email)}" if "?" in link else f"?login_hint={urllib.parse.quote(email)}"
                 webbrowser.open(link)
@@ -340,26 +639,36 @@ class GraphAPIClient(MailClient):
         return False
 
     def move_email(self, entry_id, folder_name, store_id=None) -> bool:
-        """Moves an email to a destination folder by name."""
-        # Find folder ID
-        folders = self._request("GET", f"/me/mailFolders?$filter=displayName eq '{folder_name}'")
-        if not folders or not folders.get("value"):
+        """Moves an email to a destination folder by path ("Inbox/Sub") or unique name."""
+        ctx = self._item_context(entry_id, store_id)
+        if ctx is not self:
+            return ctx.move_email(entry_id, folder_name, store_id)
+        index = self._folder_index()
+        target_id = None
+        if index is not None:
+            target_id = index.folder_id(folder_name)
+            if target_id is None and index.refresh(force=True):
+                target_id = index.folder_id(folder_name)  # Folder created since the last refresh
+        if target_id is None:
             print(f"[Graph] Could not find folder '{folder_name}'")
             return False
-            
-        target_id = folders["value"][0]["id"]
-        
+
         # Execute Move
         resp = self._request("POST", f"/me/messages/{entry_id}/move", json={"destinationId": target_id})
-        return resp is not None
+        return self._changed(resp, entry_id)
 
     # --- Calendar ---
     def get_calendar_items(self, start_dt, end_dt, account_names=None) -> list:
+        if self.account is None:
+            results = self._for_each_account(account_names, lambda ctx: ctx.get_calendar_items(start_dt, end_dt))
+            return merge_top_n(results, key=start_key, reverse=False)
+
         # Add timezone header so returned times match local
         s_iso = start_dt.isoformat()
         e_iso = end_dt.isoformat()
         
-        endpoint = f"/me/calendarView?startDateTime={s_iso}&endDateTime={e_iso}&$top=50&$orderby=start/dateTime"
+        endpoint = build_query(f"/me/calendarView?startDateTime={s_iso}&endDateTime={e_iso}",
+                               select=EVENT_FIELDS, top=50, orderby="start/dateTime")
         
         # Preferred timezone is essential here to align with desktop
         import time
@@ -368,88 +677,122 @@ class GraphAPIClient(MailClient):
         
         headers = {"Prefer": 'outlook.timezone="UTC"'} # Default to UTC, process locallly
         # For simplicity, returning UTC and mapping locally
-        data = self._request("GET", endpoint, headers=headers)
-        
-        if not data: return []
-        return [self._map_event(e) for e in data.get("value", []) if e.get("isCancelled") != True]
+        events = iter_items(self._request, endpoint, headers=headers)
+        return [self._map_event(e) for e in events if e.get("isCancelled") != True]
 
     # --- Tasks (To Do Lists) ---
+    def _task_sync(self):
+        """Returns the task index of this client's account, or None if signed out."""
+        account = self._email()
+        if not account:
+            return None
+        return get_task_sync(self, account)
+
     def get_tasks(self, due_filters=None, account_names=None) -> list:
-        # First, ensure we have the default To Do list ID
+        if self.account is None:
+            results = self._for_each_account(account_names, lambda ctx: ctx.get_tasks(due_filters))
+            return [task for tasks in results for task in tasks]
+
+        now_date = datetime.now().date()
+        if not due_filters: due_filters = ["Overdue", "Today", "Tomorrow"]
+
+        # Every list of the account, from the synced task index
+        sync = self._task_sync()
+        if sync is not None and sync.sync():
+            tasks = (self._map_task(t) for t in sync.open_tasks())
+            return take(tasks, keep=lambda task: self._due_matches(task, due_filters, now_date))
+
+        # Index unavailable: read the default list directly
+        list_id = self._get_default_list_id()
+        if not list_id:
+            return []
+
+        path = f"/me/todo/lists/{list_id}/tasks"
+        open_tasks = "status ne 'completed'"
+        endpoint = build_query(path, select=TASK_FIELDS, top=50,
+                               filter=and_filters(open_tasks, task_due_filter(due_filters, now_date)))
+        fallback = build_query(path, select=TASK_FIELDS, top=50, filter=open_tasks)
+
+        # Due dates are also checked client-side (similar logic to COM)
+        tasks = (self._map_task(t) for t in self._collection("tasks_due", endpoint, fallback))
+        return take(tasks, keep=lambda task: self._due_matches(task, due_filters, now_date))
+
+    @staticmethod
+    def _due_matches(task, due_filters, now_date):
+        if not task["due"]:
+            return "No Date" in due_filters
+        task_date = task["due"].date()
+        if task_date < now_date:
+            return "Overdue" in due_filters
+        if task_date == now_date:
+            return "Today" in due_filters
+        if task_date == now_date + timedelta(days=1):
+            return "Tomorrow" in due_filters
+        return False
+
+    def _get_default_list_id(self):
+        """Returns the cached default To Do list ID, looking it up on first use."""
         if "todo_list_id" not in self._cache:
              lists = self._request("GET", "/me/todo/lists")
              if lists and "value" in lists and lists["value"]:
                  self._cache["todo_list_id"] = lists["value"][0]["id"]
              else:
-                 return []
-                 
-        list_id = self._cache["todo_list_id"]
-        
-        # Get tasks that are NOT completed
-        endpoint = f"/me/todo/lists/{list_id}/tasks?$filter=status ne 'completed'&$top=50"
-        data = self._request("GET", endpoint)
-        
-        if not data: return []
-        
-        tasks = [self._map_task(t) for t in data.get("value", [])]
-        
-        # Apply client-side filtering for Due Dates
-        # Similar logic to COM
-        filtered_tasks = []
-        now_dt = datetime.now()
-        now_date = now_dt.date()
-        
-        if not due_filters: due_filters = ["Overdue", "Today", "Tomorrow"]
-        
-        for task in tasks:
-            if not task["due"]:
-                if "No Date" in due_filters:
-                    filtered_tasks.append(task)
-                continue
-                
-            task_date = task["due"].date()
-            if task_date < now_date and "Overdue" in due_filters:
-                filtered_tasks.append(task)
-            elif task_date == now_date and "Today" in due_filters:
-                filtered_tasks.append(task)
-            elif task_date == now_date + timedelta(days=1) and "Tomorrow" in due_filters:
-                filtered_tasks.append(task)
-                
-        return filtered_tasks
+                 return None
+        return self._cache["todo_list_id"]
 
     def mark_task_complete(self, entry_id, store_id=None) -> bool:
-         # Need list_id
-         if "todo_list_id" not in self._cache: return False
-         list_id = self._cache["todo_list_id"]
+         # Tasks carry their list id as store_id; the saved index covers
+         # older callers, and the default list is the last resort
+         ctx = self._item_context(entry_id, store_id)
+         if ctx is not self:
+             # The owning account is the one whose index knows the list or the task
+             return ctx.mark_task_complete(entry_id, store_id)
+         sync = self._task_sync()
+         list_id = store_id or (sync.list_of(entry_id) if sync else None) or self._get_default_list_id()
+         if not list_id: return False
          
          resp = self._request("PATCH", f"/me/todo/lists/{list_id}/tasks/{entry_id}", json={"status": "completed"})
+         if resp is not None and sync:
+             sync.set_status(entry_id, "completed")
          return resp is not None
 
     # --- Quick Create ---
     def create_email(self):
         # Open Outlook Web Compose
-        email = self.auth.get_current_user_email()
+        email = self._email()
         login_hint = f"?login_hint={urllib.parse.quote(email)}" if email else ""
         webbrowser.open(f"https://outlook.{self._get_domain()}/mail/deeplink/compose{login_hint}")
 
     def create_meeting(self):
-        email = self.auth.get_current_user_email()
+        email = self._email()
         login_hint = f"?login_hint={urllib.parse.quote(email)}" if email else ""
         webbrowser.open(f"https://outlook.{self._get_domain()}/calendar/deeplink/compose{login_hint}")
 
     def create_task(self):
-        email = self.auth.get_current_user_email()
+        email = self._email()
         login_hint = f"?login_hint={urllib.parse.quote(email)}" if email else ""
         webbrowser.open(f"https://to-do.{self._get_domain()}/tasks/today{login_hint}")
         
     def create_contact(self):
-         email = self.auth.get_current_user_email()
+         email = self._email()
          login_hint = f"?login_hint={urllib.parse.quote(email)}" if email else ""
          webbrowser.open(f"https://outlook.{self._get_domain()}/people/{login_hint}")
 
     # --- General / Utility ---
     def check_new_mail(self, account_names=None) -> bool:
         """Returns True if a new mail has arrived since last poll."""
+        if self.account is None:
+            return any(self._for_each_account(account_names, lambda ctx: ctx.check_new_mail()))
+        sync = self._inbox_sync()
+        if sync is not None:
+            newest = sync.newest_first()[:1]
+            if not newest:
+                return False
+            try:
+                return self._track_latest(datetime.fromisoformat(newest[0]["receivedDateTime"].rstrip("Z")))
+            except Exception:
+                return False
+
         data = self._request("GET", "/me/mailFolders/inbox/messages?$top=1&$orderby=receivedDateTime desc&$select=receivedDateTime")
         if data and "value" in data and len(data["value"]) > 0:
             latest_str = data["value"][0]["receivedDateTime"]
@@ -467,6 +810,22 @@ class GraphAPIClient(MailClient):
             except: pass
         return False
 
+    def get_poll_snapshot(self, account_names=None, account_config=None, inbox_query=None) -> dict:
+        """One poll cycle for every selected account, the accounts polled in parallel."""
+        if self.account is not None:
+            return super().get_poll_snapshot(account_names, account_config, inbox_query)
+        snapshots = self._for_each_account(account_names, lambda ctx: ctx.get_poll_snapshot(
+            None, account_config, inbox_query))
+        emails = None
+        if inbox_query is not None:
+            emails = merge_top_n([s["emails"] or [] for s in snapshots], inbox_query.get("count", 20))
+        return {
+            "has_new": any(s["has_new"] for s in snapshots),
+            "unread_count": sum(s["unread_count"] for s in snapshots),
+            "due_status": self.get_pulse_status(account_names),
+            "emails": emails,
+        }
+
     def get_pulse_status(self, account_names=None) -> dict:
         status = {"calendar": None, "tasks": None}
         
@@ -502,10 +861,31 @@ class GraphAPIClient(MailClient):
         return res
 
     def get_folder_list(self, account_name=None) -> list:
-        # Just return top level for now. Full recursion takes multiple API calls.
-        data = self._request("GET", "/me/mailFolders?$top=20")
-        if not data: return ["Inbox", "Sent Items", "Deleted Items"]
-        return [f.get("displayName") for f in data.get("value", [])]
+        """Returns every mail folder path from the cached folder index."""
+        if self.account is None:
+            accounts = self._accounts_for([account_name] if account_name else None)
+            if accounts:
+                return self._context(accounts[0]).get_folder_list()
+        index = self._folder_index()
+        paths = list(index.paths()) if index is not None else []
+        if not paths: return ["Inbox", "Sent Items", "Deleted Items"]
+        return paths
+
+    def _folder_index(self):
+        """Returns the signed-in account's folder index, refreshed if due (None if signed out)."""
+        account = self._email()
+        if not account:
+            return None
+        index = self._folder_indexes.get(account)
+        if index is None:
+            index = self._folder_indexes[account] = GraphFolderIndex(self, account)
+        try:
+            index.refresh()
+        except requests.exceptions.RequestException as e:
+            if not index.folders:
+                raise
+            print(f"[Graph] Folder refresh failed, using cached index: {e}")
+        return index
 
     def get_native_app(self):
          return None # No native app available.
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""Delta-query mail sync for the Graph backend.
+
+Instead of re-downloading the newest $top messages on every refresh,
+GraphMailSync keeps a local copy of a folder's recent messages and asks
+/me/mailFolders/{folder}/messages/delta only for what changed since the last
+deltaLink. Adds and updates are merged into the cache, "@removed" entries
+are dropped. The cache and deltaLink are saved to disk per account and
+folder, so a restart also resumes from the last deltaLink.
+
+Graph only allows a receivedDateTime filter on message delta, so the cache
+holds the last DELTA_WINDOW_DAYS days of mail; the inbox list and new-mail
+check are answered from it (the unread count still comes from the folder's
+unreadItemCount, which includes older mail). A list the cache can't fill
+(e.g. unread mail older than the window) is read from the server instead.
+
+There is one GraphMailSync per account and folder in the process
+(get_mail_sync), shared by the data engine's client and the UI thread's
+client: an action on the UI side edits and expires the same cache the next
+refresh reads.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sidebar.services.graph_query import MESSAGE_FIELDS, build_query
+
+# Days of mail kept in the local cache
+DELTA_WINDOW_DAYS = 30
+
+# Polls within this many seconds reuse the last sync (check + refresh in one cycle)
+MIN_SYNC_INTERVAL = 5
+
+_syncs = {}     # (account, folder) -> GraphMailSync
+_syncs_lock = threading.Lock()
+
+
+def _state_dir():
+    path = os.path.join(os.environ.get("LOCALAPPDATA", "."), "InboxBar", "graph_delta")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class GraphMailSync:
+    """Local message cache for one Graph mail folder, kept current with delta queries."""
+
+    def __init__(self, client, account, folder="inbox", window_days=DELTA_WINDOW_DAYS):
+        self.client = client
+        self.folder = folder
+        self.window_days = window_days
+        self.messages = {}      # id -> raw Graph message
+        self.delta_link = None
+        self._last_sync = 0
+        self._lock = threading.Lock()       # Guards messages/delta_link (held briefly)
+        self._sync_lock = threading.Lock()  # One delta round at a time
+        self._pending = None    # id -> fields of apply_local edits made during a round
+        self.stats = {"full_syncs": 0, "delta_syncs": 0, "changes": 0, "pages": 0}
+
+        digest = hashlib.sha1("{}|{}".format(account, folder).encode("utf-8")).hexdigest()[:16]
+        self._path = os.path.join(_state_dir(), "{}.json".format(digest))
+        self._load()
+
+    # --- Persistence ---
+    def _load(self):
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.delta_link = state.get("delta_link")
+            self.messages = {m["id"]: m for m in state.get("messages", [])}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[GraphDelta] Ignored unreadable state: {e}")
+            self.delta_link, self.messages = None, {}
+
+    def _save(self):
+        with self._lock:
+            state = {"delta_link": self.delta_link, "messages": list(self.messages.values())}
+        try:
+            tmp = self._path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self._path)
+        except Exception as e:
+            print(f"[GraphDelta] State save failed: {e}")
+
+    def reset(self):
+        """Forgets the deltaLink and cache; the next sync starts over."""
+        with self._sync_lock, self._lock:
+            self.delta_link = None
+            self.messages = {}
+            try: os.remove(self._path)
+            except OSError: pass
+
+    def expire(self):
+        """Makes the next sync() call go to the server even inside MIN_SYNC_INTERVAL."""
+        self._last_sync = 0
+
+    def apply_local(self, message_id, fields=None):
+        """Applies an edit made through the API right away (fields=None: the
+        message left the folder); the next delta round confirms it."""
+        with self._lock:
+            self._apply(self.messages, message_id, fields)
+            if self._pending is not None:
+                # A round is fetching: replay the edit on what it swaps in
+                self._pending[message_id] = fields
+            self._last_sync = 0
+
+    @staticmethod
+    def _apply(messages, message_id, fields):
+        if fields is None:
+            messages.pop(message_id, None)
+        elif message_id in messages:
+            messages[message_id] = dict(messages[message_id], **fields)
+
+    # --- Sync ---
+    def sync(self, force=False):
+        """Pulls changes since the last deltaLink.
+
+        Returns the list of newly added message ids, or None if the sync
+        failed (callers fall back to a plain query). Network errors propagate.
+        Pages are fetched without holding the cache lock, so reads and
+        apply_local don't wait for the round.
+        """
+        with self._sync_lock:
+            with self._lock:
+                if not force and self.delta_link and time.time() - self._last_sync < MIN_SYNC_INTERVAL:
+                    return []
+                delta_link = self.delta_link
+                staged = {} if not delta_link else dict(self.messages)
+                self._pending = {}
+            try:
+                return self._round(delta_link, staged)
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def _round(self, delta_link, staged):
+        """Fetches one delta round into staged and swaps it in."""
+        full = not delta_link
+        if full:
+            cutoff = (datetime.utcnow() - timedelta(days=self.window_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            url = build_query(f"/me/mailFolders/{self.folder}/messages/delta",
+                              select=MESSAGE_FIELDS, filter=f"receivedDateTime ge {cutoff}")
+        else:
+            url = delta_link
+
+        added = []
+        changes = 0
+        while url:
+            page = self.client._request("GET", url, headers={"Prefer": "odata.maxpagesize=100"})
+            if not page or not isinstance(page, dict):
+                if self.client.last_call_throttled():
+                    # Deferred by the throttling scheduler: keep the link, serve the cache
+                    print("[GraphDelta] Throttled; serving cached messages")
+                    return [] if delta_link else None
+                if not full:
+                    # Expired or rejected deltaLink (e.g. 410 Gone): resync next time
+                    print("[GraphDelta] Delta round failed; will resync")
+                    with self._lock:
+                        self.delta_link = None
+                return None
+            self.stats["pages"] += 1
+            for msg in page.get("value", []):
+                mid = msg.get("id")
+                if not mid:
+                    continue
+                changes += 1
+                if "@removed" in msg:
+                    staged.pop(mid, None)
+                elif mid in staged:
+                    staged[mid] = dict(staged[mid], **msg)  # Readers may hold the old dict
+                else:
+                    staged[mid] = msg
+                    added.append(mid)
+            url = page.get("@odata.nextLink")
+            if not url:
+                delta_link = page.get("@odata.deltaLink")
+
+        self._trim_window(staged)
+        with self._lock:
+            for mid, fields in self._pending.items():
+                self._apply(staged, mid, fields)
+            self.messages = staged
+            self.delta_link = delta_link
+            # Local edits made meanwhile still want a round that confirms them
+            self._last_sync = 0 if self._pending else time.time()
+        self.stats["full_syncs" if full else "delta_syncs"] += 1
+        self.stats["changes"] += changes
+        if changes or full:
+            self._save()
+        return [] if full else added
+
+    def _trim_window(self, messages):
+        cutoff = (datetime.utcnow() - timedelta(days=self.window_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for mid in [m for m, msg in messages.items()
+                    if (msg.get("receivedDateTime") or "") < cutoff]:
+            del messages[mid]
+
+    # --- Queries ---
+    def newest_first(self):
+        """Cached raw messages sorted by receivedDateTime, newest first."""
+        with self._lock:
+            msgs = list(self.messages.values())
+        msgs.sort(key=lambda m: m.get("receivedDateTime") or "", reverse=True)
+        return msgs
+
+
+
+def get_mail_sync(client, account, folder="inbox"):
+    """The process-wide sync of one account's folder (created with client on first use)."""
+    with _syncs_lock:
+        sync = _syncs.get((account, folder))
+        if sync is None:
+            sync = _syncs[(account, folder)] = GraphMailSync(client, account, folder)
+        return sync
+
+
+def mail_syncs(account):
+    """Every sync of an account created so far."""
+    with _syncs_lock:
+        return [sync for (acc, _), sync in _syncs.items() if acc == account]
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Cached index of the whole Graph mail folder tree.
+
+get_folder_list used to return the first 20 top-level folder names and
+move_email looked its target up with a $filter=displayName query per move,
+which could not reach subfolders. GraphFolderIndex loads the full tree once
+(a /me/mailFolders/delta round from scratch lists every folder with its
+parent and ends on the deltaLink) and keeps an id <-> "Parent/Child" path
+map, saved to disk per account.
+
+Within FOLDER_INDEX_TTL the index is kept current with /me/mailFolders/delta
+rounds instead of reloading; past the TTL (or when delta fails) it is
+rebuilt from scratch. Paths use the same "Inbox/Subfolder" form as the COM
+backend, so folder settings and Move To targets work on both.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from sidebar.services.graph_query import FOLDER_FIELDS, build_query
+
+# Full reload after this many seconds; delta rounds in between
+FOLDER_INDEX_TTL = 24 * 3600
+
+# Picker/move lookups within this many seconds of the last refresh skip the network
+FOLDER_REFRESH_INTERVAL = 300
+
+
+def _state_dir():
+    path = os.path.join(os.environ.get("LOCALAPPDATA", "."), "InboxBar", "graph_folders")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class GraphFolderIndex:
+    """id -> (name, parent id) for every mail folder, with path lookups."""
+
+    def __init__(self, client, account, ttl=FOLDER_INDEX_TTL):
+        self.client = client
+        self.ttl = ttl
+        self.folders = {}       # id -> [displayName, parentFolderId]
+        self.delta_link = None
+        self.loaded_at = 0      # Time of the last full load
+        self._checked_at = 0    # Time of the last load or delta round
+        self._paths = None      # path -> id, built on demand
+        self._lock = threading.Lock()
+        self.stats = {"full_loads": 0, "delta_rounds": 0, "requests": 0}
+
+        digest = hashlib.sha1(account.encode("utf-8")).hexdigest()[:16]
+        self._path = os.path.join(_state_dir(), "{}.json".format(digest))
+        self._load()
+
+    # --- Persistence ---
+    def _load(self):
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.folders = state.get("folders", {})
+            self.delta_link = state.get("delta_link")
+            self.loaded_at = state.get("loaded_at", 0)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[GraphFolders] Ignored unreadable index: {e}")
+
+    def _save(self):
+        try:
+            tmp = self._path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"folders": self.folders, "delta_link": self.delta_link,
+                           "loaded_at": self.loaded_at}, f)
+            os.replace(tmp, self._path)
+        except Exception as e:
+            print(f"[GraphFolders] Index save failed: {e}")
+
+    # --- Loading ---
+    def _get(self, method, url, **kwargs):
+        self.stats["requests"] += 1
+        return self.client._request(method, url, **kwargs)
+
+    def _full_load(self):
+        """Enumerates every folder with a delta round from scratch; it ends on the deltaLink."""
+        if not self._sync_delta(full=True):
+            return False
+        self.loaded_at = time.time()
+        self.stats["full_loads"] += 1
+        return True
+
+    def refresh(self, force=False):
+        """Brings the index up to date; returns False if nothing could be loaded."""
+        with self._lock:
+            now = time.time()
+            if not force and self.folders and now - self._checked_at < FOLDER_REFRESH_INTERVAL:
+                return True
+
+            ok = False
+            if self.folders and now - self.loaded_at < self.ttl:
+                ok = self._sync_delta()
+            if not ok:
+                ok = self._full_load()
+            if ok:
+                self._checked_at = now
+                self._paths = None
+                self._save()
+            return ok or bool(self.folders)
+
+    def _sync_delta(self, full=False):
+        """Follows the folder delta chain to its deltaLink, applying changes on the way.
+
+        full=True starts without a deltaLink on an empty map, so the round lists
+        the whole tree (every folder, with its parentFolderId).
+        """
+        if full:
+            url = build_query("/me/mailFolders/delta", select=FOLDER_FIELDS)
+            staged = {}
+        else:
+            url = self.delta_link or build_query("/me/mailFolders/delta", select=FOLDER_FIELDS)
+            staged = dict(self.folders)
+        while url:
+            data = self._get("GET", url)
+            if not data or not isinstance(data, dict):
+                if self.delta_link and not full:
+                    print("[GraphFolders] Folder delta failed; reloading the tree")
+                self.delta_link = None
+                return False
+            for folder in data.get("value", []):
+                fid = folder.get("id")
+                if not fid:
+                    continue
+                if "@removed" in folder:
+                    staged.pop(fid, None)
+                else:
+                    old = staged.get(fid, ["", None])
+                    staged[fid] = [folder.get("displayName", old[0]),
+                                   folder.get("parentFolderId", old[1])]
+            url = data.get("@odata.nextLink")
+            if not url:
+                self.delta_link = data.get("@odata.deltaLink")
+        if full and not staged:
+            return False
+        self.folders = staged
+        self.stats["delta_rounds"] += 1
+        return True
+
+    # --- Lookups ---
+    def _build_paths(self):
+        children = {}
+        for fid, (name, parent) in self.folders.items():
+            children.setdefault(parent if parent in self.folders else None, []).append((name, fid))
+
+        paths = {}
+
+        def walk(parent, prefix):
+            for name, fid in sorted(children.get(parent, ()), key=lambda c: c[0].lower()):
+                path = f"{prefix}/{name}" if prefix else name
+                paths[path] = fid
+                walk(fid, path)
+
+        walk(None, "")
+        return paths
+
+    def paths(self):
+        """path -> folder id in depth-first order ("Inbox", "Inbox/Sub", ...)."""
+        with self._lock:
+            if self._paths is None:
+                self._paths = self._build_paths()
+            return self._paths
+
+    def folder_id(self, path):
+        """Resolves a "Parent/Child" path (or a unique folder name) to its id."""
+        paths = self.paths()
+        if path in paths:
+            return paths[path]
+        wanted = path.strip("/").lower()
+        for p, fid in paths.items():
+            if p.lower() == wanted:
+                return fid
+        # Older settings store bare names: accept one if it is unambiguous
+        matches = [fid for p, fid in paths.items() if p.rsplit("/", 1)[-1].lower() == wanted]
+        return matches[0] if len(matches) == 1 else None
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Shared keep-alive HTTP session for Microsoft Graph calls.
+
+requests.request() builds a throwaway Session per call, so every Graph call
+paid for a fresh TCP + TLS handshake to graph.microsoft.com. GraphSession
+keeps one pooled Session for the whole process (the UI and background
+clients share it): connections are reused, responses are gzip-compressed,
+and each endpoint gets a timeout suited to it.
+
+connection_stats() reports how many requests were served and how many
+connections had to be opened for them.
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept per host (>= DataEngine graph_workers so workers don't queue)
+GRAPH_POOL_SIZE = 8
+
+# (connect, read) seconds. Short connect keeps the app responsive offline.
+DEFAULT_TIMEOUT = (10, 30)
+
+# First matching URL fragment wins
+ENDPOINT_TIMEOUTS = (
+    ("/$batch", (10, 60)),
+    ("/delta", (10, 60)),
+    ("/photo", (10, 60)),
+    ("$top=1&", (5, 15)),   # New-mail probes: fail fast, the next poll retries
+)
+
+
+class GraphSession:
+    """Pooled requests.Session with per-endpoint timeouts and reuse metrics."""
+
+    def __init__(self, pool_size=GRAPH_POOL_SIZE, timeouts=ENDPOINT_TIMEOUTS,
+                 default_timeout=DEFAULT_TIMEOUT):
+        self.timeouts = timeouts
+        self.default_timeout = default_timeout
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "seconds": 0.0}
+
+    def timeout_for(self, url):
+        for fragment, timeout in self.timeouts:
+            if fragment in url:
+                return timeout
+        return self.default_timeout
+
+    def request(self, method, url, **kwargs):
+        """Same contract as requests.request, over the pooled connections."""
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        start = time.perf_counter()
+        failed = False
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["seconds"] += time.perf_counter() - start
+                if failed:
+                    self.stats["errors"] += 1
+
+    def connection_stats(self):
+        """Returns request/connection counts (reused = requests that skipped a handshake)."""
+        opened = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += getattr(pool, "num_connections", 0)
+        with self._lock:
+            stats = dict(self.stats)
+        stats["connections_opened"] = opened
+        stats["reused"] = max(stats["requests"] - opened, 0)
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_graph_session():
+    """Returns the process-wide GraphSession."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = GraphSession()
+        return _shared
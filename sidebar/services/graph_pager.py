@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Lazy paging over Graph collections.
+
+Graph returns collections a page at a time, with an @odata.nextLink for the
+rest. The client used to read only the first page, so lists were silently cut
+at $top and the client-side filters (flagged, due date) then ran on whatever
+that page happened to hold.
+
+iter_items() yields items across pages and only fetches the next page when
+the consumer asks for more, so take() stops at the page where it has enough
+items that pass its filter. The nextLink already carries the first request's
+$select/$filter/$top/$orderby, so every page is shaped the same way.
+"""
+
+from itertools import islice
+
+# Upper bound on pages read for one collection
+MAX_PAGES = 10
+
+
+def iter_pages(request, endpoint, headers=None, max_pages=MAX_PAGES, first_page=None):
+    """Yields the "value" list of each page until nextLink runs out (or max_pages).
+
+    first_page is an already fetched response for endpoint, if the caller has one.
+    """
+    url = endpoint
+    pages = 0
+    while url and (max_pages is None or pages < max_pages):
+        if first_page is not None:
+            data, first_page = first_page, None
+        else:
+            data = request("GET", url, headers=dict(headers)) if headers else request("GET", url)
+        if not data or not isinstance(data, dict):
+            return
+        pages += 1
+        yield data.get("value", [])
+        url = data.get("@odata.nextLink")
+
+
+def iter_items(request, endpoint, headers=None, max_pages=MAX_PAGES, first_page=None):
+    """Yields the items of a collection one by one, fetching pages on demand."""
+    for page in iter_pages(request, endpoint, headers, max_pages, first_page):
+        yield from page
+
+
+def take(items, n=None, keep=None):
+    """First n items (all if n is None) for which keep(item) is true."""
+    if keep is not None:
+        items = (item for item in items if keep(item))
+    if n is not None:
+        items = islice(items, n)
+    return list(items)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Query building for Graph collection reads.
+
+Without $select Graph returns full resources: a message comes back with its
+body, every recipient list, internet headers ids and so on, although the
+sidebar cards render about a dozen fields. The *_FIELDS tuples below are the
+projections per view (what the _map_* functions read), and build_query()
+assembles endpoints from them plus $filter/$top/$orderby.
+
+The filter helpers move flag and due-date predicates to the server where
+Graph supports them. Callers still apply the same filter locally, so a
+server that ignores or rejects the filter (see GraphAPIClient._collection)
+only costs payload, never correctness.
+"""
+
+from datetime import timedelta
+
+# Fields read by GraphAPIClient._map_message (mail cards, previews, delta cache)
+MESSAGE_FIELDS = ("id", "subject", "from", "receivedDateTime", "isRead", "hasAttachments",
+                  "importance", "flag", "categories", "bodyPreview", "conversationId",
+                  "webLink", "lastModifiedDateTime")
+
+# Fields read by _map_event, plus isCancelled for the local cancelled filter
+EVENT_FIELDS = ("id", "subject", "start", "end", "location", "responseStatus",
+                "organizer", "seriesMasterId", "webLink", "isCancelled")
+
+# Fields read by _map_task
+TASK_FIELDS = ("id", "title", "dueDateTime", "importance", "status", "categories",
+               "isReminderOn")
+
+# Fields for the folder index (tree shape, for path building)
+FOLDER_FIELDS = ("id", "displayName", "parentFolderId", "childFolderCount")
+
+# A receivedDateTime predicate Graph needs ahead of other predicates when the
+# query is also ordered by receivedDateTime (otherwise: "InefficientFilter")
+RECEIVED_ANY = "receivedDateTime ge 1900-01-01T00:00:00Z"
+
+
+def build_query(path, select=None, filter=None, top=None, orderby=None):
+    """Returns path with the given OData options ($select from a field tuple)."""
+    params = []
+    if select:
+        params.append("$select=" + ",".join(select))
+    if filter:
+        params.append("$filter=" + filter)
+    if top:
+        params.append(f"$top={top}")
+    if orderby:
+        params.append("$orderby=" + orderby)
+    if not params:
+        return path
+    return path + ("&" if "?" in path else "?") + "&".join(params)
+
+
+def and_filters(*predicates):
+    """Joins the non-empty predicates with "and" (None if there are none)."""
+    parts = [p for p in predicates if p]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return parts[0]
+    return " and ".join(f"({p})" if " or " in p else p for p in parts)
+
+
+def inbox_filter(unread_only=False, only_flagged=False):
+    """Server-side predicate for the inbox view, ordered by receivedDateTime."""
+    predicates = []
+    if unread_only:
+        predicates.append("isRead eq false")
+    if only_flagged:
+        predicates.append("flag/flagStatus eq 'flagged'")
+    if not predicates:
+        return None
+    return and_filters(RECEIVED_ANY, *predicates)
+
+
+def task_due_filter(due_filters, today):
+    """To Do predicate for the Overdue/Today/Tomorrow buckets.
+
+    Returns None when no date bound applies ("No Date" selected, or nothing
+    that maps to a date range), so those views filter locally only.
+    """
+    if not due_filters or "No Date" in due_filters:
+        return None
+
+    def day(offset):
+        return (today + timedelta(days=offset)).strftime("%Y-%m-%dT00:00:00")
+
+    ranges = []
+    if "Overdue" in due_filters:
+        ranges.append((None, day(0)))
+    if "Today" in due_filters:
+        ranges.append((day(0), day(1)))
+    if "Tomorrow" in due_filters:
+        ranges.append((day(1), day(2)))
+    if not ranges:
+        return None
+
+    # Adjacent buckets collapse into one range
+    merged = [list(ranges[0])]
+    for lo, hi in ranges[1:]:
+        if merged[-1][1] == lo:
+            merged[-1][1] = hi
+        else:
+            merged.append([lo, hi])
+
+    terms = []
+    for lo, hi in merged:
+        bounds = []
+        if lo:
+            bounds.append(f"dueDateTime/dateTime ge '{lo}'")
+        bounds.append(f"dueDateTime/dateTime lt '{hi}'")
+        terms.append(" and ".join(bounds))
+    if len(terms) == 1:
+        return terms[0]
+    return " or ".join(f"({t})" for t in terms)
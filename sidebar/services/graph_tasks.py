@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Local index of Microsoft To Do tasks across every list.
+
+get_tasks used to read only the first To Do list (cached as todo_list_id),
+so other lists and the "Flagged email" list never showed, and
+mark_task_complete needed that cache to know which list a task was in.
+
+GraphTaskSync enumerates all lists of an account and keeps every task with
+its list id. Each list is kept current with its own tasks/delta chain; the
+lists are synced side by side (their GETs coalesce into $batch calls) and
+the whole index is saved to disk, so due-bucket and completion filtering
+need no extra calls and a restart resumes from the saved deltaLinks.
+
+There is one GraphTaskSync per account in the process (get_task_sync), so a
+task completed from the UI thread's client drops out of the data engine's
+next read right away.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sidebar.services.graph_pager import iter_items
+from sidebar.services.graph_query import TASK_FIELDS, build_query
+
+# Syncs within this many seconds reuse the index as is
+TASK_SYNC_INTERVAL = 30
+
+# Lists synced at the same time
+TASK_SYNC_WORKERS = 4
+
+LIST_FIELDS = ("id", "displayName", "wellknownListName")
+
+_syncs = {}     # account -> GraphTaskSync
+_syncs_lock = threading.Lock()
+
+
+def _state_dir():
+    path = os.path.join(os.environ.get("LOCALAPPDATA", "."), "InboxBar", "graph_tasks")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class GraphTaskSync:
+    """All To Do lists of one account, with their tasks, kept current by delta rounds."""
+
+    def __init__(self, client, account):
+        self.client = client
+        self.lists = {}         # list id -> {"name", "wellknown", "delta_link"}
+        self.tasks = {}         # task id -> raw task, plus "_list_id"
+        self._last_sync = 0
+        self._lock = threading.Lock()       # Guards lists/tasks (held briefly)
+        self._sync_lock = threading.Lock()  # One round at a time
+        self._pending = None    # task id -> status set during a round
+        self.stats = {"syncs": 0, "list_rounds": 0, "full_reads": 0, "changes": 0}
+
+        digest = hashlib.sha1(account.encode("utf-8")).hexdigest()[:16]
+        self._path = os.path.join(_state_dir(), "{}.json".format(digest))
+        self._load()
+
+    # --- Persistence ---
+    def _load(self):
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.lists = state.get("lists", {})
+            self.tasks = {t["id"]: t for t in state.get("tasks", [])}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[GraphTasks] Ignored unreadable index: {e}")
+            self.lists, self.tasks = {}, {}
+
+    def _save(self):
+        with self._lock:
+            state = {"lists": self.lists, "tasks": list(self.tasks.values())}
+        try:
+            tmp = self._path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self._path)
+        except Exception as e:
+            print(f"[GraphTasks] Index save failed: {e}")
+
+    # --- Sync ---
+    def sync(self, force=False):
+        """Refreshes the lists and each list's tasks. Returns False if the lists couldn't be read.
+
+        The reads run without holding the index lock, so lookups and
+        set_status from the UI thread don't wait for the round.
+        """
+        with self._sync_lock:
+            with self._lock:
+                if not force and self.lists and time.time() - self._last_sync < TASK_SYNC_INTERVAL:
+                    return True
+                known = {lid: dict(info) for lid, info in self.lists.items()}
+                self._pending = {}
+            try:
+                return self._round(known)
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def _round(self, known):
+        """Reads the lists and their tasks, then merges them into the index."""
+        url = build_query("/me/todo/lists", select=LIST_FIELDS)
+        current = list(iter_items(self.client._request, url, max_pages=None))
+        if not current and self.client.last_call_failed():
+            return bool(known)
+
+        lists = {}
+        for entry in current:
+            lid = entry.get("id")
+            if not lid:
+                continue
+            old = known.get(lid, {})
+            lists[lid] = {"name": entry.get("displayName", ""),
+                          "wellknown": entry.get("wellknownListName", "none"),
+                          "delta_link": old.get("delta_link")}
+
+        with ThreadPoolExecutor(max_workers=TASK_SYNC_WORKERS) as pool:
+            results = dict(zip(lists, pool.map(lambda lid: self._sync_list(lid, lists[lid]), lists)))
+
+        with self._lock:
+            tasks = {}
+            for tid, task in self.tasks.items():
+                lid = task.get("_list_id")
+                if lid in lists and results.get(lid) is None:
+                    tasks[tid] = task  # List failed this round: keep what we had
+            changes = 0
+            for lid, fetched in results.items():
+                if fetched is None:
+                    continue
+                entries, full = fetched
+                if not full:
+                    tasks.update({tid: t for tid, t in self.tasks.items() if t.get("_list_id") == lid})
+                for task in entries:
+                    tid = task.get("id")
+                    if not tid:
+                        continue
+                    changes += 1
+                    if "@removed" in task:
+                        tasks.pop(tid, None)
+                    else:
+                        merged = dict(tasks.get(tid, {}))
+                        merged.update(task)
+                        merged["_list_id"] = lid
+                        tasks[tid] = merged
+            for tid, status in self._pending.items():
+                if tid in tasks:
+                    tasks[tid] = dict(tasks[tid], status=status)  # Edited during the round
+
+            self.lists = lists
+            self.tasks = tasks
+            self._last_sync = time.time()
+        self.stats["syncs"] += 1
+        self.stats["changes"] += changes
+        self._save()
+        return True
+
+    def _sync_list(self, list_id, info):
+        """Returns (entries, full) for one list, or None if it couldn't be read.
+
+        Uses the list's deltaLink when there is one; a failed delta round
+        falls back to reading the list's open tasks in full.
+        """
+        request = self.client._request
+        url = info.get("delta_link") or build_query(f"/me/todo/lists/{list_id}/tasks/delta",
+                                                    select=TASK_FIELDS)
+        full = not info.get("delta_link")
+        entries = []
+        while url:
+            data = request("GET", url)
+            if not data or not isinstance(data, dict):
+                if self.client.last_call_throttled():
+                    return None  # Keep the deltaLink and the tasks we have
+                break
+            entries.extend(data.get("value", []))
+            url = data.get("@odata.nextLink")
+            if not url:
+                info["delta_link"] = data.get("@odata.deltaLink")
+                self.stats["list_rounds"] += 1
+                return entries, full
+
+        # Delta not available for this list (or the link expired): plain read
+        info["delta_link"] = None
+        self.stats["full_reads"] += 1
+        url = build_query(f"/me/todo/lists/{list_id}/tasks", select=TASK_FIELDS, top=100,
+                          filter="status ne 'completed'")
+        items = list(iter_items(request, url, max_pages=None))
+        if not items and self.client.last_call_failed():
+            return None
+        return items, True
+
+    # --- Queries ---
+    def open_tasks(self):
+        """Raw tasks that are not completed, each with "_list_id"."""
+        with self._lock:
+            return [t for t in self.tasks.values() if t.get("status") != "completed"]
+
+    def list_of(self, task_id):
+        with self._lock:
+            task = self.tasks.get(task_id)
+            return task.get("_list_id") if task else None
+
+    def has_list(self, list_id):
+        with self._lock:
+            return list_id in self.lists
+
+    def list_name(self, list_id):
+        with self._lock:
+            return self.lists.get(list_id, {}).get("name", "")
+
+    def set_status(self, task_id, status):
+        """Applies a local edit right away (the next delta round confirms it)."""
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                self.tasks[task_id] = dict(task, status=status)
+            if self._pending is not None:
+                self._pending[task_id] = status  # A round is reading: replay on its result
+
+
+def get_task_sync(client, account):
+    """The process-wide task index of one account (created with client on first use)."""
+    with _syncs_lock:
+        sync = _syncs.get(account)
+        if sync is None:
+            sync = _syncs[account] = GraphTaskSync(client, account)
+        return sync
@@ -1,21 +1,43 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
 from sidebar.services.mail_client import MailClient
 from sidebar.services.outlook_client import OutlookClient
 from sidebar.services.graph_client import GraphAPIClient
+from sidebar.services.hybrid_routing import get_routing_table
+from sidebar.services.backend_health import get_breaker
+from sidebar.services.stream_merge import merge_top_n, start_key
+
+# Seconds a hybrid read waits for both backends before returning what it has
+HYBRID_DEADLINE = 8.0
 
 class HybridMailClient(MailClient):
     """
     Multiplexes both Classic Outlook (COM) and Microsoft 365 (Graph API).
     Allows user to have COM accounts and Graph accounts running simultaneously.
+
+    Reads run the Graph call on a helper thread while the COM call runs on
+    the calling thread (COM objects belong to the thread that created them),
+    so a poll costs max(COM, Graph) instead of the sum. Whatever hasn't
+    answered by the deadline is reported late and left out of that result.
     """
     def __init__(self):
         self.com = None
         self.graph = None
         self.last_received_time = None
         self._com_retry_pending = False
+        self.deadline = HYBRID_DEADLINE
+        self._graph_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hybrid-graph")
+        self._graph_pending = {}  # (method, args) -> Future still running past its deadline
+        self._pending_lock = threading.Lock()
+        self.last_fanout = {}     # method -> {"com": {...}, "graph": {...}} of the last call
+        self.routes = get_routing_table()  # Account and item -> backend, shared by every client
         
         # Try COM backend
         try:
             self.com = OutlookClient()
+            self.com.events.add_listener(self._on_com_event)
             if self.com.is_connected():
                 print("[Hybrid] COM backend connected successfully")
             else:
@@ -41,6 +63,7 @@ class HybridMailClient(MailClient):
             print("[Hybrid] Deferred COM retry...")
             if self.com.connect():
                 print("[Hybrid] Deferred COM retry succeeded!")
+                self.routes.invalidate_accounts()
             else:
                 print("[Hybrid] Deferred COM retry failed — COM emails unavailable")
         elif not self.com:
@@ -48,6 +71,8 @@ class HybridMailClient(MailClient):
                 self.com = OutlookClient()
                 if self.com.is_connected():
                     print("[Hybrid] Deferred COM init succeeded!")
+                    self.com.events.add_listener(self._on_com_event)
+                    self.routes.invalidate_accounts()
                 else:
                     print("[Hybrid] Deferred COM init failed")
                     self.com = None
@@ -60,8 +85,7 @@ class HybridMailClient(MailClient):
         # Try deferred COM connect if it failed at startup
         self._try_deferred_com_connect()
         
-        com_accs = self.com.get_accounts() if self.com else []
-        graph_accs = self.graph.get_accounts() if self.graph else []
+        com_accs, graph_accs = self._backend_accounts()
         
         if not account_names:
             return com_accs, graph_accs
@@ -71,12 +95,100 @@ class HybridMailClient(MailClient):
         
         return c_accs, g_accs
 
+    def _backend_accounts(self):
+        """(COM account names, Graph account names), enumerated once per account change."""
+        version = getattr(getattr(self.graph, "auth", None), "accounts_version", None)
+        cached = self.routes.accounts(version, owner=id(self))
+        if cached is not None:
+            return cached
+        com_accs = self.com.get_accounts() if self.com else []
+        graph_accs = self.graph.get_accounts() if self.graph else []
+        if com_accs or not self.com:
+            # An empty COM list usually means Outlook isn't reachable yet: ask again next time
+            self.routes.set_accounts(com_accs, graph_accs, version, owner=id(self))
+        return com_accs, graph_accs
+
+    def _on_com_event(self, kind, store_id=None):
+        if kind == "accounts":
+            print("[Hybrid] Outlook accounts changed; re-reading account list")
+            self.routes.invalidate_accounts()
+
+    def _learn(self, com_items, graph_items):
+        """Remembers which backend returned which items, for _route_item."""
+        self.routes.learn("com", com_items)
+        self.routes.learn("graph", graph_items)
+
+    def _fan_out(self, label, com_call, graph_call, com_optional=False, args=()):
+        """Runs graph_call on the helper pool and com_call here, both against one deadline.
+
+        Returns (com_result, graph_result, graph_error). A side that isn't
+        requested (None call), whose circuit breaker is open, fails or
+        misses the deadline gives None; the
+        Graph exception is returned for offline detection. A COM exception
+        is raised as before unless com_optional. Per-backend status and
+        latency are kept in self.last_fanout[label]. args are the call's
+        arguments: a late Graph call is only rejoined by the same call.
+        """
+        start = time.perf_counter()
+        report = {}
+        future = None
+        if graph_call is not None:
+            if get_breaker("graph").ready():
+                future = self._submit_graph((label, repr(args)), graph_call)
+            else:
+                report["graph"] = {"status": "open", "seconds": 0.0}
+
+        com_result = None
+        if com_call is not None:
+            try:
+                com_result = com_call()
+                report["com"] = {"status": "ok"}
+            except Exception as e:
+                print("[Hybrid] COM {} failed: {}".format(label, e))
+                report["com"] = {"status": "failed", "seconds": round(time.perf_counter() - start, 3)}
+                if not com_optional:
+                    self.last_fanout[label] = report
+                    raise
+            report["com"]["seconds"] = round(time.perf_counter() - start, 3)
+
+        graph_result = graph_error = None
+        if future is not None:
+            try:
+                graph_result = future.result(timeout=max(0.0, self.deadline - (time.perf_counter() - start)))
+                report["graph"] = {"status": "ok"}
+            except FutureTimeout:
+                print("[Hybrid] Graph {} missed the {}s deadline; returning COM results only".format(
+                    label, self.deadline))
+                report["graph"] = {"status": "late"}
+            except Exception as e:
+                print("[Hybrid] Graph {} failed (likely offline): {}".format(label, e))
+                report["graph"] = {"status": "failed"}
+                graph_error = e
+            report["graph"]["seconds"] = round(time.perf_counter() - start, 3)
+
+        self.last_fanout[label] = report
+        return com_result, graph_result, graph_error
+
+    def _submit_graph(self, key, graph_call):
+        """Starts graph_call, or rejoins the call with the same key (method and
+        arguments) if it is still running from a missed deadline."""
+        with self._pending_lock:
+            future = self._graph_pending.get(key)
+            if future is not None and not future.done():
+                return future
+            for old in [k for k, f in self._graph_pending.items() if f.done()]:
+                del self._graph_pending[old]
+            future = self._graph_pool.submit(graph_call)
+            self._graph_pending[key] = future
+            return future
+
     def connect(self) -> bool:
         c = self.com.connect() if self.com else False
         g = self.graph.connect() if self.graph else False
         return c or g
 
     def reconnect(self) -> bool:
+        self.routes.invalidate_accounts()
         c = self.com.reconnect() if self.com else False
         g = self.graph.reconnect() if self.graph else False
         return c or g
@@ -89,11 +201,8 @@ class HybridMailClient(MailClient):
     def get_accounts(self) -> list:
         # Combine unique accounts from both
         accs = []
-        if self.com:
-            for a in self.com.get_accounts():
-                if a not in accs: accs.append(a)
-        if self.graph:
-            for a in self.graph.get_accounts():
+        for names in self._backend_accounts():
+            for a in names:
                 if a not in accs: accs.append(a)
         return accs
 
@@ -101,50 +210,57 @@ class HybridMailClient(MailClient):
                         due_filters=None, account_names=None, account_config=None) -> tuple:
         c_names, g_names = self._split_accounts(account_names)
         
-        all_emails = []
-        total_unread = 0
-        graph_error = None
-        
+        com_call = graph_call = None
         if self.com and (c_names or not account_names):
-            try:
-                c_emails, c_unread = self.com.get_inbox_items(count, unread_only, only_flagged, due_filters, c_names, account_config)
-                all_emails.extend(c_emails)
-                total_unread += c_unread
-            except Exception as e:
-                print("[Hybrid] COM get_inbox_items failed: {}".format(e))
-            
+            com_call = lambda: self.com.get_inbox_items(count, unread_only, only_flagged, due_filters, c_names, account_config)
         if self.graph and (g_names or not account_names):
-            try:
-                g_emails, g_unread = self.graph.get_inbox_items(count, unread_only, only_flagged, due_filters, g_names, account_config)
-                all_emails.extend(g_emails)
-                total_unread += g_unread
-            except Exception as e:
-                print("[Hybrid] Graph get_inbox_items failed (likely offline): {}".format(e))
-                graph_error = e
+            graph_call = lambda: self.graph.get_inbox_items(count, unread_only, only_flagged, due_filters, g_names, account_config)
+        com_res, graph_res, graph_error = self._fan_out(
+            "get_inbox_items", com_call, graph_call, com_optional=True,
+            args=(count, unread_only, only_flagged, due_filters, g_names, account_config))
+
+        self._learn(com_res[0] if com_res else None, graph_res[0] if graph_res else None)
+        streams = []
+        total_unread = 0
+        for res in (com_res, graph_res):
+            if res is not None:
+                streams.append(res[0])
+                total_unread += res[1]
         
         # If we got NO emails and there was a network error, propagate it
         # so the UI can show the offline indicator
-        if not all_emails and graph_error is not None:
+        if not any(streams) and graph_error is not None:
             raise graph_error
             
-        # Sort combined by received date (safely handling None dates)
-        import datetime
-        min_date = datetime.datetime.min
-        all_emails.sort(key=lambda x: x.get("received") or min_date, reverse=True)
-        return all_emails[:count], total_unread
+        # Both backends return newest first: merge and stop at count
+        return merge_top_n(streams, count), total_unread
 
     def get_unread_count(self, account_names=None, account_config=None) -> int:
         c_names, g_names = self._split_accounts(account_names)
-        total = 0
-        if self.com and (c_names or not account_names): total += self.com.get_unread_count(c_names, account_config)
-        if self.graph and (g_names or not account_names):
+        com_res, graph_res, _ = self._fan_out(
+            "get_unread_count",
+            (lambda: self.com.get_unread_count(c_names, account_config)) if self.com and (c_names or not account_names) else None,
+            (lambda: self.graph.get_unread_count(g_names, account_config)) if self.graph and (g_names or not account_names) else None,
+            args=(g_names, account_config))
+        return (com_res or 0) + (graph_res or 0)
+
+    def _route_item(self, entry_id, store_id, method_name, *args):
+        # Items we listed go straight to the backend that returned them
+        route = self.routes.route(entry_id)
+        client = None
+        if route is not None:
+            client = self.com if route[0] == "com" else self.graph
+        if client is not None:
             try:
-                total += self.graph.get_unread_count(g_names, account_config)
+                result = getattr(client, method_name)(entry_id, store_id or route[1], *args)
             except Exception as e:
-                print("[Hybrid] Graph get_unread_count failed: {}".format(e))
-        return total
+                print("[Hybrid] {} {} failed: {}".format(route[0], method_name, e))
+                return None
+            if method_name in ("delete_email", "move_email"):
+                self.routes.forget(entry_id)  # The id is gone (moves get a new one)
+            return result
 
-    def _route_item(self, entry_id, store_id, method_name, *args):
+        # Unknown item: guess from the id
         import string
         is_hex = all(c in string.hexdigits for c in entry_id) if hasattr(entry_id, 'isalnum') else False
         
@@ -203,24 +319,31 @@ class HybridMailClient(MailClient):
 
     def get_calendar_items(self, start_dt, end_dt, account_names=None) -> list:
         c_names, g_names = self._split_accounts(account_names)
-        items = []
-        if self.com and c_names: items.extend(self.com.get_calendar_items(start_dt, end_dt, c_names))
-        if self.graph and g_names: items.extend(self.graph.get_calendar_items(start_dt, end_dt, g_names))
-        # Standardize timezone before sorting (make naive)
-        for item in items:
-            dt = item.get("start")
-            if dt and dt.tzinfo is not None:
-                item["start"] = dt.replace(tzinfo=None)
-                
-        # Sort by start time
-        items.sort(key=lambda x: x.get("start"))
-        return items
+        com_res, graph_res, _ = self._fan_out(
+            "get_calendar_items",
+            (lambda: self.com.get_calendar_items(start_dt, end_dt, c_names)) if self.com and c_names else None,
+            (lambda: self.graph.get_calendar_items(start_dt, end_dt, g_names)) if self.graph and g_names else None,
+            args=(start_dt, end_dt, g_names))
+        self._learn(com_res, graph_res)
+        # Standardize timezone before merging (make naive); the backends' records
+        # may be cached and shared, so changed ones are copies
+        streams = [[item.replace(start=item.start.replace(tzinfo=None))
+                    if item.start and item.start.tzinfo is not None else item
+                    for item in res]
+                   for res in (com_res, graph_res) if res is not None]
+
+        # Each backend is sorted by start time already
+        return merge_top_n(streams, key=start_key, reverse=False)
 
     def get_tasks(self, due_filters=None, account_names=None) -> list:
         c_names, g_names = self._split_accounts(account_names)
-        tasks = []
-        if self.com and c_names: tasks.extend(self.com.get_tasks(due_filters, c_names))
-        if self.graph and g_names: tasks.extend(self.graph.get_tasks(due_filters, g_names))
+        com_res, graph_res, _ = self._fan_out(
+            "get_tasks",
+            (lambda: self.com.get_tasks(due_filters, c_names)) if self.com and c_names else None,
+            (lambda: self.graph.get_tasks(due_filters, g_names)) if self.graph and g_names else None,
+            args=(due_filters, g_names))
+        self._learn(com_res, graph_res)
+        tasks = (com_res or []) + (graph_res or [])
         
         def sort_key(x):
             try:
@@ -254,29 +377,65 @@ class HybridMailClient(MailClient):
 
     def check_new_mail(self, account_names=None) -> bool:
         c_names, g_names = self._split_accounts(account_names)
-        val = False
-        if self.com and c_names: val = val or self.com.check_new_mail(c_names)
-        if self.graph and g_names:
-            try:
-                val = val or self.graph.check_new_mail(g_names)
-            except Exception as e:
-                print("[Hybrid] Graph check_new_mail failed: {}".format(e))
-        return val
+        com_res, graph_res, _ = self._fan_out(
+            "check_new_mail",
+            (lambda: self.com.check_new_mail(c_names)) if self.com and c_names else None,
+            (lambda: self.graph.check_new_mail(g_names)) if self.graph and g_names else None,
+            args=(g_names,))
+        return bool(com_res or graph_res)
+
+    def start_events(self, account_names=None, account_config=None, listener=None) -> bool:
+        # Only the COM backend pushes events; Graph accounts keep polling
+        if not self.com:
+            return False
+        c_names, _ = self._split_accounts(account_names)
+        if account_names and not c_names:
+            return False
+        return self.com.start_events(c_names or None, account_config, listener)
 
     def get_pulse_status(self, account_names=None) -> dict:
         c_names, g_names = self._split_accounts(account_names)
-        p1 = self.com.get_pulse_status(c_names) if self.com and c_names else {"calendar": None, "tasks": None}
-        try:
-            p2 = self.graph.get_pulse_status(g_names) if self.graph and g_names else {"calendar": None, "tasks": None}
-        except Exception as e:
-            print("[Hybrid] Graph get_pulse_status failed: {}".format(e))
-            p2 = {"calendar": None, "tasks": None}
+        empty = {"calendar": None, "tasks": None}
+        com_res, graph_res, _ = self._fan_out(
+            "get_pulse_status",
+            (lambda: self.com.get_pulse_status(c_names)) if self.com and c_names else None,
+            (lambda: self.graph.get_pulse_status(g_names)) if self.graph and g_names else None,
+            args=(g_names,))
+        p1 = com_res or empty
+        p2 = graph_res or empty
         
         # Combine (take highest urgency)
         res = {"calendar": p1.get("calendar") or p2.get("calendar"), 
                "tasks": p1.get("tasks") or p2.get("tasks")}
         return res
 
+    def get_poll_snapshot(self, account_names=None, account_config=None, inbox_query=None) -> dict:
+        c_names, g_names = self._split_accounts(account_names)
+        empty = {"has_new": False, "unread_count": 0,
+                 "due_status": {"calendar": None, "tasks": None}, "emails": None}
+        
+        com_res, graph_res, _ = self._fan_out(
+            "get_poll_snapshot",
+            (lambda: self.com.get_poll_snapshot(c_names, account_config, inbox_query)) if self.com and c_names else None,
+            (lambda: self.graph.get_poll_snapshot(g_names, account_config, inbox_query)) if self.graph and g_names else None,
+            args=(g_names, account_config, inbox_query))
+        p1 = com_res or empty
+        p2 = graph_res or empty
+        self._learn(p1["emails"], p2["emails"])
+        
+        emails = None
+        if inbox_query is not None:
+            emails = merge_top_n([p1["emails"] or [], p2["emails"] or []], inbox_query.get("count", 20))
+        
+        d1, d2 = p1["due_status"], p2["due_status"]
+        return {
+            "has_new": p1["has_new"] or p2["has_new"],
+            "unread_count": p1["unread_count"] + p2["unread_count"],
+            "due_status": {"calendar": d1.get("calendar") or d2.get("calendar"),
+                           "tasks": d1.get("tasks") or d2.get("tasks")},
+            "emails": emails,
+        }
+
     def get_category_map(self) -> dict:
         m = self.com.get_category_map() if self.com else {}
         if self.graph:
@@ -290,7 +449,7 @@ class HybridMailClient(MailClient):
         return res
 
     def get_folder_list(self, account_name=None) -> list:
-        com_accs = self.com.get_accounts() if self.com else []
+        com_accs, _ = self._backend_accounts()
         if account_name in com_accs:
             return self.com.get_folder_list(account_name)
         if self.graph:
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Account and item routing for HybridMailClient.
+
+Every hybrid call used to split its account names by enumerating the COM
+stores (namespace.Stores) and the MSAL accounts again, and every item action
+guessed the backend from the EntryID (long hex = COM), then tried Graph and
+COM in turn until one didn't raise.
+
+RoutingTable remembers both answers: the account lists of each backend, kept
+until an account is added or removed (Outlook StoreAdd/BeforeStoreRemove
+events, GraphAuth sign-in/out), and the backend and store of every item a
+read returned, so an action on a listed item goes to its backend directly.
+
+The table is process-wide (get_routing_table): the data engine's client
+learns the items it lists and the UI thread's client routes the actions on
+them. Account lists are kept per client (each has its own GraphAuth and
+accounts_version); an account change clears them all.
+"""
+
+import threading
+from collections import OrderedDict
+
+# Items remembered (most recently fetched kept)
+ROUTE_CACHE_SIZE = 5000
+
+_table = None
+_table_lock = threading.Lock()
+
+
+class RoutingTable:
+    """account -> backend and entry id -> (backend, store id), thread-safe."""
+
+    def __init__(self, max_items=ROUTE_CACHE_SIZE):
+        self.max_items = max_items
+        self._accounts = {}         # owner -> (GraphAuth.accounts_version, (com names, graph names))
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"account_loads": 0, "hits": 0, "misses": 0}
+
+    # --- Accounts ---
+    def accounts(self, graph_version=None, owner=None):
+        """Cached (com names, graph names) of owner, or None if they must be enumerated again."""
+        with self._lock:
+            entry = self._accounts.get(owner)
+            if entry is None or entry[0] != graph_version:
+                return None
+            return entry[1]
+
+    def set_accounts(self, com_names, graph_names, graph_version=None, owner=None):
+        with self._lock:
+            self._accounts[owner] = (graph_version, (list(com_names), list(graph_names)))
+            self.stats["account_loads"] += 1
+
+    def invalidate_accounts(self):
+        with self._lock:
+            self._accounts.clear()
+
+    # --- Items ---
+    def learn(self, backend, items):
+        """Records the backend and store of fetched items (records with entry_id/store_id)."""
+        if not items:
+            return
+        with self._lock:
+            for item in items:
+                entry_id = item.get("entry_id")
+                if not entry_id:
+                    continue
+                self._items[entry_id] = (backend, item.get("store_id"))
+                self._items.move_to_end(entry_id)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def route(self, entry_id):
+        """(backend, store id) for a fetched item, or None."""
+        with self._lock:
+            route = self._items.get(entry_id)
+            self.stats["hits" if route else "misses"] += 1
+            return route
+
+    def forget(self, entry_id):
+        """Drops an item whose id is no longer valid (deleted or moved)."""
+        with self._lock:
+            self._items.pop(entry_id, None)
+
+
+def get_routing_table():
+    """The process-wide routing table shared by every HybridMailClient."""
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = RoutingTable()
+        return _table
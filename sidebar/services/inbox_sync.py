@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Incremental inbox sync for the COM backend.
+
+Instead of rebuilding the top-N list from a fresh GetTable() on every poll,
+each (store, folder, view) keeps an in-memory copy of the rows in its view
+plus a LastModificationTime high-water mark. A poll only reads rows modified
+since the mark and merges them in, so steady-state cost follows the number of
+changes rather than the size of the folder.
+
+Deletions don't show up in a modification-time query, so each poll also
+compares the view's GetRowCount() against the cache and only re-reads the
+EntryIDs when they disagree.
+"""
+
+from datetime import datetime, timedelta
+
+from sidebar.services.table_reader import iter_table_rows
+
+# Days of mail shown when "show read" is on (matches the DASL cutoff)
+INBOX_RECENT_DAYS = 7
+
+# Views bigger than this aren't cached; the caller falls back to a plain fetch
+MAX_SYNC_ITEMS = 1000
+
+
+def _naive(dt):
+    if dt is not None and getattr(dt, "tzinfo", None) is not None:
+        return dt.replace(tzinfo=None)
+    return dt
+
+
+class _FolderState:
+    def __init__(self):
+        self.items = {}         # entry_id -> MailItem
+        self.watermark = None   # newest LastModificationTime seen (naive)
+
+
+class InboxSync:
+    """Keeps per-folder item caches and merges LastModificationTime deltas into them."""
+
+    def __init__(self, max_items=MAX_SYNC_ITEMS):
+        self.max_items = max_items
+        self._states = {}
+        self.stats = {"full_loads": 0, "delta_polls": 0, "rows_read": 0, "reconciles": 0}
+
+    def reset(self):
+        """Drops every cached folder (account changes and reconnects)."""
+        self._states.clear()
+
+    def sync_folder(self, client, folder, store, unread_only):
+        """Brings one folder's cache up to date.
+
+        Returns the items sorted newest first, or None if the view is too
+        large to cache (caller should do a plain fetch).
+        """
+        try:
+            key = (store.StoreID, folder.EntryID, bool(unread_only))
+        except Exception:
+            return None
+
+        view_restrict = client._build_inbox_restrict(unread_only, False, None)
+        state = self._states.get(key)
+
+        if state is None:
+            state = self._full_load(client, folder, store, view_restrict)
+            if state is None:
+                return None
+            self._states[key] = state
+        elif not self._delta_poll(client, folder, store, state, view_restrict, unread_only):
+            # Cache fell out of step with the view; rebuild it from scratch
+            self._states.pop(key, None)
+            return self.sync_folder(client, folder, store, unread_only)
+
+        return sorted(state.items.values(),
+                      key=lambda x: _naive(x.received) or datetime.min,
+                      reverse=True)
+
+    # --- Internals ---
+    def _read_rows(self, client, table, store, state):
+        """Reads every row of a prepared table into (item, modified) pairs."""
+        store_info = (store.StoreID, store.DisplayName)
+        rows = list(iter_table_rows(
+            table, decode=lambda vals: (client._row_to_item(vals, store_info), _naive(vals[-1]))))
+        self.stats["rows_read"] += len(rows)
+        for _, modified in rows:
+            if modified and (state.watermark is None or modified > state.watermark):
+                state.watermark = modified
+        return rows
+
+    def _full_load(self, client, folder, store, view_restrict):
+        table = folder.GetTable(view_restrict) if view_restrict else folder.GetTable()
+        if table.GetRowCount() > self.max_items:
+            return None
+        client._prepare_inbox_table(table, with_modified=True)
+
+        state = _FolderState()
+        for item, _ in self._read_rows(client, table, store, state):
+            state.items[item.entry_id] = item
+        self.stats["full_loads"] += 1
+        return state
+
+    def _delta_poll(self, client, folder, store, state, view_restrict, unread_only):
+        """Merges rows modified since the watermark; False if the cache must be rebuilt."""
+        self.stats["delta_polls"] += 1
+        cutoff = datetime.now() - timedelta(days=INBOX_RECENT_DAYS)
+
+        def in_view(item):
+            if unread_only:
+                return bool(item.unread)
+            received = _naive(item.received)
+            return received is None or received >= cutoff
+
+        # 1. Rows modified since the watermark (minute resolution, so step back one)
+        if state.watermark is not None:
+            since = (state.watermark - timedelta(minutes=1)).strftime('%d/%m/%Y %H:%M')
+            table = folder.GetTable("[LastModificationTime] >= '{}'".format(since))
+            client._prepare_inbox_table(table, with_modified=True)
+            for item, _ in self._read_rows(client, table, store, state):
+                if in_view(item):
+                    state.items[item.entry_id] = item
+                else:
+                    state.items.pop(item.entry_id, None)
+
+        # 2. Items that aged out of the 7-day window
+        if not unread_only:
+            for eid, item in list(state.items.items()):
+                if not in_view(item):
+                    del state.items[eid]
+
+        # 3. Deletions/moves: only re-read IDs when the row count disagrees
+        table = folder.GetTable(view_restrict) if view_restrict else folder.GetTable()
+        view_count = table.GetRowCount()
+        if view_count > self.max_items:
+            return False
+        if view_count != len(state.items):
+            self.stats["reconciles"] += 1
+            table.Columns.RemoveAll()
+            table.Columns.Add("EntryID")
+            live_ids = set(vals[0] for vals in iter_table_rows(table))
+            for eid in list(state.items):
+                if eid not in live_ids:
+                    del state.items[eid]
+            if len(live_ids) != len(state.items):
+                # Rows we never saw entered the view (e.g. moved in with an
+                # old modification time) — rebuild the cache
+                return False
+
+        return True
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Compact item records shared by every backend.
+
+The backends used to return dicts with their own keys: COM mail had
+"received_dt", "has_attachments" and "preview", Graph mail had "received",
+"has_attachment" and "body_preview" (and importance as "normal"/"high"
+instead of 0/1/2), so the list rendering and the merge sort looked every
+field up twice.
+
+MailItem, EventItem and TaskItem are __slots__ records built once where a
+backend maps its raw data (OutlookClient._row_to_item, GraphAPIClient._map_*).
+Fields are read as attributes (item.received). For existing callers they
+also behave like read-mostly dicts: item["subject"], item.get("preview"),
+and the old backend-specific keys resolve to the unified field. Keys a
+record has no field for are kept in a small side dict.
+"""
+
+# Graph importance strings -> Outlook olImportance values
+_IMPORTANCE_LEVELS = {"low": 0, "normal": 1, "high": 2}
+
+
+def importance_level(value):
+    """0 (low), 1 (normal) or 2 (high) from an Outlook int or a Graph string."""
+    if isinstance(value, str):
+        return _IMPORTANCE_LEVELS.get(value.lower(), 1)
+    return 1 if value is None else value
+
+
+class ItemRecord:
+    """Base for the item records: named fields plus dict-style access."""
+
+    __slots__ = ("_extra", "_readonly")
+    _FIELDS = ()                # (name, default) in slot order
+    _FIELD_NAMES = frozenset()
+    _ALIASES = {}               # Older backend-specific key -> field
+
+    def __init__(self, **values):
+        set_field = object.__setattr__  # Skips the read-only check while building
+        set_field(self, "_extra", None)     # Keys without a field
+        set_field(self, "_readonly", False)
+        for name, default in self._FIELDS:
+            set_field(self, name, values.pop(name, default))
+        for key, value in values.items():
+            self[key] = value  # Older key names, or keys without a field
+
+    # --- dict-style access (compatibility with callers written for dicts) ---
+    def _field(self, key):
+        key = self._ALIASES.get(key, key)
+        return key if key in self._FIELD_NAMES else None
+
+    def __getitem__(self, key):
+        name = self._field(key)
+        if name is not None:
+            return getattr(self, name)
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        name = self._field(key)
+        if name is not None:
+            return getattr(self, name)
+        if self._extra:
+            return self._extra.get(key, default)
+        return default
+
+    def __setitem__(self, key, value):
+        if self._readonly:
+            raise TypeError("{} is read-only".format(type(self).__name__))
+        name = self._field(key)
+        if name is not None:
+            setattr(self, name, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __setattr__(self, name, value):
+        if self._readonly:
+            raise TypeError("{} is read-only".format(type(self).__name__))
+        object.__setattr__(self, name, value)
+
+    def __contains__(self, key):
+        return self._field(key) is not None or bool(self._extra and key in self._extra)
+
+    def keys(self):
+        names = [name for name, _ in self._FIELDS]
+        return names + list(self._extra or ())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def freeze(self):
+        """Makes item[...] = ... and item.field = ... raise from now on (results
+        handed to the UI); returns self."""
+        object.__setattr__(self, "_readonly", True)
+        return self
+
+    def replace(self, **changes):
+        """Returns a writable copy with some fields changed (the record itself may be shared)."""
+        values = {name: getattr(self, name) for name, _ in self._FIELDS}
+        values.update(self._extra or ())
+        values.update(changes)
+        return type(self)(**values)
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, ", ".join(
+            "{}={!r}".format(k, v) for k, v in self.items()))
+
+
+class MailItem(ItemRecord):
+    """One mail item, from either backend."""
+
+    _FIELDS = (
+        ("entry_id", None),
+        ("store_id", None),          # COM StoreID / Graph account, for routing actions
+        ("account", ""),
+        ("subject", ""),
+        ("sender", ""),
+        ("sender_email", ""),
+        ("received", None),          # datetime
+        ("unread", False),
+        ("has_attachments", False),
+        ("importance", 1),           # 0 low, 1 normal, 2 high
+        ("flag_status", 0),          # 0 none, 1 flagged, 2 complete
+        ("flag_request", ""),
+        ("due_date", None),
+        ("categories", ()),
+        ("preview", ""),
+        ("modified", None),          # Keys the preview cache
+        ("conversation_id", ""),
+        ("is_meeting_request", False),
+        ("web_link", ""),
+    )
+    __slots__ = tuple(name for name, _ in _FIELDS)
+    _FIELD_NAMES = frozenset(__slots__)
+    _ALIASES = {
+        "received_dt": "received",
+        "has_attachment": "has_attachments",
+        "body_preview": "preview",
+        "flag_due": "due_date",
+    }
+
+
+class EventItem(ItemRecord):
+    """One calendar item, from either backend."""
+
+    _FIELDS = (
+        ("entry_id", None),
+        ("store_id", None),
+        ("account", ""),
+        ("subject", ""),
+        ("start", None),
+        ("end", None),
+        ("location", ""),
+        ("response_status", 0),      # olResponseStatus
+        ("organizer", ""),
+        ("is_recurring", False),
+        ("is_meeting", True),
+        ("web_link", ""),
+    )
+    __slots__ = tuple(name for name, _ in _FIELDS)
+    _FIELD_NAMES = frozenset(__slots__)
+
+
+class TaskItem(ItemRecord):
+    """One task, from either backend."""
+
+    _FIELDS = (
+        ("entry_id", None),
+        ("store_id", None),          # COM StoreID / Graph To Do list id
+        ("account", ""),
+        ("subject", ""),
+        ("due", None),
+        ("importance", "Normal"),
+        ("status", "NotStarted"),
+        ("categories", ()),
+        ("is_recurring", False),
+        ("has_reminder", False),
+        ("complete", False),
+        ("is_task", True),
+        ("web_link", ""),
+    )
+    __slots__ = tuple(name for name, _ in _FIELDS)
+    _FIELD_NAMES = frozenset(__slots__)
@@ -130,6 +130,14 @@ class MailClient(abc.ABC):
         """Returns True if there is new mail since the last check."""
         pass
     
+    def start_events(self, account_names=None, account_config=None, listener=None) -> bool:
+        """
+        Optional: subscribes to backend change notifications.
+        listener(kind, store_id) is called when mail arrives or changes.
+        Returns False if unsupported, in which case callers keep polling.
+        """
+        return False
+    
     # --- Pulse ---
     @abc.abstractmethod
     def get_pulse_status(self, account_names=None) -> dict:
@@ -138,6 +146,27 @@ class MailClient(abc.ABC):
         e.g., {"calendar": "Today", "tasks": "Overdue"}
         """
         pass
+
+    def get_poll_snapshot(self, account_names=None, account_config=None, inbox_query=None) -> dict:
+        """
+        Gathers everything one poll cycle needs.
+        Returns {"has_new": bool, "unread_count": int, "due_status": dict,
+                 "emails": list or None}.
+        inbox_query (optional) holds get_inbox_items keyword arguments
+        (count, unread_only, ...); "emails" is None without it.
+        Backends override this to collect it all in one pass per store;
+        the default just makes the individual calls.
+        """
+        emails = None
+        if inbox_query is not None:
+            emails, _ = self.get_inbox_items(account_names=account_names,
+                                             account_config=account_config, **inbox_query)
+        return {
+            "has_new": self.check_new_mail(account_names),
+            "unread_count": self.get_unread_count(account_names, account_config),
+            "due_status": self.get_pulse_status(account_names),
+            "emails": emails,
+        }
     
     # --- Utility ---
     @abc.abstractmethod
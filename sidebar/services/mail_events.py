@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""Change notifications for the mail backends.
+
+MailEventHub collects "something changed" notifications from any event
+source and answers check_new_mail() from them, so the Inbox tables only need
+to be polled as a slow fallback. OutlookEventSource feeds the hub from
+Outlook's Application.NewMailEx, Items.ItemAdd/ItemChange/ItemRemove and
+Folders.FolderAdd/FolderChange/FolderRemove events, plus Stores.StoreAdd/
+BeforeStoreRemove for accounts coming and going; tests and benchmarks can
+drive the hub directly via notify().
+"""
+
+import threading
+import time
+
+# While events are flowing, still do a real table poll this often (seconds)
+EVENT_FALLBACK_POLL = 300
+
+# Default Inbox folder type (olFolderInbox)
+_OL_FOLDER_INBOX = 6
+
+# Event kinds that mean mail changed (reported by drain); "folders" and
+# "accounts" only reach listeners
+MAIL_EVENT_KINDS = ("new_mail", "added", "changed", "removed")
+
+
+class MailEventHub:
+    """Thread-safe collector of mail change notifications."""
+
+    def __init__(self, fallback_interval=EVENT_FALLBACK_POLL):
+        self.fallback_interval = fallback_interval
+        self._lock = threading.Lock()
+        self._pending = []
+        self._listeners = []
+        self._active = False
+        self._last_poll = 0
+        self.stats = {"events": 0, "fallback_polls": 0}
+
+    # --- Source side ---
+    def set_active(self, active):
+        """Marks whether a live event source is feeding the hub."""
+        with self._lock:
+            self._active = active
+            if active:
+                self._last_poll = time.time()
+
+    def notify(self, kind, store_id=None, folder_id=None, entry_id=None):
+        """Records one event. kind is one of MAIL_EVENT_KINDS, "folders" or "accounts"."""
+        with self._lock:
+            if kind in MAIL_EVENT_KINDS:
+                self._pending.append((kind, store_id, folder_id, entry_id))
+            self.stats["events"] += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(kind, store_id)
+            except Exception as e:
+                print("[MailEvents] Listener error: {}".format(e))
+
+    # --- Consumer side ---
+    @property
+    def active(self):
+        return self._active
+
+    def add_listener(self, callback):
+        """callback(kind, store_id) is called on the event thread for every notification."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def drain(self):
+        """Returns and clears the pending events."""
+        with self._lock:
+            events, self._pending = self._pending, []
+            return events
+
+    def poll_due(self):
+        """True if polling should run: no live source, or the fallback interval elapsed."""
+        with self._lock:
+            if not self._active:
+                return True
+            if time.time() - self._last_poll >= self.fallback_interval:
+                self._last_poll = time.time()
+                self.stats["fallback_polls"] += 1
+                return True
+            return False
+
+
+class _ApplicationEvents:
+    """win32com event sink for Outlook.Application."""
+    def OnNewMailEx(self, entry_ids):
+        for eid in str(entry_ids or "").split(","):
+            self._hub.notify("new_mail", entry_id=eid or None)
+
+
+class _ItemsEvents:
+    """win32com event sink for a folder's Items collection."""
+    def OnItemAdd(self, item):
+        self._hub.notify("added", self._store_id, self._folder_id)
+
+    def OnItemChange(self, item):
+        self._hub.notify("changed", self._store_id, self._folder_id)
+
+    def OnItemRemove(self):
+        self._hub.notify("removed", self._store_id, self._folder_id)
+
+
+class _FoldersEvents:
+    """win32com event sink for a Folders collection (subfolder add/rename/move/delete)."""
+    def OnFolderAdd(self, folder):
+        self._hub.notify("folders", self._store_id)
+
+    def OnFolderChange(self, folder):
+        self._hub.notify("folders", self._store_id)
+
+    def OnFolderRemove(self):
+        self._hub.notify("folders", self._store_id)
+
+
+class _StoresEvents:
+    """win32com event sink for Namespace.Stores (accounts/PST files added or removed)."""
+    def OnStoreAdd(self, store):
+        self._hub.notify("accounts")
+
+    def OnBeforeStoreRemove(self, store, cancel):
+        self._hub.notify("accounts")
+
+
+class OutlookEventSource:
+    """Subscribes a MailEventHub to Outlook COM events.
+
+    Must be created and used on the thread that owns the OutlookClient's COM
+    objects, and that thread must pump messages (pythoncom.PumpWaitingMessages)
+    for the events to be delivered.
+    """
+
+    def __init__(self, client, hub):
+        self.client = client
+        self.hub = hub
+        self._sinks = []  # Keep the sinks (and their Items) alive or events stop
+
+    def subscribe(self, account_names=None, account_config=None):
+        """Hooks NewMailEx plus the configured folders. Returns True on success."""
+        import win32com.client
+
+        self.unsubscribe()
+        try:
+            app_sink = win32com.client.WithEvents(self.client.outlook, _ApplicationEvents)
+            app_sink._hub = self.hub
+            self._sinks.append(app_sink)
+
+            stores = self.client.namespace.Stores
+            stores_sink = win32com.client.WithEvents(stores, _StoresEvents)
+            stores_sink._hub = self.hub
+            stores_sink._stores = stores
+            self._sinks.append(stores_sink)
+
+            for store in self.client._get_enabled_stores(account_names):
+                folders = self.client._get_email_folders(store, account_config)
+                self._hook_folder_tree(store, folders)
+                for folder in folders:
+                    try:
+                        items = folder.Items
+                        sink = win32com.client.WithEvents(items, _ItemsEvents)
+                        sink._hub = self.hub
+                        sink._store_id = store.StoreID
+                        sink._folder_id = folder.EntryID
+                        sink._items = items
+                        self._sinks.append(sink)
+                    except Exception as e:
+                        print("[MailEvents] Could not hook folder: {}".format(e))
+        except Exception as e:
+            print("[MailEvents] Subscription failed, polling instead: {}".format(e))
+            self.unsubscribe()
+            return False
+
+        self.hub.set_active(True)
+        print("[MailEvents] Subscribed to {} event sources".format(len(self._sinks)))
+        return True
+
+    def _hook_folder_tree(self, store, folders):
+        """Watches the Folders collections of the root and every ancestor of
+        the given folders, so renaming or moving any part of a configured
+        path is reported."""
+        import win32com.client
+
+        store_id = store.StoreID
+        parents = {}
+        try:
+            root = store.GetRootFolder()
+            parents[root.EntryID] = root
+        except Exception:
+            return
+        for folder in folders:
+            try:
+                curr = folder
+                while curr.EntryID != root.EntryID:
+                    curr = curr.Parent
+                    if curr.EntryID in parents:
+                        break
+                    parents[curr.EntryID] = curr
+            except Exception:
+                continue  # Walked past the root (e.g. Parent is the Namespace)
+
+        for parent in parents.values():
+            try:
+                subfolders = parent.Folders
+                sink = win32com.client.WithEvents(subfolders, _FoldersEvents)
+                sink._hub = self.hub
+                sink._store_id = store_id
+                sink._folders = subfolders
+                self._sinks.append(sink)
+            except Exception as e:
+                print("[MailEvents] Could not hook folder list: {}".format(e))
+
+    def unsubscribe(self):
+        for sink in self._sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+        self._sinks = []
+        self.hub.set_active(False)
@@ -13,6 +13,14 @@ except ImportError:
 # Import theme constants from core
 from sidebar.core.theme import OL_CAT_COLORS
 from sidebar.services.mail_client import MailClient
+from sidebar.services.mail_events import MailEventHub, OutlookEventSource
+from sidebar.services.backend_health import get_breaker
+from sidebar.services.item_record import MailItem, EventItem, TaskItem
+from sidebar.services.folder_cache import FolderCache, MISSING
+from sidebar.services.table_reader import iter_table_rows
+from sidebar.services.store_fanout import fan_out_stores, STORE_FETCH_TIMEOUT
+from sidebar.services.stream_merge import merge_top_n
+from sidebar.services.inbox_sync import InboxSync, INBOX_RECENT_DAYS
 
 def _has_outlook_profile():
     """Check registry to see if Outlook is actually set up, avoiding the 'Welcome to Outlook' wizard."""
@@ -43,6 +51,23 @@ class OutlookClient(MailClient):
         self.last_received_time = None
         self._last_connect_time = 0
         self._first_connect = True
+        self._no_profile = False
+        # Shared COM health: after a failed connect, retries back off instead of every call
+        self.health = get_breaker("com")
+        # Incremental inbox sync (LastModificationTime watermark per folder)
+        self.incremental_sync = True
+        self._inbox_sync = InboxSync()
+        # Outlook change events (polling becomes a slow fallback once subscribed)
+        self.events = MailEventHub()
+        self._event_source = None
+        self._event_params = None
+        self.events.add_listener(self._on_folder_event)
+        # Resolved folder/store handles, dropped on folder events and reconnect
+        self.folder_cache = FolderCache()
+        # Optional: fetch each store on its own thread (see store_fanout)
+        self.parallel_stores = False
+        self.store_timeout = STORE_FETCH_TIMEOUT
+        self.fanout_stats = {}
         self.connect()
         # Initialize last_received_time
         if self.namespace:
@@ -53,25 +78,33 @@ class OutlookClient(MailClient):
         
         First attempt (startup): Up to 5 retries with 3s waits — frozen exes
         need extra time for Outlook COM to become available.
-        Subsequent attempts: 60-second cooldown to avoid hammering.
+        Subsequent attempts: only when the COM circuit breaker allows one
+        (backoff from 15s up to 5 minutes after failures).
         """
         # Already connected
         if self.outlook and self.namespace:
             return True
         
-        # Cooldown only applies AFTER the first connect attempt
+        # Without a profile there is nothing to retry for; look again once a minute
+        if self._no_profile and time.time() - self._last_connect_time < 60:
+            return False
+
+        # The breaker only gates attempts AFTER the first connect
         if not self._first_connect:
-            now = time.time()
-            if now - self._last_connect_time < 60:
+            if not self.health.allow():
                 return False
-            self._last_connect_time = now
+            self._last_connect_time = time.time()
         
         if not _has_outlook_profile():
             print("No Outlook profile found in registry. Skipping COM initialization to avoid wizard.")
             self.outlook = None
             self.namespace = None
             self._first_connect = False
+            self._no_profile = True
+            self._last_connect_time = time.time()
+            self.health.success()  # Not an outage (and releases a half-open probe)
             return False
+        self._no_profile = False
         
         # Frozen exe (PyInstaller) needs more retries — COM may not be ready
         is_frozen = getattr(sys, 'frozen', False)
@@ -95,6 +128,7 @@ class OutlookClient(MailClient):
                     print("COM connected on attempt {}".format(attempt + 1))
                 self._first_connect = False
                 self._last_connect_time = time.time()
+                self.health.success()
                 return True
             except Exception as e:
                 print("COM connect attempt {}/{} failed: {}".format(
@@ -106,16 +140,24 @@ class OutlookClient(MailClient):
         
         self._first_connect = False
         self._last_connect_time = time.time()
+        self.health.failure()
         return False
 
     def reconnect(self):
         """Force a full COM reconnection (e.g. after network change)."""
+        if not self.health.ready():
+            return False  # Failed recently: wait for the breaker's next probe
         print("COM reconnect: forcing full reconnection...")
+        self._drop_events()
+        self.folder_cache.invalidate()
+        self._inbox_sync.reset()
         self.outlook = None
         self.namespace = None
         success = self.connect()
         if success:
             self.check_latest_time()
+            if self._event_params is not None:
+                self.start_events(*self._event_params)
             print("COM reconnect: success")
         else:
             print("COM reconnect: failed")
@@ -157,6 +199,73 @@ class OutlookClient(MailClient):
         except Exception:
             return
 
+    def _for_each_store(self, account_names, work):
+        """Yields work(store) for each enabled store, skipping stores that fail.
+        
+        With parallel_stores on, stores run on their own threads and results
+        come back in completion order; work must then only touch the store
+        it is given (no cached folder handles).
+        """
+        stores = list(self._get_enabled_stores(account_names))
+        if self.parallel_stores and len(stores) > 1:
+            for _, result in fan_out_stores(self.namespace, stores, work,
+                                            self.store_timeout, self.fanout_stats):
+                yield result
+            return
+        for store in stores:
+            try:
+                yield work(store)
+            except Exception:
+                continue
+
+    def _get_email_folders(self, store, account_config, use_cache=True):
+        """Returns the configured email folders for a store (falls back to its Inbox)."""
+        folders = []
+        # Check config for this account
+        if account_config and store.DisplayName in account_config:
+            conf = account_config[store.DisplayName]
+            if "email_folders" in conf and conf["email_folders"]:
+                for path in conf["email_folders"]:
+                    f = self.get_folder_by_path(store, path, use_cache)
+                    if f: folders.append(f)
+        
+        # Fallback to Inbox if no specific folders configured
+        if not folders:
+            try: folders.append(store.GetDefaultFolder(6))
+            except: pass
+        return folders
+
+    # --- Change Events ---
+    def start_events(self, account_names=None, account_config=None, listener=None):
+        """Subscribes to Outlook new-mail and folder change events.
+        
+        Must run on the thread that owns this client's COM objects.
+        listener(kind) is called for every event. Returns False if Outlook
+        events are unavailable, in which case check_new_mail keeps polling.
+        """
+        if listener:
+            self.events.add_listener(listener)
+        self._event_params = (account_names, account_config)
+        if not self.connect():
+            return False
+        self._drop_events()
+        source = OutlookEventSource(self, self.events)
+        if source.subscribe(account_names, account_config):
+            self._event_source = source
+            return True
+        return False
+
+    def _on_folder_event(self, kind, store_id=None):
+        if kind == "folders":
+            self.folder_cache.invalidate(store_id)
+        elif kind == "accounts":
+            self._inbox_sync.reset()  # Drops the caches of removed stores too
+
+    def _drop_events(self):
+        if self._event_source:
+            self._event_source.unsubscribe()
+            self._event_source = None
+
     def check_latest_time(self, account_names=None):
         """Updates the globally tracked last_received_time from enabled accounts using safe Tables."""
         if not self.namespace: return
@@ -166,21 +275,9 @@ class OutlookClient(MailClient):
         try:
             for store in self._get_enabled_stores(account_names):
                 try:
-                    inbox = store.GetDefaultFolder(6)
-                    # Use Table to avoid traversing MailItem objects (Security Guard)
-                    table = inbox.GetTable()
-                    table.Sort("ReceivedTime", True) # Descending
-                    table.Columns.RemoveAll()
-                    table.Columns.Add("ReceivedTime")
-                    
-                    if not table.EndOfTable:
-                        row = table.GetNextRow()
-                        if row:
-                            # Use GetValues for safety
-                            vals = row.GetValues()
-                            t = vals[0]
-                            if latest is None or t > latest:
-                                latest = t
+                    t = self._get_latest_received(store)
+                    if t is not None and (latest is None or t > latest):
+                        latest = t
                 except:
                     continue
                     
@@ -190,8 +287,29 @@ class OutlookClient(MailClient):
         except Exception:
              pass
 
+    def _get_latest_received(self, store):
+        """Returns the newest ReceivedTime in the store's Inbox (None if empty)."""
+        inbox = store.GetDefaultFolder(6)
+        # Use Table to avoid traversing MailItem objects (Security Guard)
+        table = inbox.GetTable()
+        table.Sort("ReceivedTime", True) # Descending
+        table.Columns.RemoveAll()
+        table.Columns.Add("ReceivedTime")
+        
+        for vals in iter_table_rows(table, limit=1):
+            return vals[0]
+        return None
+
     def check_new_mail(self, account_names=None):
-        """Checks for new mail across enabled accounts using safe Tables."""
+        """Checks for new mail across enabled accounts.
+        
+        When Outlook events are subscribed this just reports whether any
+        arrived; the table scan below only runs as a periodic fallback.
+        """
+        if not self.events.poll_due():
+            return bool(self.events.drain())
+        events_seen = bool(self.events.drain())
+
         for attempt in range(2):
             if not self.namespace:
                 if not self.connect(): return False
@@ -207,26 +325,15 @@ class OutlookClient(MailClient):
                 
                 for store in self._get_enabled_stores(account_names):
                     try:
-                        inbox = store.GetDefaultFolder(6)
-                        # Use Table for security safety
-                        table = inbox.GetTable()
-                        table.Sort("ReceivedTime", True)
-                        table.Columns.RemoveAll()
-                        table.Columns.Add("ReceivedTime")
-                        
-                        if not table.EndOfTable:
-                            row = table.GetNextRow()
-                            if row:
-                                vals = row.GetValues()
-                                current_time = vals[0]
-                                # Compare against our global max
-                                if self.last_received_time and current_time > self.last_received_time:
-                                    # print(f"DEBUG: Found NEW mail! {current_time} > {self.last_received_time}")
-                                    found_new = True
-                                
-                                # Update local tracker for this poll
-                                if global_max is None or current_time > global_max:
-                                    global_max = current_time
+                        current_time = self._get_latest_received(store)
+                        if current_time is not None:
+                            # Compare against our global max
+                            if self.last_received_time and current_time > self.last_received_time:
+                                found_new = True
+                            
+                            # Update local tracker for this poll
+                            if global_max is None or current_time > global_max:
+                                global_max = current_time
                     except Exception as e:
                         # print(f"DEBUG: Error checking store: {e}")
                         continue
@@ -234,7 +341,7 @@ class OutlookClient(MailClient):
                 if global_max:
                     self.last_received_time = global_max
                     
-                return found_new
+                return found_new or events_seen
                 
             except Exception as e:
                 print("Polling error (Attempt {}): {}".format(attempt+1, e))
@@ -250,36 +357,59 @@ class OutlookClient(MailClient):
             
         for store in self._get_enabled_stores(account_names):
             try:
-                folders_to_scan = []
-                # Check config
-                if account_config and store.DisplayName in account_config:
-                    conf = account_config[store.DisplayName]
-                    if "email_folders" in conf and conf["email_folders"]:
-                        for path in conf["email_folders"]:
-                            f = self.get_folder_by_path(store, path)
-                            if f: folders_to_scan.append(f)
-                
-                # Fallback to Inbox
-                if not folders_to_scan:
-                    try: folders_to_scan.append(store.GetDefaultFolder(6))
-                    except: pass
-                    
-                for f in folders_to_scan:
+                for f in self._get_email_folders(store, account_config):
                     try: total += f.UnReadItemCount
                     except: pass
             except: continue
         return total
 
-    def get_folder_by_path(self, store, folder_path):
-        """Helper to navigate folder path string (e.g. 'Inbox/Subfolder')."""
+    def get_folder_by_path(self, store, folder_path, use_cache=True):
+        """Helper to navigate folder path string (e.g. 'Inbox/Subfolder').
+        
+        Resolved folders are cached per (StoreID, path) for a few minutes, or
+        until a folder event or reconnect (in any client) invalidates them. Pass use_cache=False from other COM
+        apartments (the cached objects belong to this client's thread).
+        """
+        if not use_cache:
+            try:
+                curr = store.GetRootFolder()
+                for p in folder_path.split("/"):
+                    curr = curr.Folders[p]
+                return curr
+            except:
+                return None
+        try:
+            store_id = store.StoreID
+        except:
+            return None
+        cached = self.folder_cache.get_folder(store_id, folder_path)
+        if cached is not MISSING:
+            return cached
+
         try:
-            parts = folder_path.split("/")
             curr = store.GetRootFolder()
-            for p in parts:
+        except:
+            return None  # Store unreachable; don't cache, retry next time
+        try:
+            for p in folder_path.split("/"):
                 curr = curr.Folders[p]
-            return curr
         except:
-            return None
+            return None  # Not cached: the folder may be created later
+        self.folder_cache.put_folder(store_id, folder_path, curr)
+        return curr
+
+    def _get_store_by_id(self, store_id):
+        """Returns the store with the given StoreID (cached after the first lookup)."""
+        store = self.folder_cache.get_store(store_id)
+        if store is not MISSING:
+            return store
+        store = None
+        for s in self.namespace.Stores:
+            sid = s.StoreID
+            self.folder_cache.put_store(sid, s)
+            if sid == store_id:
+                store = s
+        return store
 
     def get_calendar_items(self, start_dt, end_dt, account_names=None):
         """Fetches calendar items from all enabled accounts. Accepts datetime objects."""
@@ -299,45 +429,9 @@ class OutlookClient(MailClient):
                 s_str = start_dt.strftime('%d/%m/%Y %H:%M')
                 e_str = end_dt.strftime('%d/%m/%Y %H:%M')
                 
-                for store in self._get_enabled_stores(account_names):
-                    try:
-                        cal = store.GetDefaultFolder(9)
-                        items = cal.Items
-                        items.Sort("[Start]")
-                        items.IncludeRecurrences = True
-                        
-                        restrict = "[Start] >= '{}' AND [Start] <= '{}'".format(s_str, e_str)
-                        
-                        try:
-                            items = items.Restrict(restrict)
-                        except Exception as e:
-                            print("Restrict Warning: {}".format(e))
-                            pass
-                        
-                        for item in items:
-                            try:
-                                # Manual Date Check (Safety Net against locale issues)
-                                # Normalize Item Start (Aware/Naive)
-                                i_start = item.Start
-                                if getattr(i_start, "tzinfo", None) is not None:
-                                     i_start = i_start.replace(tzinfo=None) # Make naive for comparison with our naive start_dt/end_dt
-                                
-                                if i_start < start_dt or i_start > end_dt:
-                                     continue
-
-                                all_results.append({
-                                    "subject": item.Subject,
-                                    "start": item.Start,
-                                    "location": getattr(item, "Location", ""),
-                                    "entry_id": item.EntryID,
-                                    "is_meeting": True,
-                                    "response_status": getattr(item, "ResponseStatus", 0),
-                                    "account": store.DisplayName # Optional: Track source
-                                })
-                            except:
-                                continue
-                    except:
-                        continue
+                for store_items in self._for_each_store(
+                        account_names, lambda store: self._calendar_items_for_store(store, start_dt, end_dt, s_str, e_str)):
+                    all_results.extend(store_items)
                         
                 # Sort merged results by start time
                 try:
@@ -351,6 +445,47 @@ class OutlookClient(MailClient):
                 self.namespace = None
         return []
 
+    def _calendar_items_for_store(self, store, start_dt, end_dt, s_str, e_str):
+        """Calendar items of one store between start_dt and end_dt."""
+        results = []
+        cal = store.GetDefaultFolder(9)
+        items = cal.Items
+        items.Sort("[Start]")
+        items.IncludeRecurrences = True
+        
+        restrict = "[Start] >= '{}' AND [Start] <= '{}'".format(s_str, e_str)
+        
+        try:
+            items = items.Restrict(restrict)
+        except Exception as e:
+            print("Restrict Warning: {}".format(e))
+            pass
+        
+        account = store.DisplayName
+        for item in items:
+            try:
+                # Manual Date Check (Safety Net against locale issues)
+                # Normalize Item Start (Aware/Naive)
+                i_start = item.Start
+                if getattr(i_start, "tzinfo", None) is not None:
+                     i_start = i_start.replace(tzinfo=None) # Make naive for comparison with our naive start_dt/end_dt
+                
+                if i_start < start_dt or i_start > end_dt:
+                     continue
+
+                results.append(EventItem(
+                    subject=item.Subject,
+                    start=item.Start,
+                    location=getattr(item, "Location", ""),
+                    entry_id=item.EntryID,
+                    response_status=getattr(item, "ResponseStatus", 0),
+                    account=account, # Optional: Track source
+                    store_id=store.StoreID,
+                ))
+            except:
+                continue
+        return results
+
     def get_tasks(self, due_filters=None, account_names=None):
         """Fetches Outlook Tasks from enabled accounts using safe Tables."""
         for attempt in range(2):
@@ -359,70 +494,9 @@ class OutlookClient(MailClient):
             try:
                 all_results = []
                 
-                for store in self._get_enabled_stores(account_names):
-                    try:
-                        tasks_folder = store.GetDefaultFolder(13)
-                        
-                        restricts = ["[Complete] = False"]
-                        
-                        # Date Filter Logic
-                        if due_filters and len(due_filters) > 0:
-                            date_queries = []
-                            now = datetime.now()
-                            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-                            tomorrow = today + timedelta(days=1)
-                            db_tomorrow = today + timedelta(days=2)
-                            
-                            for filter_name in due_filters:
-                                if filter_name == "Overdue":
-                                    date_queries.append("[DueDate] < '{}'".format(today.strftime('%d/%m/%Y %H:%M'))) 
-                                elif filter_name == "Today":
-                                    date_queries.append("([DueDate] >= '{}' AND [DueDate] < '{}')".format(today.strftime('%d/%m/%Y %H:%M'), tomorrow.strftime('%d/%m/%Y %H:%M')))
-                                elif filter_name == "Tomorrow":
-                                    date_queries.append("([DueDate] >= '{}' AND [DueDate] < '{}')".format(tomorrow.strftime('%d/%m/%Y %H:%M'), db_tomorrow.strftime('%d/%m/%Y %H:%M')))
-                                elif filter_name == "Next 7 Days":
-                                    next_week = today + timedelta(days=8)
-                                    date_queries.append("([DueDate] >= '{}' AND [DueDate] < '{}')".format(today.strftime('%d/%m/%Y %H:%M'), next_week.strftime('%d/%m/%Y %H:%M')))
-                                elif filter_name == "No Date":
-                                    date_queries.append("[DueDate] = ''")
-                            
-                            if date_queries:
-                                combined_date_query = " OR ".join(date_queries)
-                                restricts.append("({})".format(combined_date_query))
-
-                        restrict_str = " AND ".join(restricts) if restricts else ""
-                        
-                        try:
-                            table = tasks_folder.GetTable(restrict_str) if restrict_str else tasks_folder.GetTable()
-                        except:
-                            continue
-
-                        table.Columns.RemoveAll()
-                        table.Columns.Add("Subject")
-                        table.Columns.Add("DueDate")
-                        table.Columns.Add("EntryID")
-                        
-                        count = 0
-                        while not table.EndOfTable and count < 30:
-                            row = table.GetNextRow()
-                            if not row: break
-                            
-                            try:
-                                vals = row.GetValues()
-                                
-                                all_results.append({
-                                    "subject": vals[0],
-                                    "due": vals[1],
-                                    "entry_id": vals[2],
-                                    "is_task": True,
-                                    "account": store.DisplayName,
-                                    "store_id": store.StoreID
-                                })
-                                count += 1
-                            except:
-                                continue
-                    except:
-                        continue # Skip store if tasks failed
+                for store_items in self._for_each_store(
+                        account_names, lambda store: self._tasks_for_store(store, due_filters)):
+                    all_results.extend(store_items)
                         
                 # Sort combined results
                 all_results.sort(key=lambda x: x["due"].timestamp() if getattr(x["due"], 'timestamp', None) else 0)
@@ -433,6 +507,61 @@ class OutlookClient(MailClient):
                 self.namespace = None
         return []
 
+    def _tasks_for_store(self, store, due_filters):
+        """Open tasks of one store matching the due-date filters (max 30)."""
+        tasks_folder = store.GetDefaultFolder(13)
+
+        restricts = ["[Complete] = False"]
+
+        # Date Filter Logic
+        if due_filters and len(due_filters) > 0:
+            date_queries = []
+            now = datetime.now()
+            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            tomorrow = today + timedelta(days=1)
+            db_tomorrow = today + timedelta(days=2)
+
+            for filter_name in due_filters:
+                if filter_name == "Overdue":
+                    date_queries.append("[DueDate] < '{}'".format(today.strftime('%d/%m/%Y %H:%M'))) 
+                elif filter_name == "Today":
+                    date_queries.append("([DueDate] >= '{}' AND [DueDate] < '{}')".format(today.strftime('%d/%m/%Y %H:%M'), tomorrow.strftime('%d/%m/%Y %H:%M')))
+                elif filter_name == "Tomorrow":
+                    date_queries.append("([DueDate] >= '{}' AND [DueDate] < '{}')".format(tomorrow.strftime('%d/%m/%Y %H:%M'), db_tomorrow.strftime('%d/%m/%Y %H:%M')))
+                elif filter_name == "Next 7 Days":
+                    next_week = today + timedelta(days=8)
+                    date_queries.append("([DueDate] >= '{}' AND [DueDate] < '{}')".format(today.strftime('%d/%m/%Y %H:%M'), next_week.strftime('%d/%m/%Y %H:%M')))
+                elif filter_name == "No Date":
+                    date_queries.append("[DueDate] = ''")
+
+            if date_queries:
+                combined_date_query = " OR ".join(date_queries)
+                restricts.append("({})".format(combined_date_query))
+
+        restrict_str = " AND ".join(restricts) if restricts else ""
+
+        try:
+            table = tasks_folder.GetTable(restrict_str) if restrict_str else tasks_folder.GetTable()
+        except:
+            return []
+
+        table.Columns.RemoveAll()
+        table.Columns.Add("Subject")
+        table.Columns.Add("DueDate")
+        table.Columns.Add("EntryID")
+
+        account, store_id = store.DisplayName, store.StoreID
+        results = []
+        for vals in iter_table_rows(table, limit=30):
+            results.append(TaskItem(
+                subject=vals[0],
+                due=vals[1],
+                entry_id=vals[2],
+                account=account,
+                store_id=store_id,
+            ))
+        return results
+
     def get_inbox_items(self, count=20, unread_only=False, only_flagged=False, due_filters=None, account_names=None, account_config=None):
         """Fetches items from configured folders for enabled accounts."""
         for attempt in range(2):
@@ -448,44 +577,24 @@ class OutlookClient(MailClient):
                 all_items = []
                 total_unread_count = 0
                 
-                for store in self._get_enabled_stores(account_names):
-                    try:
-                        # Determine folders to scan
-                        folders_to_scan = []
-                        
-                        # Check config for this account
-                        if account_config and store.DisplayName in account_config:
-                            conf = account_config[store.DisplayName]
-                            if "email_folders" in conf and conf["email_folders"]:
-                                for path in conf["email_folders"]:
-                                    f = self.get_folder_by_path(store, path)
-                                    if f: folders_to_scan.append(f)
-                        
-                        # Fallback to Inbox if no specific folders configured
-                        if not folders_to_scan:
-                            try:
-                                folders_to_scan.append(store.GetDefaultFolder(6))
-                            except: pass
-                            
-                        for folder in folders_to_scan:
-                             try:
-                                 total_unread_count += folder.UnReadItemCount
-                             except: pass
-                             items = self._fetch_items_from_inbox_folder(folder, count, unread_only, only_flagged, due_filters, store)
-                             all_items.extend(items)
-                    except:
-                        continue
-                        
-                # Sort merged results by ReceivedTime (Descending)
-                def sort_key(x):
-                    dt = x.get("received_dt")
-                    if dt:
-                        return dt
-                    return datetime.min
-
-                all_items.sort(key=sort_key, reverse=True)
+                parallel = self.parallel_stores
+                def work(store):
+                    streams, unread = self._inbox_streams_for_store(
+                        store, count, unread_only, only_flagged, due_filters, account_config,
+                        use_cache=not parallel)
+                    if parallel:
+                        # Table rows must be read in the worker's apartment
+                        streams = [merge_top_n(streams, count)]
+                    return streams, unread
+
+                streams = []
+                for store_streams, unread in self._for_each_store(account_names, work):
+                    streams.extend(store_streams)
+                    total_unread_count += unread
                 
-                return all_items[:count], total_unread_count
+                # Each folder is already newest-first: merge and stop at count
+                all_items = merge_top_n(streams, count)
+                return all_items, total_unread_count
                 
             except Exception as e:
                 self._log_debug("Inbox error: {}".format(e))
@@ -493,6 +602,39 @@ class OutlookClient(MailClient):
                 
         return [], 0
 
+    def _inbox_streams_for_store(self, store, count, unread_only, only_flagged, due_filters,
+                                 account_config, use_cache=True):
+        """Returns (streams, unread_count) for one store's configured folders.
+        
+        Each stream yields that folder's items newest first (see _folder_item_stream).
+        """
+        streams = []
+        unread = 0
+        for folder in self._get_email_folders(store, account_config, use_cache):
+            try:
+                unread += folder.UnReadItemCount
+            except: pass
+            streams.append(self._folder_item_stream(
+                folder, store, count, unread_only, only_flagged, due_filters))
+        return streams, unread
+
+    def _folder_item_stream(self, folder, store, count, unread_only, only_flagged, due_filters):
+        """Returns an iterator over one folder's top items, newest first.
+        
+        Uses the incremental cache when possible; otherwise rows are read
+        lazily from the folder's table, so a merge that never gets this far
+        down the folder never reads them.
+        """
+        synced = None
+        if self.incremental_sync and not only_flagged:
+            try:
+                synced = self._inbox_sync.sync_folder(self, folder, store, unread_only)
+            except Exception as e:
+                self._log_debug("Inbox sync error: {}".format(e))
+        if synced is not None:
+            return iter(synced[:count])
+        return self._iter_inbox_folder(folder, count, unread_only, only_flagged, due_filters, store)
+
     def _log_debug(self, msg):
         """Log debug messages to AppData for troubleshooting frozen builds."""
         try:
@@ -504,8 +646,8 @@ class OutlookClient(MailClient):
         except:
             pass
 
-    def _fetch_items_from_inbox_folder(self, folder, count, unread_only, only_flagged, due_filters, store):
-        """Helper to fetch items from a single inbox folder."""
+    def _build_inbox_restrict(self, unread_only, only_flagged, due_filters):
+        """Builds the Restrict string for an inbox folder view."""
         restricts = []
         
         if only_flagged:
@@ -539,10 +681,76 @@ class OutlookClient(MailClient):
         elif not only_flagged:
             # Limit scan to recent 7 days (skip when fetching flagged items,
             # since those use Jet-style filters which can't mix with DASL)
-            cutoff = (datetime.now() - timedelta(days=7)).strftime('%m/%d/%Y %H:%M')
+            cutoff = (datetime.now() - timedelta(days=INBOX_RECENT_DAYS)).strftime('%m/%d/%Y %H:%M')
             restricts.append("@SQL=\"urn:schemas:httpmail:datereceived\" >= '{}'".format(cutoff))
         
-        restrict_str = " AND ".join(restricts) if restricts else ""
+        return " AND ".join(restricts) if restricts else ""
+
+    def _prepare_inbox_table(self, table, with_modified=False):
+        """Replaces the table's columns with the ones _row_to_item expects."""
+        # Remove all columns and add only what we need
+        # NOTE: "Body" is NOT supported by the Table API and causes
+        # GetValues() to fail with "The parameter is incorrect".
+        table.Columns.RemoveAll()
+        table.Columns.Add("EntryID")
+        table.Columns.Add("Subject")
+        table.Columns.Add("SenderName")
+        table.Columns.Add("ReceivedTime")
+        table.Columns.Add("UnRead")
+        table.Columns.Add("FlagStatus")
+        try: table.Columns.Add("MessageClass")
+        except: pass
+        try: table.Columns.Add("http://schemas.microsoft.com/mapi/proptag/0x0E1B000B")  # PR_HASATTACH - real attachments only
+        except: pass
+        try: table.Columns.Add("Importance")
+        except: pass
+        try: table.Columns.Add("FlagRequest")
+        except: pass
+        try: table.Columns.Add("TaskDueDate")
+        except: pass
+        if with_modified:
+            # Always last so the optional columns above keep their positions
+            table.Columns.Add("LastModificationTime")
+        # NOTE: PR_PREVIEW (0x3FD9001F) was tried here but causes GetValues()
+        # to fail for every row, just like Body. Preview text is fetched
+        # lazily per-item in the rendering code instead.
+
+    def _row_to_item(self, vals, store_info):
+        """Converts one row of a _prepare_inbox_table table to a MailItem.
+        
+        store_info is (StoreID, DisplayName), read once per table rather
+        than per row.
+        """
+        # EntryID=0, Subject=1, Sender=2, Recv=3, UnRead=4, Flag=5, Class=6, HasAttach=7, Importance=8, FlagReq=9, TaskDue=10, Modified=11
+        
+        # Filter out Non-Mail items if possible (e.g. Meeting Requests/Responses often clog inbox)
+        msg_class = vals[6] if len(vals) > 6 else "IPM.Note"
+        has_attach = vals[7] if len(vals) > 7 else False
+        importance = vals[8] if len(vals) > 8 else 1
+        flag_request = vals[9] if len(vals) > 9 else ""
+        task_due = vals[10] if len(vals) > 10 else None
+        modified = vals[11] if len(vals) > 11 else None
+        
+        return MailItem(
+            entry_id=vals[0],
+            subject=vals[1],
+            sender=vals[2],
+            received=vals[3],
+            unread=vals[4],
+            flag_status=vals[5],
+            has_attachments=bool(has_attach),
+            importance=importance,
+            flag_request=flag_request or "",
+            due_date=task_due,
+            modified=modified,  # Keys the preview cache
+            is_meeting_request="IPM.Schedule" in str(msg_class),
+            store_id=store_info[0], # Needed for actions
+            account=store_info[1],
+        )
+
+    def _iter_inbox_folder(self, folder, count, unread_only, only_flagged, due_filters, store):
+        """Yields up to count items from a single inbox folder, newest first."""
+        restrict_str = self._build_inbox_restrict(unread_only, only_flagged, due_filters)
         
         try:
             # Log the restriction string for debugging
@@ -551,73 +759,15 @@ class OutlookClient(MailClient):
             # Table approach for safety and speed
             table = folder.GetTable(restrict_str) if restrict_str else folder.GetTable()
             table.Sort("ReceivedTime", True)
+            self._prepare_inbox_table(table, with_modified=True)
             
-            # Remove all columns and add only what we need
-            # NOTE: "Body" is NOT supported by the Table API and causes
-            # GetValues() to fail with "The parameter is incorrect".
-            table.Columns.RemoveAll()
-            table.Columns.Add("EntryID")
-            table.Columns.Add("Subject")
-            table.Columns.Add("SenderName")
-            table.Columns.Add("ReceivedTime")
-            table.Columns.Add("UnRead")
-            table.Columns.Add("FlagStatus")
-            try: table.Columns.Add("MessageClass")
-            except: pass
-            try: table.Columns.Add("http://schemas.microsoft.com/mapi/proptag/0x0E1B000B")  # PR_HASATTACH - real attachments only
-            except: pass
-            try: table.Columns.Add("Importance")
-            except: pass
-            try: table.Columns.Add("FlagRequest")
-            except: pass
-            try: table.Columns.Add("TaskDueDate")
-            except: pass
-            # NOTE: PR_PREVIEW (0x3FD9001F) was tried here but causes GetValues()
-            # to fail for every row, just like Body. Preview text is fetched
-            # lazily per-item in the rendering code instead.
-            
-            items = []
-            c = 0
-            while not table.EndOfTable and c < count:
-                try:
-                    row = table.GetNextRow()
-                    if not row: break
-                    
-                    vals = row.GetValues()
-                    # EntryID=0, Subject=1, Sender=2, Recv=3, UnRead=4, Flag=5, Class=6, HasAttach=7, Importance=8, FlagReq=9, TaskDue=10
-                    
-                    # Filter out Non-Mail items if possible (e.g. Meeting Requests/Responses often clog inbox)
-                    msg_class = vals[6] if len(vals) > 6 else "IPM.Note"
-                    has_attach = vals[7] if len(vals) > 7 else False
-                    importance = vals[8] if len(vals) > 8 else 1
-                    flag_request = vals[9] if len(vals) > 9 else ""
-                    task_due = vals[10] if len(vals) > 10 else None
-                    
-                    items.append({
-                        "entry_id": vals[0],
-                        "subject": vals[1],
-                        "sender": vals[2],
-                        "received_dt": vals[3],
-                        "unread": vals[4],
-                        "flag_status": vals[5],
-                        "has_attachments": bool(has_attach),
-                        "importance": importance,
-                        "flag_request": flag_request or "",
-                        "due_date": task_due,
-                        "preview": "",
-                        "is_meeting_request": "IPM.Schedule" in str(msg_class),
-                        "store_id": store.StoreID, # Needed for actions
-                        "account": store.DisplayName
-                    })
-                    c += 1
-                except Exception as row_err:
-                    self._log_debug("Fetch row error: {}".format(row_err))
-                    continue
-                
-            return items
+            store_info = (store.StoreID, store.DisplayName)
+            for item in iter_table_rows(table, limit=count, first_block=10,
+                                        decode=lambda vals: self._row_to_item(vals, store_info)):
+                yield item
         except Exception as e:
-            self._log_debug("Fetch error ({}): {}".format(folder.Name, e))
-            return []
+            # A failing folder just ends its stream; the merge carries on
+            self._log_debug("Fetch error: {}".format(e))
 
     def get_folder_list(self, account_name=None):
         """Returns a recursive list of folder paths for selection."""
@@ -675,9 +825,9 @@ class OutlookClient(MailClient):
         if not self.namespace:
             if not self.connect(): return None
         try:
-            for store in self.namespace.Stores:
-                if store.StoreID == store_id:
-                    return self.get_folder_by_path(store, folder_path)
+            store = self._get_store_by_id(store_id)
+            if store is not None:
+                return self.get_folder_by_path(store, folder_path)
         except Exception as e:
             print("Error finding folder '{}' in store: {}".format(folder_path, e))
         return None
@@ -903,10 +1053,9 @@ class OutlookClient(MailClient):
                     table.Columns.Add("FullName")
                     table.Columns.Add("Email1Address")
                     
-                    while not table.EndOfTable and len(results) < max_results:
-                        row = table.GetNextRow()
-                        if not row: break
-                        vals = row.GetValues()
+                    for vals in iter_table_rows(table):
+                        if len(results) >= max_results:
+                            break
                         name = vals[0] or ""
                         email = vals[1] or ""
                         
@@ -992,59 +1141,146 @@ class OutlookClient(MailClient):
         
         # Check calendar — any items today?
         try:
-            s_str = today.strftime('%d/%m/%Y %H:%M')
-            e_str = tomorrow.strftime('%d/%m/%Y %H:%M')
-            
             for store in self._get_enabled_stores(account_names):
-                try:
-                    cal = store.GetDefaultFolder(9)
-                    items = cal.Items
-                    items.Sort("[Start]")
-                    items.IncludeRecurrences = True
-                    restrict = "[Start] >= '{}' AND [Start] <= '{}'".format(s_str, e_str)
-                    filtered = items.Restrict(restrict)
-                    # Just check if any exist
-                    if filtered.Count > 0:
-                        result["calendar"] = "Today"
-                        break
-                except:
-                    continue
+                if self._store_has_meetings_today(store, today, tomorrow):
+                    result["calendar"] = "Today"
+                    break
         except:
             pass
         
         # Check tasks — any overdue or due today?
         try:
             for store in self._get_enabled_stores(account_names):
-                try:
-                    tasks_folder = store.GetDefaultFolder(13)
-                    
-                    # Check overdue first (higher priority)
-                    overdue_q = "[Complete] = False AND [DueDate] < '{}'".format(
-                        today.strftime('%d/%m/%Y %H:%M'))
-                    try:
-                        table = tasks_folder.GetTable(overdue_q)
-                        if not table.EndOfTable:
-                            result["tasks"] = "Overdue"
-                            break
-                    except:
-                        pass
-                    
-                    # Check today
-                    today_q = "[Complete] = False AND [DueDate] >= '{}' AND [DueDate] < '{}'".format(
-                        today.strftime('%d/%m/%Y %H:%M'),
-                        tomorrow.strftime('%d/%m/%Y %H:%M'))
-                    try:
-                        table = tasks_folder.GetTable(today_q)
-                        if not table.EndOfTable:
-                            result["tasks"] = "Today"
-                            break
-                    except:
-                        pass
-                except:
-                    continue
+                status = self._store_task_status(store, today, tomorrow)
+                if status:
+                    result["tasks"] = status
+                    break
+        except:
+            pass
+        
+        return result
+
+    def _store_has_meetings_today(self, store, today, tomorrow):
+        """True if the store's default calendar has anything starting today."""
+        try:
+            s_str = today.strftime('%d/%m/%Y %H:%M')
+            e_str = tomorrow.strftime('%d/%m/%Y %H:%M')
+            cal = store.GetDefaultFolder(9)
+            items = cal.Items
+            items.Sort("[Start]")
+            items.IncludeRecurrences = True
+            restrict = "[Start] >= '{}' AND [Start] <= '{}'".format(s_str, e_str)
+            filtered = items.Restrict(restrict)
+            # Just check if any exist
+            return filtered.Count > 0
+        except:
+            return False
+
+    def _store_task_status(self, store, today, tomorrow):
+        """Returns "Overdue", "Today" or None for the store's open tasks."""
+        try:
+            tasks_folder = store.GetDefaultFolder(13)
+        except:
+            return None
+        
+        # Check overdue first (higher priority)
+        overdue_q = "[Complete] = False AND [DueDate] < '{}'".format(
+            today.strftime('%d/%m/%Y %H:%M'))
+        try:
+            table = tasks_folder.GetTable(overdue_q)
+            if not table.EndOfTable:
+                return "Overdue"
         except:
             pass
         
+        # Check today
+        today_q = "[Complete] = False AND [DueDate] >= '{}' AND [DueDate] < '{}'".format(
+            today.strftime('%d/%m/%Y %H:%M'),
+            tomorrow.strftime('%d/%m/%Y %H:%M'))
+        try:
+            table = tasks_folder.GetTable(today_q)
+            if not table.EndOfTable:
+                return "Today"
+        except:
+            pass
+        return None
+
+    def get_poll_snapshot(self, account_names=None, account_config=None, inbox_query=None):
+        """Collects new-mail state, unread total, pulse status and (optionally)
+        the inbox items in a single pass over each enabled store.
+        
+        Each store's folders are resolved once and shared by every check.
+        While Outlook events are live, new mail comes from the event queue and
+        the Inbox table is only read on the fallback interval.
+        """
+        result = {"has_new": False, "unread_count": 0,
+                  "due_status": {"calendar": None, "tasks": None}, "emails": None}
+
+        for attempt in range(2):
+            if not self.namespace:
+                if not self.connect(): return result
+
+            if not self.is_connected():
+                print("COM connection stale in get_poll_snapshot, reconnecting...")
+                if not self.reconnect(): return result
+
+            try:
+                scan_latest = self.events.poll_due()
+                has_new = bool(self.events.drain())
+                global_max = self.last_received_time
+
+                unread = 0
+                due_status = {"calendar": None, "tasks": None}
+                now = datetime.now()
+                today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+                tomorrow = today + timedelta(days=1)
+
+                q = dict(inbox_query or {})
+                count = q.get("count", 20)
+                streams = [] if inbox_query is not None else None
+
+                for store in self._get_enabled_stores(account_names):
+                    try:
+                        # 1. New mail (Inbox high-water mark)
+                        if scan_latest:
+                            current_time = self._get_latest_received(store)
+                            if current_time is not None:
+                                if self.last_received_time and current_time > self.last_received_time:
+                                    has_new = True
+                                if global_max is None or current_time > global_max:
+                                    global_max = current_time
+
+                        # 2. Unread total and items from the same folder handles
+                        for folder in self._get_email_folders(store, account_config):
+                            try: unread += folder.UnReadItemCount
+                            except: pass
+                            if streams is not None:
+                                streams.append(self._folder_item_stream(
+                                    folder, store, count, q.get("unread_only", False),
+                                    q.get("only_flagged", False), q.get("due_filters")))
+
+                        # 3. Pulse (stop checking once the strongest state is known)
+                        if due_status["calendar"] is None and self._store_has_meetings_today(store, today, tomorrow):
+                            due_status["calendar"] = "Today"
+                        if due_status["tasks"] is None:
+                            due_status["tasks"] = self._store_task_status(store, today, tomorrow)
+                    except Exception:
+                        continue
+
+                if global_max:
+                    self.last_received_time = global_max
+                emails = None
+                if streams is not None:
+                    emails = merge_top_n(streams, count)
+
+                result.update(has_new=has_new, unread_count=unread,
+                              due_status=due_status, emails=emails)
+                return result
+
+            except Exception as e:
+                print("Polling error (Attempt {}): {}".format(attempt+1, e))
+                self.namespace = None
+
         return result
 
     def get_due_status(self, due_date):
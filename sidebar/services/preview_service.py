@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Background preview-text fetching for email cards.
+
+Reading item.Body / item.HTMLBody costs a full item open per card, so cards
+ask the PreviewService instead. Cached text is returned straight away;
+anything else is fetched as a background job (a few at a time so previews
+never crowd out polls) and handed to the card's callback when it arrives.
+
+Text is cached in an LRU keyed by (EntryID, LastModificationTime), so an
+edited message gets a fresh preview and unchanged cards never refetch. The
+cache can optionally be persisted to disk between sessions.
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+from sidebar.services.preview_text import html_to_preview, text_to_preview
+
+# Cached previews (entries, not bytes; each is capped by preview_text limits)
+PREVIEW_CACHE_SIZE = 500
+# Preview jobs in flight at once
+PREVIEW_CONCURRENCY = 2
+
+
+def extract_preview_text(item):
+    """Returns cleaned-up preview text for an Outlook item ("" if none)."""
+    if item is None:
+        return ""
+    body_text = ""
+    try:
+        body_text = text_to_preview(item.Body or "")
+    except Exception:
+        pass
+    # If plain body is too short, try extracting from HTML
+    if len(body_text) < 30:
+        try:
+            text = html_to_preview(item.HTMLBody or "")
+            if len(text) > len(body_text):
+                body_text = text
+        except Exception:
+            pass
+    return body_text
+
+
+def preview_key(email):
+    """Cache key for an email dict: (entry_id, modification time as text)."""
+    modified = email.get("modified")
+    return (email.get("entry_id"), str(modified) if modified is not None else "")
+
+
+class PreviewCache:
+    """Size-bounded LRU of preview text, optionally backed by a JSON file."""
+
+    def __init__(self, max_entries=PREVIEW_CACHE_SIZE, disk_path=None):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self._entries = OrderedDict()
+        self._dirty = False
+        self.stats = {"hits": 0, "misses": 0}
+        if disk_path:
+            self.load()
+
+    def get(self, key):
+        text = self._entries.get(key)
+        if text is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return text
+
+    def put(self, key, text):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self):
+        try:
+            with open(self.disk_path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+            for eid, modified, text in rows[-self.max_entries:]:
+                self._entries[(eid, modified)] = text
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print("[Preview] Ignored unreadable cache: {}".format(e))
+
+    def save(self):
+        """Writes the cache to disk (no-op without a disk_path or changes)."""
+        if not self.disk_path or not self._dirty:
+            return
+        try:
+            tmp = self.disk_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump([[k[0], k[1], v] for k, v in self._entries.items()], f)
+            os.replace(tmp, self.disk_path)
+            self._dirty = False
+        except Exception as e:
+            print("[Preview] Cache save failed: {}".format(e))
+
+
+class PreviewService:
+    """Serves preview text from the cache, fetching misses in the background.
+
+    submit(kind, job, callback) schedules job(client) and calls
+    callback(snapshot) on the Tk thread (SidebarWindow._run_job). All other
+    methods must be called from the Tk thread.
+    """
+
+    def __init__(self, submit, cache=None, concurrency=PREVIEW_CONCURRENCY):
+        self._submit = submit
+        self.cache = cache if cache is not None else PreviewCache()
+        self.concurrency = concurrency
+        self._pending = OrderedDict()   # key -> (entry_id, store_id) not yet submitted
+        self._waiters = {}              # key -> [callback(text)]
+        self._fetching = set()          # keys submitted and not yet back
+        self.stats = {"fetches": 0, "errors": 0}
+
+    def request(self, email, callback):
+        """Returns cached text, or None and calls callback(text) once it's fetched."""
+        key = preview_key(email)
+        if not key[0]:
+            return None
+        text = self.cache.get(key)
+        if text is not None:
+            return text
+
+        self._waiters.setdefault(key, []).append(callback)
+        if key not in self._pending and key not in self._fetching:
+            self._pending[key] = (email.get("entry_id"), email.get("store_id"))
+        self._dispatch()
+        return None
+
+    def forget_callbacks(self):
+        """Drops all waiting callbacks (the cards were rebuilt); queued fetches
+        nobody asks for again are skipped."""
+        self._waiters.clear()
+        self._pending.clear()
+
+    def _dispatch(self):
+        while len(self._fetching) < self.concurrency and self._pending:
+            key, (entry_id, store_id) = self._pending.popitem(last=False)
+            self._fetching.add(key)
+            self.stats["fetches"] += 1
+
+            def job(client, eid=entry_id, sid=store_id):
+                return extract_preview_text(client.get_item_by_entryid(eid, sid))
+
+            self._submit("preview:{}".format(entry_id), job,
+                         lambda snap, k=key: self._on_fetched(k, snap))
+
+    def _on_fetched(self, key, snap):
+        self._fetching.discard(key)
+        if snap.error is not None:
+            self.stats["errors"] += 1
+            text = ""
+        else:
+            text = snap.data or ""
+            self.cache.put(key, text)
+        for callback in self._waiters.pop(key, []):
+            try:
+                callback(text)
+            except Exception as e:
+                print("[Preview] Callback error: {}".format(e))
+        self._dispatch()
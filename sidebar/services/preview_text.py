@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Turns message bodies into a few lines of preview text.
+
+The HTML path streams the body through html.parser in chunks, skipping
+style/script/head content, breaking lines at block elements and dropping
+bare URLs. It stops as soon as it has max_lines visible lines (or max_chars
+characters), so a multi-megabyte newsletter costs about the same as a short
+note. The plain-text path walks lines lazily with the same limits.
+"""
+
+import re
+from html.parser import HTMLParser
+
+PREVIEW_MAX_LINES = 12
+PREVIEW_MAX_CHARS = 2000
+
+# Characters of HTML fed to the parser per step
+_CHUNK_SIZE = 2048
+
+_URL_RE = re.compile(r'https?://\S+')
+_SPACE_RE = re.compile(r'[ \t\r\f\v\u00a0]+')
+
+# Content of these is never shown
+_SKIP_TAGS = frozenset(("style", "script", "head", "title", "noscript", "template", "svg", "xml"))
+# These start or end a visual line
+_BLOCK_TAGS = frozenset((
+    "p", "div", "br", "tr", "li", "ul", "ol", "table", "h1", "h2", "h3", "h4",
+    "h5", "h6", "blockquote", "pre", "hr", "section", "article", "header",
+    "footer", "center", "dt", "dd",
+))
+
+
+class _PreviewParser(HTMLParser):
+    def __init__(self, max_lines, max_chars):
+        super().__init__(convert_charrefs=True)
+        self.max_lines = max_lines
+        self.max_chars = max_chars
+        self.lines = []
+        self.chars = 0
+        self.done = False
+        self._parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self._skip = 0  # Recover from an unclosed <head>
+        elif tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.end_line()
+        elif tag in ("td", "th"):
+            self._parts.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.end_line()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            if self._skip:
+                self._skip -= 1
+        elif tag in _BLOCK_TAGS:
+            self.end_line()
+
+    def handle_data(self, data):
+        if not self._skip and not self.done:
+            self._parts.append(data)
+
+    def end_line(self):
+        if not self._parts or self.done:
+            return
+        text = _URL_RE.sub('', "".join(self._parts))
+        self._parts = []
+        text = " ".join(text.split())
+        if not text:
+            return
+        self.lines.append(text)
+        self.chars += len(text) + 1
+        if len(self.lines) >= self.max_lines or self.chars >= self.max_chars:
+            self.done = True
+
+
+def html_to_preview(html, max_lines=PREVIEW_MAX_LINES, max_chars=PREVIEW_MAX_CHARS):
+    """Returns up to max_lines lines of visible text from an HTML body."""
+    if not html:
+        return ""
+    parser = _PreviewParser(max_lines, max_chars)
+    try:
+        for start in range(0, len(html), _CHUNK_SIZE):
+            parser.feed(html[start:start + _CHUNK_SIZE])
+            if parser.done:
+                break
+        else:
+            parser.close()
+    except Exception:
+        pass  # Malformed markup: keep whatever was extracted so far
+    parser.end_line()
+    return "\n".join(parser.lines[:max_lines])[:max_chars]
+
+
+def text_to_preview(text, max_lines=PREVIEW_MAX_LINES, max_chars=PREVIEW_MAX_CHARS):
+    """Returns up to max_lines non-empty lines of a plain-text body, URLs removed."""
+    if not text:
+        return ""
+    lines = []
+    chars = 0
+    pos = 0
+    end = len(text)
+    while pos < end and len(lines) < max_lines and chars < max_chars:
+        nl = text.find("\n", pos)
+        if nl < 0:
+            nl = end
+        line = _SPACE_RE.sub(" ", _URL_RE.sub("", text[pos:nl])).strip()
+        pos = nl + 1
+        if line:
+            lines.append(line)
+            chars += len(line) + 1
+    return "\n".join(lines)[:max_chars]
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Runs per-store Outlook work on parallel threads.
+
+A slow store (online-mode shared mailbox, archive PST on a network share)
+otherwise sets the latency of every fetch, because the stores are visited one
+after the other. fan_out_stores() gives each store its own thread with its
+own COM apartment. The calling thread's Namespace is marshalled into each
+worker through CoMarshalInterThreadInterfaceInStream, so no COM object is used
+outside the apartment that owns it.
+
+Results are yielded as they arrive. A store that hasn't answered by the
+deadline is skipped (its thread is left to finish on its own) so one hung
+store can't block the list. Until that thread ends the store is skipped by
+later calls too: a hung store keeps at most one worker (and apartment), and
+two workers never sync the same store's folders at once.
+"""
+
+import queue
+import threading
+import time
+
+# Seconds to wait for all stores before giving up on the stragglers
+STORE_FETCH_TIMEOUT = 10
+
+# StoreID -> the worker thread still running for it (from this or an earlier call)
+_live_workers = {}
+_live_lock = threading.Lock()
+
+
+def _store_worker(stream, store_id, work, results):
+    import pythoncom
+    import win32com.client
+
+    pythoncom.CoInitialize()
+    namespace = store = None
+    try:
+        namespace = win32com.client.Dispatch(
+            pythoncom.CoGetInterfaceAndReleaseStream(stream, pythoncom.IID_IDispatch))
+        for s in namespace.Stores:
+            if s.StoreID == store_id:
+                store = s
+                break
+        if store is None:
+            raise LookupError("Store not found in worker")
+        results.put((store_id, work(store), None))
+    except Exception as e:
+        results.put((store_id, None, e))
+    finally:
+        with _live_lock:
+            if _live_workers.get(store_id) is threading.current_thread():
+                del _live_workers[store_id]
+        # Release this apartment's proxies before tearing it down
+        namespace = store = None
+        try:
+            pythoncom.CoUninitialize()
+        except Exception:
+            pass
+
+
+def fan_out_stores(namespace, stores, work, timeout=STORE_FETCH_TIMEOUT, stats=None):
+    """Runs work(store) for each store on its own thread.
+
+    stores are the caller's Store objects (only their StoreID and DisplayName
+    are read here); work receives the worker's own Store proxy. Yields
+    (store_id, result) per store that finished in time; failures are logged
+    and skipped, and so are stores whose previous worker is still running.
+    stats (a dict) collects "completed", "errors", "timeouts" and "busy".
+    Must be called on the thread that owns namespace.
+    """
+    import pythoncom
+
+    if stats is None:
+        stats = {}
+    results = queue.Queue()
+    names = {}
+    for store in stores:
+        try:
+            store_id = store.StoreID
+            name = store.DisplayName
+        except Exception as e:
+            print("[StoreFanout] Could not read store: {}".format(e))
+            continue
+        with _live_lock:
+            previous = _live_workers.get(store_id)
+            if previous is not None and previous.is_alive():
+                stats["busy"] = stats.get("busy", 0) + 1
+                print("[StoreFanout] {} still busy with an earlier fetch, skipped".format(name))
+                continue
+        try:
+            stream = pythoncom.CoMarshalInterThreadInterfaceInStream(
+                pythoncom.IID_IDispatch, namespace._oleobj_)
+        except Exception as e:
+            print("[StoreFanout] Could not marshal store: {}".format(e))
+            continue
+        names[store_id] = name
+        worker = threading.Thread(target=_store_worker, args=(stream, store_id, work, results),
+                                  name="StoreFetch", daemon=True)
+        with _live_lock:
+            _live_workers[store_id] = worker
+        worker.start()
+    pending = set(names)
+    deadline = time.time() + timeout
+    while pending:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        try:
+            store_id, result, error = results.get(timeout=min(remaining, 0.1))
+        except queue.Empty:
+            # Keep this apartment responsive (e.g. event sinks) while waiting
+            try: pythoncom.PumpWaitingMessages()
+            except Exception: pass
+            continue
+        pending.discard(store_id)
+        if error is not None:
+            stats["errors"] = stats.get("errors", 0) + 1
+            print("[StoreFanout] {} failed: {}".format(names.get(store_id), error))
+            continue
+        stats["completed"] = stats.get("completed", 0) + 1
+        yield store_id, result
+
+    for store_id in pending:
+        stats["timeouts"] = stats.get("timeouts", 0) + 1
+        print("[StoreFanout] {} timed out after {}s, skipped".format(names.get(store_id), timeout))
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""k-way merge of already-sorted item streams with a top-N cutoff.
+
+Every folder (and every backend) already returns its items sorted, so the
+combined list doesn't need a full sort: a heap merge (heapq.merge) pulls one
+item at a time from whichever stream is ahead and stops after N. Streams are
+consumed lazily, so a folder whose items never make the top N stops being
+read after its first block.
+"""
+
+import heapq
+from datetime import datetime
+from itertools import islice
+
+
+def _naive(dt):
+    if dt is not None and getattr(dt, "tzinfo", None) is not None:
+        return dt.replace(tzinfo=None)
+    return dt
+
+
+def received_key(item):
+    """Sort key for mail items (MailItem.received)."""
+    return _naive(item.received) or datetime.min
+
+
+def start_key(item):
+    """Sort key for calendar items (EventItem.start)."""
+    return _naive(item.start) or datetime.min
+
+
+def merge_top_n(streams, n=None, key=received_key, reverse=True):
+    """Merges sorted iterables into one sorted list of at most n items.
+
+    Each stream must already be sorted the same way (newest first with the
+    default reverse=True); n=None merges everything.
+    """
+    merged = heapq.merge(*streams, key=key, reverse=reverse)
+    if n is not None:
+        merged = islice(merged, n)
+    return list(merged)
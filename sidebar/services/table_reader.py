@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Block reads for Outlook Table objects.
+
+Reading a Table with GetNextRow() + GetValues() costs two cross-process COM
+calls per row. Table.GetArray(n) returns the next n rows (rows x columns) in
+a single call, so iter_table_rows() pulls rows in blocks and yields them one
+by one. It is a generator, so callers that stop early (top-N, first match)
+only pay for the blocks they touched.
+
+If GetArray fails for a table (some column types can't be marshalled in
+bulk) the remaining rows are read the old per-row way.
+"""
+
+# Rows per GetArray call
+READ_BLOCK_SIZE = 100
+
+
+def iter_table_rows(table, limit=None, block_size=READ_BLOCK_SIZE, decode=None, first_block=None):
+    """Yields each remaining row of a prepared Table as a tuple of column values.
+
+    limit caps the number of rows read (and shrinks the first block to match).
+    first_block starts with smaller blocks that double up to block_size, for
+    streams that will probably be abandoned early (e.g. one input of a merge).
+    decode(values) is applied to each row if given; rows it raises on are skipped.
+    """
+    remaining = limit
+    bulk = True
+    size = first_block or block_size
+
+    while remaining is None or remaining > 0:
+        if table.EndOfTable:
+            return
+        n = size if remaining is None else min(size, remaining)
+        size = min(size * 2, block_size)
+
+        if bulk:
+            try:
+                block = table.GetArray(n)
+            except Exception:
+                bulk = False
+                continue
+            if not block:
+                return
+            rows = block
+        else:
+            row = table.GetNextRow()
+            if not row:
+                return
+            try:
+                rows = (row.GetValues(),)
+            except Exception:
+                continue
+
+        for values in rows:
+            if decode is not None:
+                try:
+                    values = decode(values)
+                except Exception:
+                    continue
+            yield values
+            if remaining is not None:
+                remaining -= 1
+                if remaining <= 0:
+                    return
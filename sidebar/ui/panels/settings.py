@@ -266,6 +266,18 @@ class SettingsPanel(tk.Frame):
             from sidebar.services.graph_auth import GraphAuth
             GraphAuth().logout()
             update_auth_ui()
+
+        def do_graph_add_account():
+            try:
+                from sidebar.services.graph_auth import GraphAuth
+                email = GraphAuth().add_account()
+                if email:
+                    update_auth_ui()
+                    tk.messagebox.showinfo("Account Added", "Signed in: {}".format(email))
+                else:
+                    tk.messagebox.showerror("Sign in Failed", "Could not obtain an access token.")
+            except Exception as e:
+                tk.messagebox.showerror("Sign in Failed", str(e))
             
         self.btn_login = tk.Button(
             backend_row2, text="Sign in", command=do_graph_login,
@@ -278,24 +290,33 @@ class SettingsPanel(tk.Frame):
             bg=self.colors["bg_card"], fg="#FF4444",
             font=("Segoe UI", 9), relief="raised", bd=1
         )
+
+        self.btn_add_account = tk.Button(
+            backend_row2, text="Add account", command=do_graph_add_account,
+            bg=self.colors["bg_card"], fg=self.colors["fg_text"],
+            font=("Segoe UI", 9), relief="raised", bd=1
+        )
         
         def update_auth_ui():
             if self.backend_var.get() == "com":
                 self.btn_login.pack_forget()
                 self.btn_logout.pack_forget()
+                self.btn_add_account.pack_forget()
                 self.auth_info_lbl.config(text="")
                 backend_row2.pack_forget()
             else:
                 backend_row2.pack(fill="x", padx=(20, 20), pady=(5, 0))
                 from sidebar.services.graph_auth import GraphAuth
                 auth = GraphAuth()
-                email = auth.get_current_user_email()
-                if email:
+                emails = auth.get_account_names()
+                if emails:
                     self.btn_login.pack_forget()
-                    self.auth_info_lbl.config(text="Signed in: {}".format(email), fg="#60CDFF")
+                    self.auth_info_lbl.config(text="Signed in: {}".format(", ".join(emails)), fg="#60CDFF")
                     self.btn_logout.pack(side="right")
+                    self.btn_add_account.pack(side="right", padx=(0, 5))
                 else:
                     self.btn_logout.pack_forget()
+                    self.btn_add_account.pack_forget()
                     self.auth_info_lbl.config(text="Not signed in", fg="#FF4444")
                     self.btn_login.pack(side="right")
                     
@@ -468,6 +489,13 @@ class SettingsPanel(tk.Frame):
                  pass
         self.cb_lines['postcommand'] = configure_lines_dropdown
 
+        # Number of emails fetched (cards are only built for the visible ones)
+        tk.Label(lines_frame, text="Emails:", bg=self.colors["bg_root"], fg=self.colors["fg_secondary"], font=("Segoe UI", 10)).pack(side="left", padx=(10, 0))
+        self.email_count_var = tk.StringVar(value=str(self.main_window.config.email_count))
+        self.cb_email_count = ttk.Combobox(lines_frame, textvariable=self.email_count_var, values=["30", "100", "250", "500", "1000"], width=5, state="readonly", font=("Segoe UI", 8))
+        self.cb_email_count.pack(side="left", padx=5)
+        self.cb_email_count.bind("<<ComboboxSelected>>", self.update_email_filters)
+
         # "Show Content on Hover" - inside the content frame
         self.show_hover_content_var = tk.BooleanVar(value=self.main_window.config.show_hover_content)
         tk.Checkbutton(self.email_content_frame, text="Show Content on Hover", 
@@ -1057,6 +1085,9 @@ class SettingsPanel(tk.Frame):
              lines = int(self.email_body_lines_var.get())
              self.main_window.config.email_body_lines = lines
         except: pass
+        try:
+             self.main_window.config.email_count = int(self.email_count_var.get())
+        except: pass
         
         self.main_window.save_config()
         self.main_window.refresh_emails()
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
 from sidebar.core.compat import tk, ttk
 
 class ScrollableFrame(tk.Frame):
@@ -104,6 +107,256 @@ class ScrollableFrame(tk.Frame):
         self.config(**kwargs)
 
 
+class RowLayout:
+    """
+    Heights and top offsets of the rows of a VirtualList.
+    Rows not measured yet count as the average measured height (or the estimate).
+    """
+    def __init__(self, estimate=80):
+        self.estimate = estimate
+        self._heights = []      # None = not measured yet
+        self._offsets = None    # offsets[i] = top of row i, offsets[-1] = total height
+        self._measured_sum = 0
+        self._measured_count = 0
+
+    def reset(self, heights):
+        """Starts over with one entry per row (a known height or None)."""
+        self._heights = list(heights)
+        known = [h for h in self._heights if h is not None]
+        self._measured_sum = sum(known)
+        self._measured_count = len(known)
+        self._offsets = None
+
+    def __len__(self):
+        return len(self._heights)
+
+    def _default(self):
+        if self._measured_count:
+            return self._measured_sum // self._measured_count
+        return self.estimate
+
+    def height(self, index):
+        h = self._heights[index]
+        return self._default() if h is None else h
+
+    def measured(self, index):
+        return self._heights[index]
+
+    def measure(self, index, height):
+        """Records a row's real height. Returns True if the layout changed."""
+        old = self._heights[index]
+        if old == height:
+            return False
+        if old is None:
+            self._measured_count += 1
+        else:
+            self._measured_sum -= old
+        self._measured_sum += height
+        self._heights[index] = height
+        self._offsets = None
+        return True
+
+    def remove(self, index):
+        h = self._heights.pop(index)
+        if h is not None:
+            self._measured_sum -= h
+            self._measured_count -= 1
+        self._offsets = None
+
+    def offsets(self):
+        if self._offsets is None:
+            default = self._default()
+            self._offsets = [0] + list(accumulate(default if h is None else h for h in self._heights))
+        return self._offsets
+
+    def top(self, index):
+        return self.offsets()[index]
+
+    def total(self):
+        return self.offsets()[-1]
+
+    def visible(self, y0, y1, overscan=0):
+        """(first, stop) indexes of the rows intersecting y0..y1, plus overscan rows each side."""
+        offsets = self.offsets()
+        count = len(self._heights)
+        first = max(0, bisect_right(offsets, y0) - 1 - overscan)
+        stop = min(count, bisect_left(offsets, y1) + overscan)
+        return first, max(first, stop)
+
+
+class VirtualList(ScrollableFrame):
+    """
+    A scrollable list that only creates widgets for the rows in view.
+
+    Rows are canvas windows placed at offsets from RowLayout; rows scrolled
+    out of view go back to a pool and are filled with the next item that
+    scrolls in, so a list of thousands of items keeps a screenful of widgets.
+    create_row(parent) makes an empty row, bind_row(row, item) fills it.
+    """
+    def __init__(self, container, *args, estimate_height=80, overscan=3, gap=4, **kwargs):
+        ScrollableFrame.__init__(self, container, *args, **kwargs)
+        # Rows live on the canvas itself, not in scrollable_frame
+        self.canvas.delete(self.window_id)
+        self.overscan = overscan
+        self.gap = gap                  # Space between rows (and around them)
+        self.layout = RowLayout(estimate_height)
+        self.items = []
+        self._rows = {}                 # index -> (row, canvas window id)
+        self._pool = []                 # (row, canvas window id), hidden
+        self._create_row = None
+        self._bind_row = None
+        self._key = None
+        self._known = {}                # key -> measured height
+        self._job = None
+        self._busy = False
+        self._again = False
+        self._region = None
+        self._width = 1
+
+        on_view = self._on_scroll_update if self._auto_hide else self.scrollbar.set
+        def view_changed(first, last):
+            on_view(first, last)
+            self._schedule()
+        self.canvas.configure(yscrollcommand=view_changed)
+
+    # --- Items ---
+    def set_items(self, items, create_row, bind_row, key=None, reset=False):
+        """
+        Shows items, reusing the row widgets already made unless reset
+        (e.g. the settings the rows were built with changed).
+        key(item) identifies an item across calls so its height is kept.
+        """
+        for index in list(self._rows):
+            self._release(index)
+        if reset:
+            for row, _ in self._pool:
+                row.destroy()
+            self._pool = []
+            self.canvas.delete("row")
+            self._known = {}
+        self.items = list(items)
+        self._create_row = create_row
+        self._bind_row = bind_row
+        self._key = key
+        known = self._known
+        heights = [known.get(key(item)) for item in self.items] if key else [None] * len(self.items)
+        self._known = {key(item): h for item, h in zip(self.items, heights) if h is not None} if key else {}
+        self.layout.reset(heights)
+        self.refresh()
+
+    def remove_row(self, row):
+        """Drops the item shown by a row widget (e.g. the email was deleted)."""
+        for index, (widget, _) in list(self._rows.items()):
+            if widget is row:
+                break
+        else:
+            return
+        self._release(index)
+        del self.items[index]
+        self.layout.remove(index)
+        self._rows = {i - 1 if i > index else i: entry for i, entry in self._rows.items()}
+        for i, (widget, _) in self._rows.items():
+            widget._vl_index = i
+        self.refresh()
+
+    def row_widgets(self):
+        """Every row widget, shown or pooled."""
+        return [row for row, _ in self._rows.values()] + [row for row, _ in self._pool]
+
+    # --- Layout ---
+    def _schedule(self):
+        if self._job is None:
+            self._job = self.after_idle(self.refresh)
+
+    def refresh(self):
+        """Creates/reuses the rows now in view, releases the others and places them all."""
+        if self._job is not None:
+            try: self.after_cancel(self._job)
+            except: pass
+            self._job = None
+        if self._busy:
+            # Called from the update_idletasks below: run again afterwards
+            self._again = True
+            return
+        self._busy = True
+        try:
+            for _ in range(3):  # New measurements can shift which rows are in view
+                y0 = self.canvas.canvasy(0)
+                first, stop = self.layout.visible(y0, y0 + max(self.canvas.winfo_height(), 1), self.overscan)
+                for index in [i for i in self._rows if i < first or i >= stop]:
+                    self._release(index)
+                added = [i for i in range(first, stop) if i not in self._rows]
+                for index in added:
+                    self._show(index)
+                if not added:
+                    break
+                self.canvas.update_idletasks()
+                changed = False
+                for index in added:
+                    changed = self._measure(index) or changed
+                if not changed:
+                    break
+            self._place()
+        except tk.TclError:
+            pass  # Widget destroyed
+        finally:
+            self._busy = False
+        if self._again:
+            self._again = False
+            self._schedule()
+
+    def _show(self, index):
+        if self._pool:
+            row, window = self._pool.pop()
+        else:
+            row = self._create_row(self.canvas)
+            row.bind("<Configure>", self._on_row_configure, add="+")
+            window = self.canvas.create_window(0, 0, window=row, anchor="nw", tags=("row",))
+        row._vl_index = index
+        self._bind_row(row, self.items[index])
+        self.canvas.itemconfigure(window, state="normal", width=self._row_width())
+        self.canvas.coords(window, self.gap, self.layout.top(index) + self.gap // 2)
+        self._rows[index] = (row, window)
+
+    def _release(self, index):
+        row, window = self._rows.pop(index)
+        row._vl_index = None
+        self.canvas.itemconfigure(window, state="hidden")
+        self._pool.append((row, window))
+
+    def _measure(self, index):
+        row, _ = self._rows[index]
+        height = row.winfo_reqheight() + self.gap
+        if self._key:
+            self._known[self._key(self.items[index])] = height
+        return self.layout.measure(index, height)
+
+    def _place(self):
+        for index, (row, window) in self._rows.items():
+            self.canvas.coords(window, self.gap, self.layout.top(index) + self.gap // 2)
+        region = (0, 0, self._width, self.layout.total())
+        if region != self._region:
+            self._region = region
+            self.canvas.configure(scrollregion=region)
+
+    def _row_width(self):
+        return max(1, self._width - 2 * self.gap)
+
+    def _on_row_configure(self, event):
+        # A row changed height (hover preview, wrapping): move the rows below it
+        index = getattr(event.widget, "_vl_index", None)
+        if index is None or index >= len(self.layout):
+            return
+        if self._measure(index):
+            self._schedule()
+
+    def _on_canvas_configure(self, event):
+        self._width = event.width
+        for row, window in list(self._rows.values()) + self._pool:
+            self.canvas.itemconfigure(window, width=self._row_width())
+        self._schedule()
+
+
 class RoundedFrame(tk.Canvas):
     def __init__(self, parent, width, height, corner_radius, padding, color, bg, **kwargs):
         tk.Canvas.__init__(self, parent, width=width, height=height, bg=bg, bd=0, highlightthickness=0, **kwargs)
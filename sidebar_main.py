@@ -55,6 +55,7 @@ import json
 import time
 import math
 import glob
+import re
 import ctypes
 
 try:
@@ -87,13 +88,16 @@ from sidebar.core.config import (
     DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE,
     resource_path
 )
-from sidebar.core.config_manager import ConfigManager
+from sidebar.core.config_manager import ConfigManager, CONFIG_FILE
 from sidebar.core.theme import COLOR_PALETTES, OL_CAT_COLORS
 from sidebar.core.appbar import AppBarManager, MONITORINFO, ABE_LEFT, ABE_RIGHT, ABE_TOP, ABE_BOTTOM 
 from sidebar.services.outlook_client import OutlookClient
 from sidebar.services.graph_client import GraphAPIClient
 from sidebar.services.hybrid_client import HybridMailClient
-from sidebar.ui.widgets.base import ScrollableFrame, RoundedFrame, ToolTip
+from sidebar.services.data_engine import DataEngine, Snapshot
+from sidebar.services.backend_health import breakers, OPEN
+from sidebar.services.preview_service import PreviewService, PreviewCache
+from sidebar.ui.widgets.base import ScrollableFrame, VirtualList, RoundedFrame, ToolTip
 from sidebar.ui.panels.settings import SettingsPanel
 from sidebar.ui.panels.help import HelpPanel
 from sidebar.ui.panels.account_settings import AccountSelectionDialog, AccountSelectionUI, FolderPickerFrame
@@ -211,6 +215,29 @@ class SidebarWindow(tk.Tk):
                 pass
             self.outlook_client = None
         
+        # Background data engine: fetches run on their own thread (and COM
+        # apartment) and results are rendered when they arrive. Its client is
+        # separate from self.outlook_client, which runs the item actions; the
+        # state both must agree on is process-wide (see DataEngine)
+        self.data_engine = None
+        self._reminders_pending = False
+        if self.outlook_client:
+            try:
+                self.data_engine = DataEngine(
+                    self._select_backend,
+                    uses_com=getattr(self.config, "backend", "hybrid") != "graph"
+                )
+                self.data_engine.start()
+            except Exception as e:
+                print("ERROR: Data engine failed to start, fetching inline: {}".format(e))
+                self.data_engine = None
+
+        # Email body previews: fetched in the background, cached per EntryID + modification time
+        preview_path = None
+        if getattr(self.config, "preview_disk_cache", False):
+            preview_path = os.path.join(os.path.dirname(CONFIG_FILE), "preview_cache.json")
+        self.preview_service = PreviewService(self._run_job, PreviewCache(disk_path=preview_path))
+        
         # Image Cache (to keep references alive)
         self.image_cache = {}
         self.dismissed_calendar_ids = set(getattr(self.config, 'dismissed_calendar_ids', []))
@@ -385,7 +412,7 @@ class SidebarWindow(tk.Tk):
         # ------------------
 
         
-        self.scroll_frame = ScrollableFrame(self.email_list_frame, bg=self.colors["bg_root"])
+        self.scroll_frame = VirtualList(self.email_list_frame, bg=self.colors["bg_root"])
         self.scroll_frame.pack(expand=True, fill="both")
         
         # Reminder List Setup (Initial empty state, populated in refresh_reminders)
@@ -428,6 +455,12 @@ class SidebarWindow(tk.Tk):
         self.bind("<Leave>", self.on_leave)
         self.bind("<Motion>", self.on_motion) 
 
+        # Deliver background fetch results to the UI
+        self._pump_data_engine()
+        self._mail_event_job = None
+        self._mail_event_folders = False
+        self._subscribe_mail_events()
+
         # Initial Load
         self.refresh_emails()
         
@@ -448,6 +481,9 @@ class SidebarWindow(tk.Tk):
 
     def quit_application(self):
         """Terminates the application."""
+        if self.data_engine:
+            self.data_engine.stop()
+        self.preview_service.cache.save()
         self.destroy()
         sys.exit(0)
 
@@ -606,8 +642,7 @@ class SidebarWindow(tk.Tk):
         conditional_removes = act1 in ("Mark Read", "Flag") and not self.config.show_read
         if (always_removes or conditional_removes) and source_card:
             try:
-                source_card.pack_forget()
-                source_card.destroy()
+                self.scroll_frame.remove_row(source_card)
             except: pass
             # Update header count immediately (for unread counter)
             if act1 != "Flag":
@@ -957,10 +992,16 @@ class SidebarWindow(tk.Tk):
             return GraphAPIClient()
         elif backend_pref == "com":
             print("[Backend] Using Classic Outlook COM exclusively")
-            return OutlookClient()
+            client = OutlookClient()
+            com = client
         else: # auto / hybrid
             print("[Backend] Using Hybrid Client (COM + Graph)")
-            return HybridMailClient()
+            client = HybridMailClient()
+            com = client.com
+        
+        if com is not None:
+            com.parallel_stores = bool(getattr(self.config, "parallel_store_fetch", False))
+        return client
 
     def apply_window_layout(self):
         """Apply the current window mode (single or dual) to the layout."""
@@ -1138,6 +1179,7 @@ class SidebarWindow(tk.Tk):
                     new_settings = self.account_ui_helper.get_settings()
                     self.config.enabled_accounts = new_settings
                     self.config.save()
+                    self._subscribe_mail_events()
                     self.refresh_emails()
                     self.refresh_reminders()
                     
@@ -1257,9 +1299,12 @@ class SidebarWindow(tk.Tk):
         error_str = str(exception)
         return any(kw.lower() in error_str.lower() for kw in network_keywords)
 
-    def _show_offline_bar(self):
+    def _show_offline_bar(self, text="Offline — waiting for connection"):
         """Show a subtle offline indicator bar below the header."""
         if self._offline_bar and self._offline_bar.winfo_exists():
+            try:
+                self._offline_label.config(text="\u26A0  " + text)
+            except: pass
             return  # Already showing
         
         self._is_offline = True
@@ -1270,7 +1315,7 @@ class SidebarWindow(tk.Tk):
         
         lbl = tk.Label(
             bar,
-            text="\u26A0  Offline — waiting for connection",
+            text="\u26A0  " + text,
             bg="#FFB347",
             fg="#000000",
             font=(self.config.font_family, 7, "bold"),
@@ -1279,6 +1324,7 @@ class SidebarWindow(tk.Tk):
         lbl.pack(fill="x", expand=True)
         
         self._offline_bar = bar
+        self._offline_label = lbl
 
     def _hide_offline_bar(self):
         """Remove the offline indicator bar."""
@@ -1290,607 +1336,541 @@ class SidebarWindow(tk.Tk):
                 pass
             self._offline_bar = None
 
-    def refresh_emails(self, skip_reminders=False):
-        if not self.outlook_client: return
+    def _update_health_bar(self):
+        """Shows the offline bar while a backend's circuit breaker is open; hides it once all are healthy."""
+        states = breakers()
+        down = [name for name, b in states.items() if b.state == OPEN]
         try:
-            # Update UI fonts for header elements
-            self.lbl_title.config(font=(self.font_family, 10, "bold"))
-            self.btn_settings.config(font=(self.font_family, 12))
-            self.btn_refresh.config(font=(self.font_family, 15))
+            if "graph" in down:
+                self._show_offline_bar()
+            elif down:
+                self._show_offline_bar("Outlook not responding — retrying")
+            elif self._is_offline and all(b.healthy for b in states.values()):
+                self._hide_offline_bar()
+        except: pass
 
-            # --- Anti-flicker: hide canvas content during rebuild ---
-            canvas = self.scroll_frame.canvas
-            canvas.itemconfigure(self.scroll_frame.window_id, state='hidden')
+    def _pump_data_engine(self):
+        """Hands finished background fetches to their render callbacks."""
+        if self.data_engine:
+            try:
+                self.data_engine.pump()
+            except Exception as e:
+                print("Data engine pump error: {}".format(e))
+        self.after(50, self._pump_data_engine)
 
-            # Clear existing
-            for widget in self.scroll_frame.scrollable_frame.winfo_children():
-                widget.destroy()
+    def _run_job(self, kind, job, callback):
+        """Runs job(client) on the data engine, or inline if it isn't running."""
+        if self.data_engine:
+            self.data_engine.submit(kind, job, callback)
+            return
+        start = time.perf_counter()
+        data, error = None, None
+        try:
+            data = job(self.outlook_client)
+        except Exception as e:
+            error = e
+        callback(Snapshot(kind, 0, data, error, time.perf_counter() - start))
 
-            # Determine enabled accounts
-            accounts = [n for n, s in self.config.enabled_accounts.items() if s.get("email")] if self.config.enabled_accounts else None
+    def _subscribe_mail_events(self):
+        """Hooks backend change events so new mail refreshes without waiting for the next poll."""
+        if not self.data_engine:
+            return
+        accounts = list(self.config.enabled_accounts.keys()) if self.config.enabled_accounts else None
+        account_config = self.config.enabled_accounts
+
+        def subscribe(client):
+            return client.start_events(accounts, account_config, self._post_mail_event)
+
+        self._run_job("events", subscribe, lambda snap: print(
+            "[MailEvents] Active: {}".format(bool(snap.data) and snap.error is None)))
 
+    def _post_mail_event(self, kind, store_id=None):
+        """Runs on the engine thread; hands the event over to Tk via the result queue."""
+        self.data_engine.post("mail_event", kind, self._on_mail_event)
 
-            emails, unread_count = self.outlook_client.get_inbox_items(
+    def _on_mail_event(self, snap):
+        """Debounces bursts of mail events into a single poll."""
+        if snap.data == "folders":
+            # Folder renames/moves change which folders the list resolves to
+            self._mail_event_folders = True
+        if self._mail_event_job:
+            return
+        def fire():
+            self._mail_event_job = None
+            if self._mail_event_folders:
+                self._mail_event_folders = False
+                self.refresh_emails(skip_reminders=True)
+            self._perform_check()
+        self._mail_event_job = self.after(500, fire)
 
-                count=30, 
-                unread_only=not self.config.show_read,
+    def refresh_emails(self, skip_reminders=False):
+        """Requests a fresh email list. Cards are rebuilt when the data arrives."""
+        if not self.outlook_client: return
+        if not skip_reminders:
+            self._reminders_pending = True
+
+        # Capture everything the fetch needs now; the job must not touch Tk
+        accounts = [n for n, s in self.config.enabled_accounts.items() if s.get("email")] if self.config.enabled_accounts else None
+        unread_only = not self.config.show_read
+        account_config = self.config.enabled_accounts
+        email_count = self.config.email_count
+
+        # Category Colors (cached with 5-min TTL)
+        now_ts = time.time()
+        refresh_cats = not hasattr(self, '_cat_map_cache') or now_ts - getattr(self, '_cat_map_cache_time', 0) > 300
+
+        def fetch(client):
+            emails, unread_count = client.get_inbox_items(
+                count=email_count,
+                unread_only=unread_only,
                 account_names=accounts,
-                account_config=self.config.enabled_accounts
+                account_config=account_config
             )
-            
-            # Connection succeeded — clear offline state if it was set
-            if self._is_offline:
-                self._hide_offline_bar()
+            cat_map = client.get_category_map() if refresh_cats else None
+            return {"emails": emails, "unread_count": unread_count, "cat_map": cat_map}
+
+        self._run_job("emails", fetch, self._render_emails)
+
+    def _set_preview_text(self, lp, text, fit=False):
+        """Fills a card's preview box (called when a background preview arrives)."""
+        if not text:
+            return
+        try:
+            if not lp.winfo_exists():
+                return
+            lp.config(state="normal")
+            lp.delete("1.0", "end")
+            lp.insert("1.0", text)
+            lp.config(state="disabled")
+            if fit and lp.winfo_ismapped():
+                # Hover box already open: grow it to the new content
+                lp.config(height=min(max(text.count("\n") + 1, 2), 12))
+        except tk.TclError:
+            pass
+
+    def _email_card_layout(self):
+        """Settings the email card widgets are built with (cards are rebuilt when they change)."""
+        c = self.config
+        return (c.email_show_sender, c.email_show_subject, c.email_show_body, c.show_hover_content,
+                c.buttons_on_hover, c.email_double_click, c.email_body_lines, c.show_has_attachment,
+                c.font_family, c.font_size, c.width, c.theme, repr(c.btn_config))
+
+    def _get_cached_icon(self, path, color, size=(24, 24)):
+        """Colored icon from self.image_cache (None if the file is missing)."""
+        key = (path, color, size)
+        if key not in self.image_cache:
+            if os.path.exists(path):
+                self.image_cache[key] = self.load_icon_colored(path, size=size, color=color)
+            else:
+                self.image_cache[key] = None
+        return self.image_cache[key]
+
+    def _email_badge(self, email):
+        """(text, background) of the follow-up badge, or ("", None)."""
+        due = email.due_date
+        if email.flag_status == 0 or not due:
+            return "", None
+        try:
+            # Extract date part for comparison
+            due_short = due.replace(hour=0, minute=0, second=0, microsecond=0)
+            now_short = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            if due_short.year >= 3000: # 4501 "No Date" placeholder
+                return "", None
+            diff = (due_short - now_short).days
+            if diff < 0:
+                return "OVERDUE", "#D83B01" # Dark Red/Orange
+            elif diff == 0:
+                return "DUE TODAY", "#FF8C00" # Orange
+            elif diff == 1:
+                return "TOMORROW", "#0078D4" # Blue
+            elif diff < 7:
+                return due_short.strftime("%a").upper(), "#00B7C3" # Teal
+            return due_short.strftime("%d %b").upper(), "#666666"
+        except:
+            return "", None
+
+    def _create_email_card(self, parent):
+        """Builds an empty email card; _bind_email_card fills it with an email."""
+        bg_color = self.colors["bg_card"]
+        card = tk.Frame(parent, bg=bg_color, highlightbackground=self.colors["card_border"],
+                        highlightthickness=1, padx=5, pady=5)
+        card._email = None
+        card._show_timer = None
+
+        header_frame = tk.Frame(card, bg=bg_color)
+        header_frame.pack(fill="x")
+
+        # Sender
+        lbl_sender = None
+        if self.config.email_show_sender:
+            lbl_sender = tk.Label(
+                header_frame,
+                fg=self.colors["fg_primary"],
+                bg=bg_color,
+                font=(self.config.font_family, self.config.font_size, "bold"),
+                anchor="w"
+            )
+            lbl_sender.pack(side="left", fill="x", expand=True)
+
+        # Date/Time stamp
+        lbl_time = tk.Label(
+            header_frame,
+            fg=self.colors["fg_dim"],
+            bg=bg_color,
+            font=(self.config.font_family, self.config.font_size - 1),
+            anchor="e"
+        )
+        lbl_time.pack(side="right", padx=(4, 0))
+
+        # Attachment / importance / flag / category / due indicators (filled per email)
+        indicators = tk.Frame(header_frame, bg=bg_color)
+        indicators.pack(side="right")
+
+        # Subject
+        lbl_subject = None
+        if self.config.email_show_subject:
+            lbl_subject = tk.Label(
+                card,
+                fg=self.colors["fg_secondary"],
+                bg=bg_color,
+                font=(self.config.font_family, self.config.font_size),
+                anchor="w",
+                justify="left",
+                wraplength=self.config.width - 40
+            )
+            lbl_subject.pack(fill="x")
+
+        # Preview (Body)
+        # Create if either Permanent Show OR Hover Show is enabled
+        lbl_preview = None
+        try:
+            lines = int(self.config.email_body_lines)
+        except:
+            lines = 2
+        if self.config.email_show_body or self.config.show_hover_content:
+            lbl_preview = tk.Text(
+                card,
+                height=lines,
+                bg=bg_color,
+                fg=self.colors["fg_dim"],
+                font=(self.config.font_family, self.config.font_size - 1),
+                bd=0,
+                highlightthickness=0,
+                wrap="word",
+                cursor="arrow",
+                state="disabled" # Read-only
+            )
+            if self.config.email_show_body:
+                lbl_preview.pack(fill="x")
+
+        # --- Action Frame (Buttons) ---
+        frame_buttons = tk.Frame(card, bg=bg_color)
+        # Filter for valid buttons (Must have Icon AND Action)
+        valid_buttons = [
+            conf for conf in self.config.btn_config
+            if conf.get("icon") and conf.get("action1") != "None"
+        ]
+        button_tips = []
+        for conf in valid_buttons:
+            icon = conf.get("icon", "ðŸ”˜")
+            btn_image = None
+            if icon.lower().endswith(".png"):
+                path = resource_path(os.path.join("icons", icon))
+                btn_image = self._get_cached_icon(path, color=self.colors.get("fg_text", "#FFFFFF"), size=(24, 24))
+
+            if btn_image:
+                btn = tk.Label(frame_buttons, image=btn_image, bg=bg_color, padx=10, pady=5, cursor="hand2")
+            else:
+                btn = tk.Label(
+                    frame_buttons,
+                    text=icon,
+                    fg=self.colors["fg_primary"],
+                    bg=bg_color,
+                    font=(self.config.font_family, self.config.font_size + 2),
+                    padx=10, pady=5,
+                    cursor="hand2"
+                )
+
+            if len(valid_buttons) == 1:
+                btn.pack(side="left", expand=True, fill="y", ipadx=20)
+            else:
+                btn.pack(side="left", expand=True, fill="both")
+
+            # Button Styling Bindings
+            btn.bind("<Enter>", lambda e, b=btn: b.config(bg=self.colors["bg_card_hover"]))
+            btn.bind("<Leave>", lambda e, b=btn, bg=bg_color: b.config(bg=bg))
+
+            # Tooltip text depends on the email (Flag / Un-flag), set when bound
+            button_tips.append((conf, ToolTip(btn, "")))
+
+            # Bind Action (pass card widget for instant removal)
+            btn.bind("<Button-1>", lambda e, c=conf: card._email is not None and
+                     self.handle_custom_action(c, card._email, source_card=card))
+
+        # --- Logic for Buttons Visibility ---
+        if not self.config.buttons_on_hover:
+            frame_buttons.pack(fill="x", expand=True, padx=2, pady=(0, 2))
+
+        card._sender = lbl_sender
+        card._time = lbl_time
+        card._indicators = indicators
+        card._subject = lbl_subject
+        card._preview = lbl_preview
+        card._buttons = frame_buttons
+        card._button_tips = button_tips
+
+        # --- HOVER BINDINGS (Content & Buttons) ---
+        def show_hover_elements():
+            lp = lbl_preview
+            # 1. Show Body Preview if enabled and not permanent
+            if self.config.show_hover_content and not self.config.email_show_body and lp:
+                 # Lazy-load body on first hover (cached, or filled in when fetched)
+                 em = card._email
+                 if em is not None and not getattr(lp, '_body_loaded', False):
+                     lp._body_loaded = True
+                     body_text = self.preview_service.request(
+                         em, lambda text, em=em: card._email is em and self._set_preview_text(lp, text, fit=True))
+                     if body_text:
+                         self._set_preview_text(lp, body_text)
+                 # Auto-size: count actual lines of content
+                 if not lp.winfo_ismapped():
+                      try:
+                          content = lp.get("1.0", "end-1c")
+                          line_count = max(content.count("\n") + 1, 2)
+                          hover_h = min(line_count, 12)  # Cap at 12 lines
+                      except:
+                          hover_h = 4
+                      lp.config(height=hover_h)
+                      lp.pack(fill="x", padx=5, pady=(0, 2))
+
+            # 2. Show Buttons if enabled
+            if self.config.buttons_on_hover:
+                 if not frame_buttons.winfo_ismapped():
+                      frame_buttons.pack(fill="x", expand=True, padx=2, pady=(0, 2))
+
+        def robust_hide(e):
+            # Cancel pending show
+            if card._show_timer:
+                card.after_cancel(card._show_timer)
+                card._show_timer = None
+            try:
+                x, y = card.winfo_pointerxy()
+                widget = card.winfo_containing(x, y)
+                # Stay shown if mouse is over card or any of its descendants
+                if not widget or (widget != card and not str(widget).startswith(str(card))):
+                    self._hide_email_card_hover(card)
+            except:
+                pass # Safety
+
+        def safe_show(e):
+            # Delay show to prevent flashing (Debounce)
+            if card._show_timer:
+                card.after_cancel(card._show_timer)
+            card._show_timer = card.after(250, show_hover_elements)
+
+        if (self.config.show_hover_content and not self.config.email_show_body) or self.config.buttons_on_hover:
+            card.bind("<Enter>", safe_show)
+            card.bind("<Leave>", robust_hide)
+            # Bind children to prevent flickering
+            for child in card.winfo_children():
+                child.bind("<Enter>", safe_show)
+                child.bind("<Leave>", robust_hide)
+
+        # --- CLICK LOGIC (Open Email) ---
+        def on_card_click(e):
+            if card._email is not None:
+                self.open_email(card._email['entry_id'], source_widget=card)
+
+        click = "<Double-Button-1>" if self.config.email_double_click else "<Button-1>"
+        # Buttons have their own actions
+        for widget in [card, header_frame, lbl_sender, lbl_subject, lbl_preview]:
+            if widget:
+                widget.bind(click, on_card_click)
+        if self.config.email_double_click:
+            # Single click only takes focus
+            card.bind("<Button-1>", lambda e: card.focus_set())
+
+        # Dynamic wrapping for the subject
+        def update_wraps(e):
+            if lbl_subject:
+                lbl_subject.config(wraplength=e.width - 20)
+
+        card.bind("<Configure>", update_wraps)
+        return card
+
+    def _hide_email_card_hover(self, card):
+        """Collapses a card's hover preview and buttons."""
+        lp = card._preview
+        if self.config.show_hover_content and not self.config.email_show_body and lp:
+            if lp.winfo_ismapped():
+                lp.pack_forget()
+        if self.config.buttons_on_hover:
+            if card._buttons.winfo_ismapped():
+                card._buttons.pack_forget()
+
+    def _bind_email_card(self, card, email, cat_map):
+        """Fills a card (new or reused) with one email."""
+        bg_color = self.colors["bg_card"]
+        if card._show_timer:
+            card.after_cancel(card._show_timer)
+            card._show_timer = None
+        if card._email is not None:
+            self._hide_email_card_hover(card)
+        card._email = email
+
+        # Blue border for unread, grey for read
+        is_unread = email.unread
+        card.config(highlightbackground=self.colors["accent"] if is_unread else self.colors["card_border"],
+                    highlightthickness=2 if is_unread else 1)
+
+        if card._sender:
+            # Add indicator dot for unread
+            card._sender.config(text=u"● " + email.sender if is_unread else email.sender)
+
+        recv_dt = email.received
+        time_str = ""
+        if recv_dt:
+            try: time_str = recv_dt.strftime("%d/%m/%y %H:%M")
+            except: pass
+        card._time.config(text=time_str)
+
+        # Indicators, packed right to left after the time stamp
+        indicators = card._indicators
+        for widget in indicators.winfo_children():
+            widget.destroy()
+
+        # Attachment indicator (only show if setting is enabled)
+        if email.has_attachments and self.config.show_has_attachment:
+            accent = self.colors.get("accent", "#60CDFF")
+            attach_img = self._get_cached_icon(resource_path("icon2/@.png"), accent, size=(14, 14))
+            if attach_img:
+                lbl_attachment = tk.Label(indicators, image=attach_img, bg=bg_color)
+            else:
+                lbl_attachment = tk.Label(
+                    indicators,
+                    text="@",
+                    fg=accent,
+                    bg=bg_color,
+                    font=(self.config.font_family, self.config.font_size + 1, "bold"),
+                )
+            lbl_attachment.pack(side="right", padx=(4, 2))
+            ToolTip(lbl_attachment, "Has Attachments")
+
+        # Importance Indicator (High/Low)
+        importance_val = email.importance # 0=Low, 1=Normal, 2=High (both backends)
+        if importance_val != 1:
+            lbl_importance = tk.Label(
+                indicators,
+                text="!",
+                fg="#FF5555" if importance_val == 2 else "#AAAAAA", # High = Red-ish, Low = Grey
+                bg=bg_color,
+                font=(self.config.font_family, self.config.font_size + 1, "bold"),
+            )
+            lbl_importance.pack(side="right", padx=(0, 2))
+
+        # Flag Indicator (small icon in header corner)
+        if email.flag_status != 0:
+            flag_img = self._get_cached_icon(resource_path("icon2/flag.png"), "#FF8C00", size=(14, 14))
+            if flag_img:
+                lbl_flag_icon = tk.Label(indicators, image=flag_img, bg=bg_color)
+                lbl_flag_icon.pack(side="right", padx=(2, 2))
+                ToolTip(lbl_flag_icon, "Flagged")
+
+        # Categories Indicators (COM: "A; B" string, Graph: list)
+        categories = email.categories
+        if isinstance(categories, str):
+            categories = re.split(r'[;,]', categories)
+        for cat in categories or ():
+            cat = cat.strip()
+            if not cat: continue
+            # Just the color block, with a tooltip for the name
+            lbl_cat = tk.Frame(indicators, bg=cat_map.get(cat, "#444444"), width=10, height=10)
+            lbl_cat.pack(side="right", padx=1, pady=2)
+            ToolTip(lbl_cat, cat)
+
+        badge_text, badge_bg = self._email_badge(email)
+        if badge_text:
+            lbl_badge = tk.Label(
+                indicators,
+                text=badge_text,
+                fg=self.colors["fg_primary"],
+                bg=badge_bg,
+                font=(self.config.font_family, self.config.font_size - 2, "bold"),
+                padx=6, pady=2
+            )
+            lbl_badge.pack(side="right", padx=2)
+
+        if card._subject:
+            card._subject.config(text=email.subject)
+
+        lp = card._preview
+        if lp:
+            preview_text = (email.preview or '').strip()
+            # If preview is empty and permanent body display is on, ask the
+            # preview service (cached text now, otherwise filled in when fetched)
+            if not preview_text and self.config.email_show_body:
+                preview_text = self.preview_service.request(
+                    email, lambda text: card._email is email and self._set_preview_text(lp, text)) or ""
+            # Strip empty lines for cleaner display
+            preview_text = "\n".join(line for line in preview_text.splitlines() if line.strip())
+            lp._body_loaded = False
+            lp.config(state="normal")
+            lp.delete("1.0", "end")
+            lp.insert("1.0", preview_text)
+            lp.config(state="disabled")
+
+        # Tooltip logic: show 'Un-flag' if email is already flagged
+        for conf, tip in card._button_tips:
+            act1 = conf.get("action1", "")
+            act2 = conf.get("action2", "None")
+            tip_text = "{} & {}".format(act1, act2) if act2 != "None" else act1
+            if act1 == "Flag" and email.flag_status != 0:
+                tip_text = tip_text.replace('Flag', 'Un-flag')
+            tip.text = tip_text
+
+    def _render_emails(self, snap):
+        """Shows a fetched snapshot in the email list."""
+        try:
+            if snap.error is not None:
+                raise snap.error
+            emails = snap.data["emails"]
+            unread_count = snap.data["unread_count"]
+
+            # Update UI fonts for header elements
+            self.lbl_title.config(font=(self.font_family, 10, "bold"))
+            self.btn_settings.config(font=(self.font_family, 12))
+            self.btn_refresh.config(font=(self.font_family, 15))
+
+            # Offline bar follows the backends' health (hidden once all recovered)
+            self._update_health_bar()
             
             # Update Header Count
             try:
                  self.lbl_email_header.config(text="Email - {}".format(unread_count), bg=self.colors["bg_card"], fg=self.colors["fg_text"])
             except: pass
             
-            # Fetch Category Colors (cached with 5-min TTL)
-            now_ts = time.time()
-            if not hasattr(self, '_cat_map_cache') or now_ts - getattr(self, '_cat_map_cache_time', 0) > 300:
-                self._cat_map_cache = self.outlook_client.get_category_map()
-                self._cat_map_cache_time = now_ts
-            cat_map = self._cat_map_cache
-            
-            for email in emails:
-                lbl_sender = None
-                lbl_subject = None
-                lbl_preview = None
-                
-                # Determine styling based on UnRead status
-                is_unread = email.get('unread', False)
-                bg_color = self.colors["bg_card"]
-                # Blue border for unread, grey for read
-                border_color = self.colors["accent"] if is_unread else self.colors["card_border"]
-                border_width = 2 if is_unread else 1
-                
-                # Create Card
-                card = tk.Frame(
-                    self.scroll_frame.scrollable_frame, 
-                    bg=bg_color, 
-                    highlightbackground=border_color, 
-                    highlightthickness=border_width,
-                    padx=5, pady=5
-                )
-                card.pack(fill="x", expand=True, padx=2, pady=2)
-                
-                # --- Badge System (Follow-up Indicators) ---
-                badge_text = ""
-                badge_bg = "#555555" # Default
-                
-                if email.get('flag_status', 0) != 0:
-                    due = email.get('due_date')
-                    now_dt = datetime.now()
-                    received = email.get('received')
-                    
-                    # Check for 4501 "No Date"
-                    is_real_due = False
-                    if due:
-                        try:
-                            # Extract date part for comparison
-                            due_short = due.replace(hour=0, minute=0, second=0, microsecond=0)
-                            now_short = now_dt.replace(hour=0, minute=0, second=0, microsecond=0)
-                            
-                            if due_short.year < 3000: # Not the 4501 placeholder
-                                is_real_due = True
-                                diff = (due_short - now_short).days
-                                
-                                if diff < 0:
-                                    badge_text = "OVERDUE"
-                                    badge_bg = "#D83B01" # Dark Red/Orange
-                                elif diff == 0:
-                                    badge_text = "DUE TODAY"
-                                    badge_bg = "#FF8C00" # Orange
-                                elif diff == 1:
-                                    badge_text = "TOMORROW"
-                                    badge_bg = "#0078D4" # Blue
-                                elif diff < 7:
-                                    badge_text = due_short.strftime("%a").upper()
-                                    badge_bg = "#00B7C3" # Teal
-                                else:
-                                    badge_text = due_short.strftime("%d %b").upper()
-                                    badge_bg = "#666666"
-                        except:
-                            pass
-
-                    # Flag icon already indicates flagged status — no badge text needed
-
-                header_frame = tk.Frame(card, bg=bg_color)
-                header_frame.pack(fill="x")
-
-                # Sender
-                if self.config.email_show_sender:
-                    sender_text = email['sender']
-                    if is_unread:
-                        sender_text = u"● " + sender_text # Add indicator dot
-                        
-                    lbl_sender = tk.Label(
-                        header_frame, 
-                        text=sender_text, 
-                        fg=self.colors["fg_primary"], 
-                        bg=bg_color, 
-                        font=(self.config.font_family, self.config.font_size, "bold"),
-                        anchor="w"
-                    )
-                    lbl_sender.pack(side="left", fill="x", expand=True)
-
-                # Date/Time stamp
-                recv_dt = email.get('received_dt') or email.get('received')
-                if recv_dt:
-                    try:
-                        time_str = recv_dt.strftime("%d/%m/%y %H:%M")
-                        lbl_time = tk.Label(
-                            header_frame,
-                            text=time_str,
-                            fg=self.colors["fg_dim"],
-                            bg=bg_color,
-                            font=(self.config.font_family, self.config.font_size - 1),
-                            anchor="e"
-                        )
-                        lbl_time.pack(side="right", padx=(4, 0))
-                    except:
-                        pass
-
-                # Attachment indicator (only show if setting is enabled)
-                if email.get('has_attachments', False) and self.config.show_has_attachment:
-                    attach_icon_path = resource_path("icon2/@.png")
-                    attach_img = None
-                    if os.path.exists(attach_icon_path):
-                        attach_img = self.load_icon_colored(attach_icon_path, size=(14, 14), color=self.colors.get("accent", "#60CDFF"))
-                    if attach_img:
-                        lbl_attachment = tk.Label(header_frame, image=attach_img, bg=bg_color)
-                        lbl_attachment.image = attach_img
-                    else:
-                        lbl_attachment = tk.Label(
-                            header_frame, 
-                            text="@", 
-                            fg=self.colors.get("accent", "#60CDFF"), 
-                            bg=bg_color, 
-                            font=(self.config.font_family, self.config.font_size + 1, "bold"),
-                        )
-                    lbl_attachment.pack(side="right", padx=(4, 2))
-                    ToolTip(lbl_attachment, "Has Attachments")
-
-
-                # Importance Indicator (High/Low)
-                importance_val = email.get('importance', 1) # 0=Low, 1=Normal, 2=High
-                if importance_val != 1:
-                    imp_text = "!"
-                    # High = Red-ish, Low = Grey
-                    imp_fg = "#FF5555" if importance_val == 2 else "#AAAAAA" 
-                    
-                    lbl_importance = tk.Label(
-                        header_frame, 
-                        text=imp_text, 
-                        fg=imp_fg, 
-                        bg=bg_color, 
-                        font=(self.config.font_family, self.config.font_size + 1, "bold"),
-                    )
-                    lbl_importance.pack(side="right", padx=(0, 2))
-
-
-                # Flag Indicator (small icon in header corner)
-                if email.get('flag_status', 0) != 0:
-                    flag_icon_path = resource_path("icon2/flag.png")
-                    if os.path.exists(flag_icon_path):
-                        flag_img = self.load_icon_colored(flag_icon_path, size=(14, 14), color="#FF8C00")
-                        if flag_img:
-                            lbl_flag_icon = tk.Label(header_frame, image=flag_img, bg=bg_color)
-                            lbl_flag_icon.image = flag_img
-                            lbl_flag_icon.pack(side="right", padx=(2, 2))
-                            ToolTip(lbl_flag_icon, "Flagged")
-
-                # Categories Indicators
-                categories_str = email.get('categories', "")
-                if categories_str:
-                    # Split and show badges
-                    # Categories can be comma or semicolon separated
-                    cats = re.split(r'[;,]', categories_str)
-                    for cat in cats:
-                        cat = cat.strip()
-                        if not cat: continue
-                    for cat in cats:
-                        cat = cat.strip()
-                        if not cat: continue
-                        
-                        # Lookup color
-                        badge_bg = cat_map.get(cat, "#444444")
-                        if badge_bg in ["#FFF768", "#F0E16C", "#EAC389"]: # Light colors
-                            badge_fg = "#222222"
-                        else:
-                            badge_fg = "#FFFFFF"
-
-                        # Just the color block
-                        lbl_cat = tk.Frame(
-                            header_frame, 
-                            bg=badge_bg, 
-                            width=10,
-                            height=10
-                        )
-                        lbl_cat.pack(side="right", padx=1, pady=2)
-                        
-                        # Tooltip for the name
-                        ToolTip(lbl_cat, cat)
-
-                if badge_text:
-                    lbl_badge = tk.Label(
-                        header_frame, 
-                        text=badge_text, 
-                        fg=self.colors["fg_primary"], # Or white if badges are always dark? Let's use fg_primary but badges might need contrast.
-                        # Badges have colored backgrounds (Orange, Red, Blue). Text should usually be White.
-                        # Exception: Light Yellow categories.
-                        # Let's keep "white" for badge text unless we have a specific reason.
-                        # Actually self.colors["fg_primary"] is Black in Light mode. White text on Orange badge is good. Black text on Orange badge is also okay.
-                        # Let's stick to "white" for now as badge backgrounds are dark/saturated. 
-                        # Wait, code already handles logic partially.
-                        # StartLine 4694 says fg="white". I'll check if I need to change it.
-                        # For now I will leave "white" as it contrasts well with the colored badges.
-                        bg=badge_bg, 
-                        font=(self.config.font_family, self.config.font_size - 2, "bold"),
-                        padx=6, pady=2
-                    )
-                    lbl_badge.pack(side="right", padx=2)
-                    
-                # Subject
-                if self.config.email_show_subject:
-                    lbl_subject = tk.Label(
-                        card, 
-                        text=email['subject'], 
-                        fg=self.colors["fg_secondary"], 
-                        bg=bg_color, 
-                        font=(self.config.font_family, self.config.font_size),
-                        anchor="w",
-                        justify="left",
-                        wraplength=self.config.width - 40 
-                    )
-                    lbl_subject.pack(fill="x")
-                
-                # Preview (Body)
-                # Create if either Permanent Show OR Hover Show is enabled
-                lbl_preview = None
-                # Capture current body lines setting for this card
-                try: 
-                    lines = int(self.config.email_body_lines)
-                except: 
-                    lines = 2
-                    
-                if self.config.email_show_body or self.config.show_hover_content:
-                    lbl_preview = tk.Text(
-                        card, 
-                        height=lines,
-                        bg=bg_color, 
-                        fg=self.colors["fg_dim"], 
-                        font=(self.config.font_family, self.config.font_size - 1),
-                        bd=0,
-                        highlightthickness=0,
-                        wrap="word",
-                        cursor="arrow"
-                    )
-                    # Get preview text or fallback
-                    # COM client uses 'preview', Graph client uses 'body_preview'
-                    preview_text = (email.get('preview', '') or email.get('body_preview', '') or '').strip() 
-                    
-                    # If preview is empty and permanent body display is on, fetch from item
-                    if not preview_text and self.config.email_show_body:
-                        try:
-                            item = self.outlook_client.get_item_by_entryid(
-                                email.get('entry_id'), email.get('store_id'))
-                            if item:
-                                body_text = ""
-                                try: body_text = item.Body or ""
-                                except: pass
-                                if body_text:
-                                    import re
-                                    body_text = re.sub(r'^\s*https?://\S+\s*$', '', body_text, flags=re.MULTILINE)
-                                    body_text = re.sub(r'https?://\S+', '', body_text)
-                                    body_text = body_text.strip()
-                                # If plain body too short, try HTML
-                                if len(body_text.strip()) < 30:
-                                    try:
-                                        import re
-                                        html = item.HTMLBody or ""
-                                        text = re.sub(r'<a[^>]*>(.*?)</a>', r'\1', html, flags=re.DOTALL|re.IGNORECASE)
-                                        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
-                                        text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.DOTALL)
-                                        text = re.sub(r'<[^>]+>', ' ', text)
-                                        text = re.sub(r'&nbsp;', ' ', text)
-                                        text = re.sub(r'&amp;', '&', text)
-                                        text = re.sub(r'https?://\S+', '', text)
-                                        text = re.sub(r'[ \t]+', ' ', text)
-                                        text = re.sub(r'\n\s*\n', '\n', text)
-                                        text = text.strip()
-                                        if len(text) > len(body_text.strip()):
-                                            body_text = text
-                                    except: pass
-                                if body_text:
-                                    preview_text = body_text
-                        except: pass
-                    
-                    if preview_text:
-                        # Strip empty lines for cleaner display
-                        preview_text = "\n".join(line for line in preview_text.splitlines() if line.strip())
-                    else:
-                        preview_text = ""
-                    
-                    lbl_preview.insert("1.0", preview_text)
-                    lbl_preview.config(state="disabled") # Read-only
-                    
-                    # Check if we should initially pack it (Show Body = True)
-                    if self.config.email_show_body:
-                         lbl_preview.pack(fill="x")
-                
-                # Icon Cache for this refresh cycle
-                # We reuse the main cache but ensure lookups are safe
-                def get_cached_icon(path, color, size=(24,24)):
-                    key = (path, color)
-                    # Use self.image_cache (the main one)
-                    if key not in self.image_cache:
-                        if os.path.exists(path):
-                            self.image_cache[key] = self.load_icon_colored(path, size=size, color=color)
-                        else:
-                            self.image_cache[key] = None
-                    return self.image_cache[key]
-                
-                # --- Action Frame (Buttons) ---
-                # Rename locally to frame_buttons to match references
-                frame_buttons = tk.Frame(card, bg=bg_color)
-                
-                # Populate buttons first (so they exist for binding)
-                # Filter for valid buttons (Must have Icon AND Action)
-                valid_buttons = [
-                    conf for conf in self.config.btn_config 
-                    if conf.get("icon") and conf.get("action1") != "None"
-                ]
-
-                for conf in valid_buttons:
-                    icon = conf.get("icon", "ðŸ”˜")
-                    
-                    is_png = icon.lower().endswith(".png")
-                    btn_image = None
-                    
-                    if is_png:
-                        path = resource_path(os.path.join("icons", icon)) 
-                        
-                        # Let's try to map "white" to a color that works for the theme
-                        btn_color = self.colors.get("fg_text", "#FFFFFF")
-                        
-                        btn_image = get_cached_icon(path, color=btn_color, size=(24, 24))
-                    
-                    if btn_image:
-                        btn = tk.Label(
-                            frame_buttons, 
-                            image=btn_image, 
-                            bg=bg_color,
-                            padx=10, pady=5,
-                            cursor="hand2"
-                        )
-                    else:
-                        btn = tk.Label(
-                            frame_buttons, 
-                            text=icon, 
-                            fg=self.colors["fg_primary"], 
-                            bg=bg_color,
-                            font=(self.config.font_family, self.config.font_size + 2),
-                            padx=10, pady=5,
-                            cursor="hand2"
-                        )
-                    
-                    if len(valid_buttons) == 1:
-                        btn.pack(side="left", expand=True, fill="y", ipadx=20)
-                    else:
-                        btn.pack(side="left", expand=True, fill="both")
-                    
-                    # Button Styling Bindings
-                    btn.bind("<Enter>", lambda e, b=btn: b.config(bg=self.colors["bg_card_hover"]))
-                    btn.bind("<Leave>", lambda e, b=btn, bg=bg_color: b.config(bg=bg))
-                    
-                    # Tooltip logic
-                    act1 = conf.get("action1", "")
-                    act2 = conf.get("action2", "None")
-                    tip_text = "{} & {}".format(act1, act2) if act2 != "None" else act1
-                    # Show 'Un-flag' tooltip if email is already flagged
-                    if act1 == "Flag" and email.get('flag_status', 0) != 0:
-                        tip_text = tip_text.replace('Flag', 'Un-flag')
-                    ToolTip(btn, tip_text)
-                    
-                    # Bind Action (pass card widget for instant removal)
-                    btn.bind("<Button-1>", lambda e, c=conf, em=email, w=card: self.handle_custom_action(c, em, source_card=w))
-
-                # --- Logic for Buttons Visibility ---
-                if self.config.buttons_on_hover:
-                    # Start hidden
-                    frame_buttons.pack_forget()
-                else:
-                    # Always show
-                    frame_buttons.pack(fill="x", expand=True, padx=2, pady=(0, 2))
-
-
-                # --- HOVER BINDINGS (Content & Buttons) ---
-                # Define common show/hide helpers with DEFAULT ARGS to capture loop variables correctly
-                # We also capture 'lines' from the scope to ensure correct height
-                def show_hover_elements(e, lp=lbl_preview, fb=frame_buttons, h=lines, eid=email.get('entry_id'), sid=email.get('store_id')):
-                    # 1. Show Body Preview if enabled and not permanent
-                    if self.config.show_hover_content and not self.config.email_show_body and lp:
-                         # Lazy-fetch body on first hover
-                         if not getattr(lp, '_body_loaded', False):
-                             lp._body_loaded = True
-                             try:
-                                 item = self.outlook_client.get_item_by_entryid(eid, sid)
-                                 if item:
-                                     body_text = ""
-                                     try:
-                                         body_text = item.Body or ""
-                                     except: pass
-                                     # Clean up plain text body: remove standalone URLs (tracking links, etc.)
-                                     if body_text:
-                                         import re
-                                         # Remove lines that are just URLs
-                                         body_text = re.sub(r'^\s*https?://\S+\s*$', '', body_text, flags=re.MULTILINE)
-                                         # Remove inline URLs (but keep surrounding text)
-                                         body_text = re.sub(r'https?://\S+', '', body_text)
-                                         body_text = body_text.strip()
-                                     # If plain body is too short, try extracting from HTML
-                                     if len(body_text.strip()) < 30:
-                                         try:
-                                             import re
-                                             html = item.HTMLBody or ""
-                                             # Replace <a> tags with their display text (not the href URL)
-                                             text = re.sub(r'<a[^>]*>(.*?)</a>', r'\1', html, flags=re.DOTALL|re.IGNORECASE)
-                                             # Remove style blocks
-                                             text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
-                                             # Remove script blocks
-                                             text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.DOTALL)
-                                             # Strip remaining HTML tags
-                                             text = re.sub(r'<[^>]+>', ' ', text)
-                                             # Decode HTML entities
-                                             text = re.sub(r'&nbsp;', ' ', text)
-                                             text = re.sub(r'&amp;', '&', text)
-                                             text = re.sub(r'&lt;', '<', text)
-                                             text = re.sub(r'&gt;', '>', text)
-                                             text = re.sub(r'&#\d+;', '', text)
-                                             # Remove any remaining URLs
-                                             text = re.sub(r'https?://\S+', '', text)
-                                             # Collapse whitespace
-                                             text = re.sub(r'[ \t]+', ' ', text)
-                                             text = re.sub(r'\n\s*\n', '\n', text)
-                                             text = text.strip()
-                                             if len(text) > len(body_text.strip()):
-                                                 body_text = text
-                                         except: pass
-                                     if body_text:
-                                         # Strip empty lines
-                                         body_text = "\n".join(line for line in body_text.strip().splitlines() if line.strip())
-                                         lp.config(state="normal")
-                                         lp.delete("1.0", "end")
-                                         lp.insert("1.0", body_text)
-                                         lp.config(state="disabled")
-                             except Exception as ex:
-                                 print("Hover body fetch error: {}".format(ex))
-                         # Auto-size: count actual lines of content
-                         if not lp.winfo_ismapped():
-                              try:
-                                  content = lp.get("1.0", "end-1c")
-                                  line_count = max(content.count("\n") + 1, 2)
-                                  hover_h = min(line_count, 12)  # Cap at 12 lines
-                              except:
-                                  hover_h = 4
-                              lp.config(height=hover_h) 
-                              lp.pack(fill="x", padx=5, pady=(0, 2)) 
-                    
-                    # 2. Show Buttons if enabled
-                    if self.config.buttons_on_hover:
-                         if not fb.winfo_ismapped():
-                              fb.pack(fill="x", expand=True, padx=2, pady=(0, 2))
-                
-                def hide_hover_elements(e, lp=lbl_preview, fb=frame_buttons):
-                    # 1. Hide Body Preview
-                    if self.config.show_hover_content and not self.config.email_show_body and lp:
-                         if lp.winfo_ismapped():
-                              lp.pack_forget()
-                    
-                    # 2. Hide Buttons
-                    if self.config.buttons_on_hover:
-                         if fb.winfo_ismapped():
-                              fb.pack_forget()
-
-                
-                # Robust Hide Logic using winfo_containing
-                def robust_hide(e, c=card, lp=lbl_preview, fb=frame_buttons):
-                    # Cancel pending show
-                    if hasattr(c, "_show_timer") and c._show_timer:
-                        c.after_cancel(c._show_timer)
-                        c._show_timer = None
-                    
-                    try:
-                        x, y = c.winfo_pointerxy()
-                        widget = c.winfo_containing(x, y)
-                        # Stay shown if mouse is over card or any of its descendants
-                        if not widget or (widget != c and not str(widget).startswith(str(c))):
-                            hide_hover_elements(e, lp, fb)
-                    except:
-                        pass # Safety
-                
-                def safe_show(e, c=card, lp=lbl_preview, fb=frame_buttons, _shf=show_hover_elements):
-                     # Delay show to prevent flashing (Debounce)
-                     if hasattr(c, "_show_timer") and c._show_timer:
-                         c.after_cancel(c._show_timer)
-                     c._show_timer = c.after(250, lambda: _shf(e, lp, fb))
-
-                # Apply Bindings
-                if (self.config.show_hover_content and not self.config.email_show_body) or self.config.buttons_on_hover:
-                    card.bind("<Enter>", safe_show)
-                    card.bind("<Leave>", robust_hide)
-                    
-                    # Bind children to prevent flickering
-                    for child in card.winfo_children():
-                        child.bind("<Enter>", safe_show)
-                        child.bind("<Leave>", robust_hide)
-                
-                # Standard Click (Open Email) logic for card
-                # --- CLICK LOGIC (Open Email) ---
-                def on_card_click(e, eid=email['entry_id'], w=card):
-                    self.open_email(eid, source_widget=w)
-
-                # Apply Click Bindings
-                if self.config.email_double_click: 
-                     card.bind("<Double-Button-1>", on_card_click)
-                     card.bind("<Button-1>", lambda e, c=card: c.focus_set())
-                else:
-                     card.bind("<Button-1>", on_card_click)
-                
-                # Bind Children (Robustly)
-                for child in card.winfo_children():
-                     # Don't bind click to buttons (they have their own actions)
-                     if child != frame_buttons and getattr(child, "master", None) != frame_buttons:
-                        if self.config.email_double_click: 
-                            child.bind("<Double-Button-1>", on_card_click)
-                        else:
-                            child.bind("<Button-1>", on_card_click)
-                     # Preview text click -> Open Email
-                     if child == lbl_preview:
-                          if self.config.email_double_click: 
-                              child.bind("<Double-Button-1>", on_card_click)
-                          else:
-                              child.bind("<Button-1>", on_card_click)
-
-                
-                if self.config.email_double_click: 
-                      # Logic handled by bind_click helper inside loop (Wait, bind_click isn't shown here)
-                      # Assuming bind_click handles double click check or we need to add it.
-                      # The loop continues...
-                     card.bind("<Double-Button-1>", on_card_click)
-                     if lbl_sender: lbl_sender.bind("<Double-Button-1>", on_card_click)
-                     if lbl_subject: lbl_subject.bind("<Double-Button-1>", on_card_click)
-                     if lbl_preview: lbl_preview.bind("<Double-Button-1>", on_card_click)
-                     
-                     # Optional: Single click handles focus or selection
-                     card.bind("<Button-1>", lambda e: card.focus_set())
-                else:
-                     # Standard Single Click
-                     card.bind("<Button-1>", on_card_click)
-                     if lbl_sender: lbl_sender.bind("<Button-1>", on_card_click)
-                     if lbl_subject: lbl_subject.bind("<Button-1>", on_card_click)
-                     if lbl_preview: lbl_preview.bind("<Button-1>", on_card_click) 
-                
-                # Dynamic wrapping for both labels
-                def update_wraps(e, s=lbl_subject, p=lbl_preview):
-                    width = e.width - 20
-                    if s:
-                        s.config(wraplength=width)
-                    # Only wrap if it's a Label (Text widgets handle wrapping internally)
-                    if p and isinstance(p, tk.Label):
-                        p.config(wraplength=width)
-                    
-                card.bind("<Configure>", update_wraps)
-
-            # --- Anti-flicker: reveal rebuilt content in one step ---
-            canvas.itemconfigure(self.scroll_frame.window_id, state='normal')
-            canvas.configure(scrollregion=canvas.bbox('all'))
+            if snap.data["cat_map"] is not None:
+                self._cat_map_cache = snap.data["cat_map"]
+                self._cat_map_cache_time = time.time()
+            cat_map = getattr(self, '_cat_map_cache', {})
+
+            # Only the cards in view exist; they are reused as the list scrolls
+            # and across refreshes, unless a setting they were built with changed
+            layout = self._email_card_layout()
+            reset = layout != getattr(self, "_email_card_layout_key", None)
+            self._email_card_layout_key = layout
+            self.preview_service.forget_callbacks()
+            self.scroll_frame.set_items(
+                emails,
+                create_row=self._create_email_card,
+                bind_row=lambda card, email: self._bind_email_card(card, email, cat_map),
+                key=lambda email: email.get("entry_id"),
+                reset=reset
+            )
 
             # Ensure Reminders are also refreshed (skip for non-flag email actions)
-            if not skip_reminders:
+            if self._reminders_pending:
+                self._reminders_pending = False
                 self.refresh_reminders()
 
         except Exception as e:
@@ -1911,25 +1891,8 @@ class SidebarWindow(tk.Tk):
 
 
     def refresh_reminders(self):
-        """Refreshes the Reminder/Flagged section (Bottom List)."""
+        """Requests the Reminder/Flagged section (Bottom List) data in the background."""
         if not self.outlook_client: return
-        # Ensure scrollable frame exists
-        # Clear content
-        if self.reminder_list:
-            # --- Anti-flicker: hide canvas content during rebuild ---
-            r_canvas = self.reminder_list.canvas
-            r_canvas.itemconfigure(self.reminder_list.window_id, state='hidden')
-            for widget in self.reminder_list.scrollable_frame.winfo_children():
-                widget.destroy()
-        
-        container = self.reminder_list.scrollable_frame
-        
-        # Helper for binding click
-        def bind_click(widget, entry_id):
-            if self.config.email_double_click:
-                widget.bind("<Double-Button-1>", lambda e, eid=entry_id, w=widget: self.open_email(eid, source_widget=w))
-            else:
-                widget.bind("<Button-1>", lambda e, eid=entry_id, w=widget: self.open_email(eid, source_widget=w))
         
         # 1. Meetings (Today & Tomorrow)
         # 1. Meetings
@@ -1970,14 +1933,67 @@ class SidebarWindow(tk.Tk):
         # If no date filter, maybe don't show any? Or default?
         # User said "defaults for next one should be Today, Tomorrow". 
         # If they untick all, implies show none?
-        if not has_date_filter:
+        cal_accounts = [n for n, s in self.config.enabled_accounts.items() if s.get("calendar")] if self.config.enabled_accounts else None
+        email_accounts = [n for n, s in self.config.enabled_accounts.items() if s.get("email")] if self.config.enabled_accounts else None
+        show_tasks = self.config.reminder_show_tasks
+        task_dates = self.config.reminder_task_dates
+        show_flagged = self.config.reminder_show_flagged
+        due_filters = self.config.reminder_due_filters
+
+        def fetch(client):
+            data = {"meetings": None, "tasks": None, "flags": None}
+            if has_date_filter:
+                # Pass datetime objects directly
+                data["meetings"] = client.get_calendar_items(today_start, end_date, cal_accounts)
+            if show_tasks:
+                data["tasks"] = client.get_tasks(due_filters=task_dates, account_names=cal_accounts)
+            if show_flagged:
+                data["flags"], _ = client.get_inbox_items(
+                    count=30,
+                    unread_only=False,
+                    only_flagged=True,
+                    due_filters=due_filters,
+                    account_names=email_accounts
+                )
+            return data
+
+        self._run_job("reminders", fetch, self._render_reminders)
+
+    def _render_reminders(self, snap):
+        """Rebuilds the Reminder/Flagged section from a fetched snapshot."""
+        if snap.error is not None:
+            print("Reminders refresh error: {}".format(snap.error))
+            if self._is_network_error(snap.error):
+                try:
+                    self._show_offline_bar()
+                except: pass
+            return
+
+        # Ensure scrollable frame exists
+        # Clear content
+        if self.reminder_list:
+            # --- Anti-flicker: hide canvas content during rebuild ---
+            r_canvas = self.reminder_list.canvas
+            r_canvas.itemconfigure(self.reminder_list.window_id, state='hidden')
+            for widget in self.reminder_list.scrollable_frame.winfo_children():
+                widget.destroy()
+        
+        container = self.reminder_list.scrollable_frame
+        
+        # Helper for binding click
+        def bind_click(widget, entry_id):
+            if self.config.email_double_click:
+                widget.bind("<Double-Button-1>", lambda e, eid=entry_id, w=widget: self.open_email(eid, source_widget=w))
+            else:
+                widget.bind("<Button-1>", lambda e, eid=entry_id, w=widget: self.open_email(eid, source_widget=w))
+
+        now = datetime.now()
+        raw_meetings = snap.data["meetings"]
+
+        if raw_meetings is None:
              # Show none
              meetings = []
         else:
-             cal_accounts = [n for n, s in self.config.enabled_accounts.items() if s.get("calendar")] if self.config.enabled_accounts else None
-             # Pass datetime objects directly
-             raw_meetings = self.outlook_client.get_calendar_items(today_start, end_date, cal_accounts)
-             
              # Filter by Status
              # olResponseNone = 0, olResponseOrganized = 1, olResponseTentative = 2, olResponseAccepted = 3, olResponseDeclined = 4
              meetings = []
@@ -2143,8 +2159,8 @@ class SidebarWindow(tk.Tk):
 
         # 2. Outlook Tasks
         # 2. Outlook Tasks
-        if self.config.reminder_show_tasks:
-             tasks = self.outlook_client.get_tasks(due_filters=self.config.reminder_task_dates, account_names=cal_accounts)
+        if snap.data["tasks"] is not None:
+             tasks = snap.data["tasks"]
              
              if tasks:
                  tk.Label(container, text="TASKS", fg=self.colors.get("accent_success", "#28a745"), bg=self.colors["bg_root"], font=(self.config.font_family, self.config.font_size - 2, "bold"), anchor="w").pack(fill="x", padx=5, pady=(10, 2))
@@ -2270,15 +2286,8 @@ class SidebarWindow(tk.Tk):
                      subj.bind("<Leave>", hide_t_actions)
 
         # 3. Flagged Emails
-        if self.config.reminder_show_flagged:
-             email_accounts = [n for n, s in self.config.enabled_accounts.items() if s.get("email")] if self.config.enabled_accounts else None
-             flags, _ = self.outlook_client.get_inbox_items(
-                 count=30,
-                 unread_only=False,
-                 only_flagged=True,
-                 due_filters=self.config.reminder_due_filters,
-                 account_names=email_accounts
-             )
+        if snap.data["flags"] is not None:
+             flags = snap.data["flags"]
              
              if flags:
                  tk.Label(container, text="FLAGGED EMAILS", fg=self.colors.get("accent_warning", "#FF8C00"), bg=self.colors["bg_root"], font=(self.config.font_family, self.config.font_size - 2, "bold"), anchor="w").pack(fill="x", padx=5, pady=(10, 2))
@@ -2944,15 +2953,32 @@ class SidebarWindow(tk.Tk):
             self.refresh_emails()
             return
 
-        # 1. Check New Mail (For Refreshing List)
-        has_new = self.outlook_client.check_new_mail(accounts)
-        if has_new:
+        account_config = self.config.enabled_accounts
+
+        def fetch(client):
+            # New-mail state (for refreshing the list) and pulse statuses,
+            # gathered in one pass over the stores
+            return client.get_poll_snapshot(accounts, account_config)
+
+        self._run_job("poll", fetch, self._apply_poll_result)
+
+    def _apply_poll_result(self, snap):
+        """Refreshes the list and pulse strip from a background poll."""
+        self._update_health_bar()
+        if snap.error is not None:
+            print("Polling error: {}".format(snap.error))
+            if self._is_network_error(snap.error):
+                try:
+                    self._show_offline_bar()
+                except: pass
+            return
+
+        if snap.data["has_new"]:
              print("DEBUG: Refreshing emails...")
              self.refresh_emails()
         
-        # 2. Gather Statuses for Pulse
-        unread_count = self.outlook_client.get_unread_count(accounts, self.config.enabled_accounts)
-        due_status = self.outlook_client.get_pulse_status(accounts)
+        unread_count = snap.data["unread_count"]
+        due_status = snap.data["due_status"]
 
         active_colors = []
         
@@ -3344,7 +3370,7 @@ class SidebarWindow(tk.Tk):
              
         # 7. Recolor existing email cards in-place (no COM re-fetch)
         try:
-            for card in self.scroll_frame.scrollable_frame.winfo_children():
+            for card in self.scroll_frame.row_widgets():
                 self._recolor_widget_tree(card, c)
         except: pass
         
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Checks that an item listed by one HybridMailClient is routed by another.
+
+The data engine reads with its own client while the UI thread runs the
+actions with a second one; both must share the routing table. The backends
+are replaced by fakes, so this runs without Outlook or a Graph sign-in.
+"""
+from datetime import datetime, timedelta
+
+from sidebar.services import hybrid_client
+from sidebar.services.item_record import MailItem
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+class FakeEvents:
+    def add_listener(self, listener):
+        pass
+
+
+class FakeBackend:
+    name = "?"
+    prefix = "?"
+
+    def __init__(self):
+        self.events = FakeEvents()
+        self.calls = []
+
+    def is_connected(self):
+        return True
+
+    def get_accounts(self):
+        return ["{}@example.com".format(self.name)]
+
+    def get_inbox_items(self, count=20, *args):
+        items = [MailItem(entry_id="{}-item-{}".format(self.prefix, i),
+                          store_id="{}-store".format(self.name),
+                          subject="{} {}".format(self.name, i),
+                          received=NOW - timedelta(minutes=i))
+                 for i in range(3)]
+        return items, 0
+
+    def mark_as_read(self, entry_id, store_id=None):
+        self.calls.append((entry_id, store_id))
+        return True
+
+
+class FakeOutlook(FakeBackend):
+    name = "com"
+    prefix = "com"   # Not a hex EntryID, so guessing would try Graph first
+
+
+class FakeGraph(FakeBackend):
+    name = "graph"
+    prefix = "AAMk"
+
+
+def verify_routing():
+    hybrid_client.OutlookClient = FakeOutlook
+    hybrid_client.GraphAPIClient = FakeGraph
+
+    engine = hybrid_client.HybridMailClient()
+    ui = hybrid_client.HybridMailClient()
+
+    print("--- Reading with the engine's client ---")
+    emails, _ = engine.get_inbox_items(count=6)
+    print("Listed {} items".format(len(emails)))
+
+    print("--- Acting with the UI client ---")
+    com_item = next(e for e in emails if e["entry_id"].startswith("com-"))
+    graph_item = next(e for e in emails if e["entry_id"].startswith("AAMk"))
+    hits = ui.routes.stats["hits"]
+    ok = True
+    for item, backend, other in ((com_item, ui.com, ui.graph), (graph_item, ui.graph, ui.com)):
+        ui.mark_as_read(item["entry_id"])
+        if backend.calls == [(item["entry_id"], item["store_id"])] and not other.calls:
+            print("SUCCESS: {} routed to {}".format(item["entry_id"], backend.name))
+        else:
+            print("FAILURE: {} went to com={} graph={}".format(
+                item["entry_id"], ui.com.calls, ui.graph.calls))
+            ok = False
+        backend.calls, other.calls = [], []
+
+    if ui.routes.stats["hits"] - hits == 2:
+        print("SUCCESS: both actions found a route")
+    else:
+        print("FAILURE: route hits went from {} to {}".format(hits, ui.routes.stats["hits"]))
+        ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    verify_routing()